@@ -4,16 +4,34 @@ from __future__ import annotations
 import asyncio
 from datetime import timedelta
 import logging
+import sqlite3
+import time
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.components import webhook
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_WEBHOOK_ID,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    ConfigEntryNotReady,
+    HomeAssistantError,
+)
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util, slugify
 
+from .allocator import async_get_allocator
+from .capture import ResponseCapture, capture_path
 from .client import (
     VoltieChargerAuthError,
     VoltieChargerClient,
@@ -22,22 +40,77 @@ from .client import (
     VoltieChargerRejectedError,
 )
 from .const import (
+    CAP_DLM,
+    CAP_IPM,
+    CAP_PHASE_2,
+    CAP_PHASE_3,
+    BURST_DURATION_S,
+    BURST_SCAN_INTERVAL,
+    CONF_ADDRESS,
+    CONF_CAPTURE,
+    CONF_CONTROLLER,
+    CONF_DEPARTURE,
+    CONF_ENERGY_TARGET,
+    CONF_EXPORT,
+    CONF_GRID_POWER_ENTITY,
+    CONF_LOAD_SHARING,
+    CONF_PRIORITY,
+    CONF_PUSH,
     CONF_SCAN_INTERVAL,
+    CONF_SCHEDULER,
+    CONF_SITE_LIMIT,
+    CONF_TARIFF,
     CONFIG_REPROBE_EVERY,
     DATA_CONFIG,
+    DATA_COST,
+    DATA_ENERGY,
     DATA_POWER,
+    DATA_ROLLING,
     DATA_STATUS,
+    DEFAULT_PRIORITY,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    ENERGY_KEY_CHARGE,
+    ENERGY_KEY_PHASE,
+    ENERGY_MAX_GAP_INTERVALS,
+    FAULT_SCAN_INTERVAL,
     PLATFORMS,
+    PUSH_HEARTBEAT_INTERVAL,
+    ROLLING_FIELDS,
+    ROLLING_WINDOWS_MIN,
+    SAMPLE_BUFFER_SIZE,
     UPDATE_RETRY_BACKOFF_S,
     UPDATE_RETRY_COUNT,
 )
+from .controller import CurrentLimitController
+from .device import build_device_info
+from .energy import EnergyIntegrator
+from .events import TransitionEvents, detect_transitions
+from .export import TelemetryExport
+from .faults import FaultJournal
+from .highres import HighResSampler
+from .perf import PollStats
+from .push import async_register_push
+from .rolling import RollingStats
+from .samples import POWER_STAT_FIELDS, STATUS_FIELDS, SampleRing
+from .scheduler import ChargeScheduler
+from .services import async_setup_services
+from .sessions import (
+    ChargingSession,
+    SessionStore,
+    SessionTracker,
+    async_get_session_store,
+)
+from .statistics import async_import_pending_sessions
+from .tariff import Tariff
+from .websocket import async_setup_websocket
 
 _LOGGER = logging.getLogger(__name__)
 
 type VoltieChargerConfigEntry = ConfigEntry[VoltieChargerCoordinator]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 CARRY_FORWARD_FIELDS = (
     "evse_state",
     "is_car_connected",
@@ -50,6 +123,7 @@ class VoltieChargerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Polls the charger's status, power and config endpoints."""
 
     charger_id: str
+    device_info: DeviceInfo
 
     def __init__(
         self,
@@ -63,14 +137,60 @@ class VoltieChargerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         # Soft-fail latch for /config; re-probed every CONFIG_REPROBE_EVERY polls.
         self._config_available = True
         self._polls_since_config_failure = 0
+        self.energy = EnergyIntegrator()
+        self.samples = SampleRing(SAMPLE_BUFFER_SIZE)
+        self.perf = PollStats()
+        # Latest sample_high_res run, kept until the next one replaces it.
+        self.high_res: HighResSampler | None = None
+        self.export: TelemetryExport | None = None
+        # Wall time of async_setup_entry, including platform setup.
+        self.setup_ms: float | None = None
+        self.rolling = RollingStats(ROLLING_FIELDS, ROLLING_WINDOWS_MIN)
+        self.controller: CurrentLimitController | None = None
+        self.tariff: Tariff | None = None
+        self.scheduler: ChargeScheduler | None = None
+        self.sessions: SessionTracker | None = None
+        # Lifetime cost from before the restart (restored by the cost sensor).
+        self.cost_restored: float | None = None
+        self._last_session_cost: float | None = None
+        self.session_store: SessionStore | None = None
+        # Only ever grows; platforms add entities when a capability appears.
+        self.capabilities: frozenset[str] = frozenset()
+        # Fresh /power payloads seen; a capability missing from several of
+        # them is really absent, not just a failed or partial read.
+        self.power_responses = 0
+        # Raw (sw_ver, fw_ver) behind device_info; None until charger_id is known.
+        self._device_versions: tuple[Any, Any] | None = None
+        self.events: TransitionEvents | None = None
+        self.faults: FaultJournal | None = None
+        self._pending_transitions: list[tuple[str, dict[str, Any]]] = []
+        self._transitions_at = 0.0
+        self._burst_until = 0.0
+        # Configured interval; update_interval is shortened during bursts.
+        self._base_interval = _scan_interval(entry)
+        # monotonic() of the last webhook push; see async_ingest_push.
+        self._last_push: float | None = None
+        self.pushes = 0
+        # Options in effect; data-only entry updates don't need a reload.
+        self.options = dict(entry.options)
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=_scan_interval(entry),
+            update_interval=self._base_interval,
         )
 
     async def _async_update_data(self) -> dict[str, Any]:
+        self.perf.begin()
+        try:
+            data = await self._async_poll()
+        except Exception:
+            self.perf.end(ok=False)
+            raise
+        self.perf.end(ok=True)
+        return data
+
+    async def _async_poll(self) -> dict[str, Any]:
         try:
             status = await self._fetch_with_retry(
                 self.client.async_get_status, "/status"
@@ -79,12 +199,15 @@ class VoltieChargerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             raise ConfigEntryAuthFailed(str(exc)) from exc
         except (VoltieChargerConnectionError, VoltieChargerRejectedError) as exc:
             raise UpdateFailed(f"/status failed: {exc}") from exc
+        status_at = time.monotonic()
 
         power: dict[str, Any]
+        power_at: float | None = None
         try:
             power = await self._fetch_with_retry(
                 self.client.async_get_power, "/power"
             )
+            power_at = time.monotonic()
         except VoltieChargerAuthError as exc:
             raise ConfigEntryAuthFailed(str(exc)) from exc
         except (VoltieChargerConnectionError, VoltieChargerRejectedError) as exc:
@@ -92,8 +215,174 @@ class VoltieChargerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             power = (self.data or {}).get(DATA_POWER, {}) or {}
 
         config = await self._fetch_config_maybe()
-        self._carry_forward_flaky_fields(status)
-        return {DATA_STATUS: status, DATA_POWER: power, DATA_CONFIG: config}
+        return self._process(status, status_at, power, power_at, config)
+
+    @callback
+    def async_ingest_push(
+        self, status: dict[str, Any] | None, power: dict[str, Any] | None
+    ) -> None:
+        """Take pushed /status and/or /power payloads as if just polled.
+
+        Pushed keys are merged onto the last payloads, so a partial push
+        keeps cdr, phase data and versions; a part that wasn't pushed at all
+        is carried over unchanged.
+        """
+        data = self.data or {}
+        now = time.monotonic()
+        self._last_push = now
+        self.pushes += 1
+        last_power = data.get(DATA_POWER) or {}
+        if power is not None:
+            power = last_power | power
+            if isinstance(stat := power.get("power_stat"), dict):
+                power["power_stat"] = (last_power.get("power_stat") or {}) | stat
+        # Not async_set_updated_data(): that reschedules the next poll, and
+        # pushes faster than the heartbeat would then postpone it forever.
+        self.data = self._process(
+            dict(data.get(DATA_STATUS) or {}) | (status or {}),
+            now if status is not None else None,
+            power if power is not None else last_power,
+            now if power is not None else None,
+            data.get(DATA_CONFIG) or {},
+        )
+        self.last_update_success = True
+        self.async_update_listeners()
+
+    @callback
+    def _process(
+        self,
+        status: dict[str, Any],
+        status_at: float | None,
+        power: dict[str, Any],
+        power_at: float | None,
+        config: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Derive everything else from fresh payloads; ``*_at`` None = stale."""
+        if carried := self._carry_forward_flaky_fields(status):
+            self.perf.record_carry_forward(carried)
+        if transitions := detect_transitions(
+            (self.data or {}).get(DATA_STATUS) or {}, status
+        ):
+            # Fired from async_update_listeners, once entities show the change.
+            assert status_at is not None
+            self._pending_transitions = transitions
+            self._transitions_at = status_at
+            self._burst_until = time.monotonic() + BURST_DURATION_S
+        if self.faults is not None:
+            self.faults.async_update(
+                status, power if power_at is not None else {}, time.time()
+            )
+        self.update_interval = self._poll_interval()
+        self._async_sync_device_versions(status)
+        if not (detected := _detect_capabilities(status, power)) <= self.capabilities:
+            self.capabilities = self.capabilities | detected
+        if power_at is not None:
+            self.power_responses += 1
+        self._integrate_energy(status, status_at, power, power_at)
+        self._record_sample(status, power if power_at is not None else {})
+        if self.export is not None and self.export.record(
+            time.time(), status, power if power_at is not None else {}
+        ):
+            self.hass.async_add_executor_job(self.export.flush, self.export.take())
+        if self.sessions is not None and (
+            completed := self.sessions.update(status, time.time(), self._price())
+        ):
+            self._async_session_completed(completed)
+        if (capture := self.client.capture) is not None and capture.ready:
+            self.hass.async_add_executor_job(capture.flush, capture.take())
+        return {
+            DATA_STATUS: status,
+            DATA_POWER: power,
+            DATA_CONFIG: config,
+            DATA_ENERGY: self.energy.snapshot(),
+            DATA_ROLLING: self.rolling.snapshot(),
+            DATA_COST: self.cost_snapshot(),
+        }
+
+    @callback
+    def async_update_listeners(self) -> None:
+        writes = self.perf.state_writes
+        started = time.perf_counter()
+        super().async_update_listeners()
+        self.perf.record_fan_out(
+            (time.perf_counter() - started) * 1000, self.perf.state_writes - writes
+        )
+        if self._pending_transitions:
+            transitions, self._pending_transitions = self._pending_transitions, []
+            if self.events is not None:
+                self.events.async_fire(transitions, self._transitions_at)
+
+    def _poll_interval(self) -> timedelta:
+        if self.pushing:
+            return PUSH_HEARTBEAT_INTERVAL
+        interval = self._base_interval
+        if self.faults is not None and self.faults.active is not None:
+            interval = min(interval, FAULT_SCAN_INTERVAL)
+        if time.monotonic() < self._burst_until:
+            interval = min(interval, BURST_SCAN_INTERVAL)
+        return interval
+
+    def performance_report(self) -> dict[str, Any]:
+        """Recent poll cycles plus the /config latch, for diagnostics."""
+        return {
+            **self.perf.as_dict(),
+            "config_latch": {
+                "available": self._config_available,
+                "polls_since_failure": self._polls_since_config_failure,
+            },
+        }
+
+    @property
+    def pushing(self) -> bool:
+        """Whether pushes are arriving, so polling is only a heartbeat."""
+        return self._last_push is not None and (
+            time.monotonic() - self._last_push
+            < PUSH_HEARTBEAT_INTERVAL.total_seconds()
+        )
+
+    def _price(self) -> float | None:
+        return self.tariff.price_at(dt_util.utcnow()) if self.tariff else None
+
+    def cost_snapshot(self) -> dict[str, float | None]:
+        session = self.sessions.current if self.sessions else None
+        tracked = self.sessions.cost_total if self.sessions else 0.0
+        return {
+            "session": session.cost if session else self._last_session_cost,
+            "total": (self.cost_restored or 0.0) + tracked,
+        }
+
+    def _integrate_energy(
+        self,
+        status: dict[str, Any],
+        status_at: float | None,
+        power: dict[str, Any],
+        power_at: float | None,
+    ) -> None:
+        # Bursts poll faster than the base interval, a push heartbeat slower.
+        interval = max(self._base_interval, self.update_interval or timedelta(0))
+        max_gap = interval.total_seconds() * ENERGY_MAX_GAP_INTERVALS
+        # Carried-forward values are stale; never integrate them.
+        if status_at is not None:
+            self.energy.add_sample(
+                ENERGY_KEY_CHARGE, status_at, status.get("charge_power"), max_gap
+            )
+        if power_at is None:
+            return
+        stat = power.get("power_stat") or {}
+        for phase in (1, 2, 3):
+            self.energy.add_sample(
+                ENERGY_KEY_PHASE.format(phase=phase),
+                power_at,
+                stat.get(f"power{phase}"),
+                max_gap,
+            )
+
+    def _record_sample(self, status: dict[str, Any], power: dict[str, Any]) -> None:
+        stat = power.get("power_stat") or {}
+        values = {name: status.get(name) for name in STATUS_FIELDS}
+        values.update((name, stat.get(name)) for name in POWER_STAT_FIELDS)
+        self.samples.append(time.time(), values)
+        self.rolling.add(time.monotonic(), values)
 
     async def _fetch_config_maybe(self) -> dict[str, Any]:
         should_try = self._config_available or (
@@ -102,6 +391,8 @@ class VoltieChargerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         if not should_try:
             self._polls_since_config_failure += 1
             return (self.data or {}).get(DATA_CONFIG, {}) or {}
+        if not self._config_available:
+            self.perf.config_reprobes += 1
 
         try:
             config = await self._fetch_with_retry(
@@ -127,9 +418,10 @@ class VoltieChargerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def _fetch_with_retry(self, func, label: str) -> dict[str, Any]:
         last_exc: Exception | None = None
+        started = time.perf_counter()
         for attempt in range(UPDATE_RETRY_COUNT + 1):
             try:
-                return await func()
+                result = await func()
             except VoltieChargerAuthError:
                 raise
             except (
@@ -140,15 +432,104 @@ class VoltieChargerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 if attempt < UPDATE_RETRY_COUNT:
                     _LOGGER.debug("Retry %d on %s: %s", attempt + 1, label, exc)
                     await asyncio.sleep(UPDATE_RETRY_BACKOFF_S)
+            else:
+                self._record_request(label, started, attempt, ok=True)
+                return result
+        self._record_request(label, started, UPDATE_RETRY_COUNT, ok=False)
         assert last_exc is not None
         raise last_exc
 
-    def _carry_forward_flaky_fields(self, status: dict[str, Any]) -> None:
+    def _record_request(
+        self, label: str, started: float, retries: int, *, ok: bool
+    ) -> None:
+        self.perf.record_request(
+            label,
+            (time.perf_counter() - started) * 1000,
+            retries,
+            self.client.response_bytes.get(label.lstrip("/")) if ok else None,
+            ok,
+        )
+
+    def _carry_forward_flaky_fields(self, status: dict[str, Any]) -> list[str]:
         """Hold the last known value for fields the charger sometimes drops."""
         prev = (self.data or {}).get(DATA_STATUS) or {}
+        carried: list[str] = []
         for field in CARRY_FORWARD_FIELDS:
             if status.get(field) is None and prev.get(field) is not None:
                 status[field] = prev[field]
+                carried.append(field)
+        return carried
+
+    @callback
+    def _async_session_completed(self, session: ChargingSession) -> None:
+        _LOGGER.debug("Charging session completed: %s kWh", session.energy)
+        self._last_session_cost = session.cost
+        if self.session_store is not None:
+            self.hass.async_create_background_task(
+                self._async_store_session(self.session_store, session),
+                f"{DOMAIN} store session {self.charger_id}",
+            )
+
+    async def _async_store_session(
+        self, store: SessionStore, session: ChargingSession
+    ) -> None:
+        try:
+            await self.hass.async_add_executor_job(store.add, session)
+        except sqlite3.Error as exc:
+            _LOGGER.warning("Could not store charging session: %s", exc)
+            return
+        await _async_import_statistics(self.hass, store)
+
+    @callback
+    def async_init_device_info(self, charger_id: str) -> None:
+        """Build the shared DeviceInfo once the charger_id is known."""
+        self.charger_id = charger_id
+        status = (self.data or {}).get(DATA_STATUS, {})
+        self._device_versions = (status.get("sw_ver"), status.get("fw_ver"))
+        self.device_info = build_device_info(
+            charger_id,
+            self.entry.data.get(CONF_HOST, ""),
+            self.client.host,
+            status,
+        )
+
+    @callback
+    def _async_sync_device_versions(self, status: dict[str, Any]) -> None:
+        """Push sw/fw versions to the device registry only when they change.
+
+        A version missing from the payload keeps its last known value.
+        """
+        if self._device_versions is None:
+            return
+        versions = (status.get("sw_ver"), status.get("fw_ver"))
+        if versions == self._device_versions or versions == (None, None):
+            return
+        (sw_ver, fw_ver), (last_sw, last_fw) = versions, self._device_versions
+        self._device_versions = (
+            last_sw if sw_ver is None else sw_ver,
+            last_fw if fw_ver is None else fw_ver,
+        )
+        fresh = build_device_info(
+            self.charger_id,
+            self.entry.data.get(CONF_HOST, ""),
+            self.client.host,
+            status,
+        )
+        changes = {
+            key: value
+            for key in ("sw_version", "hw_version")
+            if (value := fresh.get(key)) is not None
+            and value != self.device_info.get(key)
+        }
+        if not changes:
+            return
+        _LOGGER.debug("Charger %s reported new versions %s", self.charger_id, changes)
+        self.device_info = DeviceInfo(**(self.device_info | changes))
+        dev_reg = dr.async_get(self.hass)
+        if device := dev_reg.async_get_device(
+            identifiers={(DOMAIN, self.charger_id)}
+        ):
+            dev_reg.async_update_device(device.id, **changes)
 
     async def async_push_config(self, values: dict[str, Any]) -> None:
         """Write config values; serialised to avoid racing concurrent writes."""
@@ -160,6 +541,39 @@ class VoltieChargerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             await self.async_request_refresh()
 
 
+async def _async_import_statistics(
+    hass: HomeAssistant, store: SessionStore
+) -> None:
+    try:
+        imported = await async_import_pending_sessions(hass, store)
+    except (HomeAssistantError, sqlite3.Error) as exc:
+        # Sessions stay flagged as pending and are retried next time.
+        _LOGGER.warning("Could not import session statistics: %s", exc)
+        return
+    _LOGGER.debug("Imported %d charging sessions into statistics", imported)
+
+
+def _detect_capabilities(
+    status: dict[str, Any], power: dict[str, Any]
+) -> frozenset[str]:
+    """Work out which optional hardware this charger actually reports."""
+    stat = power.get("power_stat") or {}
+    caps: set[str] = set()
+    phases = status.get("phases")
+    # "phases" is what the current session uses, so a three-phase charger
+    # with a single-phase car reports 1; live voltage on the line counts too.
+    for phase, cap in ((2, CAP_PHASE_2), (3, CAP_PHASE_3)):
+        if phases == 3 or stat.get(f"voltage{phase}"):
+            caps.add(cap)
+    # Site meters are independent of the charger's own wiring.
+    for meter, cap in (("dlm", CAP_DLM), ("ipm", CAP_IPM)):
+        if stat.get(f"{meter}_valid") or any(
+            stat.get(f"{meter}_current{phase}") is not None for phase in (1, 2, 3)
+        ):
+            caps.add(cap)
+    return frozenset(caps)
+
+
 def _scan_interval(entry: VoltieChargerConfigEntry) -> timedelta:
     seconds = entry.options.get(CONF_SCAN_INTERVAL)
     if isinstance(seconds, (int, float)) and seconds > 0:
@@ -167,17 +581,34 @@ def _scan_interval(entry: VoltieChargerConfigEntry) -> timedelta:
     return DEFAULT_SCAN_INTERVAL
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+    return True
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: VoltieChargerConfigEntry
 ) -> bool:
+    started = time.perf_counter()
     session = async_get_clientsession(hass)
     client = VoltieChargerClient(
         session,
         entry.data[CONF_HOST],
         entry.data.get(CONF_USERNAME),
         entry.data.get(CONF_PASSWORD),
+        address=entry.data.get(CONF_ADDRESS),
     )
 
+    if entry.options.get(CONF_CAPTURE):
+        capture = ResponseCapture(capture_path(hass, entry.entry_id))
+        client.capture = capture
+
+        async def _async_flush_capture() -> None:
+            await hass.async_add_executor_job(capture.flush, capture.take())
+
+        entry.async_on_unload(_async_flush_capture)
+
     coordinator = VoltieChargerCoordinator(hass, entry, client)
 
     try:
@@ -191,17 +622,83 @@ async def async_setup_entry(
     if not charger_id:
         raise ConfigEntryNotReady("Charger did not return a charger_id yet")
 
-    coordinator.charger_id = charger_id
+    coordinator.async_init_device_info(charger_id)
+    coordinator.events = TransitionEvents(hass, charger_id)
+    if entry.options.get(CONF_EXPORT):
+        export = coordinator.export = TelemetryExport(
+            hass.config.path(DOMAIN, "export", slugify(charger_id))
+        )
+
+        async def _async_flush_export() -> None:
+            await hass.async_add_executor_job(export.flush, export.take())
+
+        entry.async_on_unload(_async_flush_export)
+
+    coordinator.faults = FaultJournal(hass, charger_id)
+    await coordinator.faults.async_load()
+    coordinator.session_store = await async_get_session_store(hass)
+    coordinator.sessions = SessionTracker(charger_id)
+    # Backfill sessions that completed while statistics couldn't be written.
+    entry.async_create_background_task(
+        hass,
+        _async_import_statistics(hass, coordinator.session_store),
+        f"{DOMAIN} statistics backfill",
+    )
 
     if entry.unique_id != charger_id:
         _migrate_unique_id(hass, entry, charger_id)
 
     _migrate_device_identifier(hass, entry.entry_id, charger_id)
 
+    controller_options = entry.options.get(CONF_CONTROLLER) or {}
+    if controller_options.get(CONF_GRID_POWER_ENTITY):
+        coordinator.controller = CurrentLimitController(
+            hass, coordinator, controller_options
+        )
+        entry.async_on_unload(coordinator.controller.async_start())
+
+    load_sharing = entry.options.get(CONF_LOAD_SHARING) or {}
+    if site_limit := load_sharing.get(CONF_SITE_LIMIT):
+        entry.async_on_unload(
+            async_get_allocator(hass).async_register(
+                coordinator,
+                site_limit,
+                load_sharing.get(CONF_PRIORITY, DEFAULT_PRIORITY),
+            )
+        )
+
+    tariff = Tariff(hass, entry.options.get(CONF_TARIFF) or {})
+    if tariff.configured:
+        coordinator.tariff = tariff
+        entry.async_on_unload(tariff.async_start())
+        scheduler_options = entry.options.get(CONF_SCHEDULER) or {}
+        if scheduler_options.get(CONF_DEPARTURE) and scheduler_options.get(
+            CONF_ENERGY_TARGET
+        ):
+            coordinator.scheduler = ChargeScheduler(
+                hass, coordinator, tariff, scheduler_options
+            )
+            entry.async_on_unload(coordinator.scheduler.async_start())
+
+    if entry.options.get(CONF_PUSH):
+        if CONF_WEBHOOK_ID not in entry.data:
+            hass.config_entries.async_update_entry(
+                entry,
+                data={**entry.data, CONF_WEBHOOK_ID: webhook.async_generate_id()},
+            )
+        webhook_id = entry.data[CONF_WEBHOOK_ID]
+        entry.async_on_unload(async_register_push(hass, coordinator, webhook_id))
+        _LOGGER.info(
+            "Accepting pushed data for %s at %s",
+            charger_id,
+            webhook.async_generate_path(webhook_id),
+        )
+
     entry.runtime_data = coordinator
     entry.async_on_unload(entry.add_update_listener(_async_options_updated))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    coordinator.setup_ms = (time.perf_counter() - started) * 1000
     return True
 
 
@@ -214,6 +711,9 @@ async def async_unload_entry(
 async def _async_options_updated(
     hass: HomeAssistant, entry: VoltieChargerConfigEntry
 ) -> None:
+    # Address updates from discovery are applied to the live client instead.
+    if entry.options == entry.runtime_data.options:
+        return
     await hass.config_entries.async_reload(entry.entry_id)
 
 
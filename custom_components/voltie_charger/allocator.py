@@ -0,0 +1,291 @@
+"""Domain-wide allocation of a shared supply limit across chargers."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util.hass_dict import HassKey
+
+from .client import VoltieChargerError
+from .const import (
+    ALLOCATOR_HISTORY,
+    ALLOCATOR_INTERVAL,
+    CURRENT_LIMIT_MAX,
+    CURRENT_LIMIT_MIN,
+    CURRENT_LIMIT_STEP,
+    DATA_CONFIG,
+    DATA_STATUS,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from . import VoltieChargerCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+ALLOCATOR_KEY: HassKey[LoadAllocator] = HassKey(f"{DOMAIN}_allocator")
+
+
+@dataclass(frozen=True, kw_only=True)
+class AllocationDemand:
+    """One charger's input to an allocation cycle."""
+
+    charger_id: str
+    priority: int
+    demand: int
+
+
+def _step_down(amps: float) -> int:
+    return int(amps // CURRENT_LIMIT_STEP) * CURRENT_LIMIT_STEP
+
+
+def allocate(site_limit: int, demands: list[AllocationDemand]) -> dict[str, int]:
+    """Split ``site_limit`` amps across demands by priority-weighted fill.
+
+    A charger can't go below CURRENT_LIMIT_MIN, so when the floors don't all
+    fit, the lowest-priority chargers are granted 0 (paused) until they do;
+    the total never exceeds ``site_limit``. Above the floors the rest is
+    shared in proportion to priority, and whatever a charger can't use is
+    redistributed to the others.
+    """
+    admitted: list[AllocationDemand] = []
+    for demand in sorted(demands, key=lambda d: (-d.priority, d.charger_id)):
+        if CURRENT_LIMIT_MIN * (len(admitted) + 1) > site_limit:
+            break
+        admitted.append(demand)
+    grants = {d.charger_id: 0 for d in demands}
+    grants.update((d.charger_id, CURRENT_LIMIT_MIN) for d in admitted)
+    remaining = site_limit - CURRENT_LIMIT_MIN * len(admitted)
+    hungry = [d for d in admitted if d.demand > CURRENT_LIMIT_MIN]
+    while remaining >= CURRENT_LIMIT_STEP and hungry:
+        weight = sum(d.priority for d in hungry)
+        given = 0
+        for demand in hungry:
+            share = _step_down(remaining * demand.priority / weight)
+            extra = min(share, demand.demand - grants[demand.charger_id])
+            grants[demand.charger_id] += extra
+            given += extra
+        if given == 0:
+            # Shares rounded to nothing: hand out single steps by priority.
+            for demand in sorted(hungry, key=lambda d: -d.priority):
+                if remaining - given < CURRENT_LIMIT_STEP:
+                    break
+                grants[demand.charger_id] += CURRENT_LIMIT_STEP
+                given += CURRENT_LIMIT_STEP
+        remaining -= given
+        hungry = [d for d in hungry if grants[d.charger_id] < d.demand]
+    return grants
+
+
+def _demand(status: dict[str, Any], current_limit: int) -> int:
+    """Amps a charger could use: its limit if the car draws it, else a bit more."""
+    drawn = status.get("charge_current")
+    if not isinstance(drawn, (int, float)) or drawn >= current_limit - 1:
+        return CURRENT_LIMIT_MAX
+    return max(CURRENT_LIMIT_MIN, min(CURRENT_LIMIT_MAX, int(drawn) + 2))
+
+
+def _reserve(status: dict[str, Any], limit: Any) -> int:
+    """Amps to hold back for a charger whose draw the plan can't control."""
+    drawn = status.get("charge_current")
+    known = [value for value in (limit, drawn) if isinstance(value, (int, float))]
+    # Nothing known at all: assume the worst the charger could draw.
+    return int(max(known)) if known else CURRENT_LIMIT_MAX
+
+
+class LoadAllocator:
+    """Periodically re-divides the site limit among participating chargers.
+
+    Each cycle reads every participant's coordinator data and computes all
+    new limits. Chargers that can't be controlled (failed poll, unknown
+    limit) have their limit or last draw reserved first; idle chargers are
+    lowered to the minimum and reserve that. Reductions and pauses are
+    written before increases and resumes, so the site limit holds while the
+    writes land; unchanged chargers aren't written at all.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._participants: dict[str, tuple[VoltieChargerCoordinator, int, int]] = {}
+        # Chargers this allocator stopped because the minimum didn't fit.
+        self._paused: set[str] = set()
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._running = False
+        self.cycles: deque[dict[str, Any]] = deque(maxlen=ALLOCATOR_HISTORY)
+
+    @callback
+    def async_register(
+        self, coordinator: VoltieChargerCoordinator, site_limit: int, priority: int
+    ) -> CALLBACK_TYPE:
+        self._participants[coordinator.charger_id] = (
+            coordinator,
+            site_limit,
+            priority,
+        )
+        if self._unsub_timer is None:
+            self._unsub_timer = async_track_time_interval(
+                self.hass,
+                self._async_tick,
+                ALLOCATOR_INTERVAL,
+                name=f"{DOMAIN} load allocator",
+            )
+
+        @callback
+        def _unregister() -> None:
+            self._participants.pop(coordinator.charger_id, None)
+            self._paused.discard(coordinator.charger_id)
+            if not self._participants and self._unsub_timer is not None:
+                self._unsub_timer()
+                self._unsub_timer = None
+
+        return _unregister
+
+    @callback
+    def _async_tick(self, _now: Any) -> None:
+        if self._running:
+            return
+        self._running = True
+        self.hass.async_create_background_task(
+            self.async_run_cycle(), f"{DOMAIN} load allocation"
+        )
+
+    async def async_run_cycle(self) -> dict[str, int]:
+        started = time.monotonic()
+        failures = 0
+        applied: dict[str, int] = {}
+        try:
+            writes, current = self._plan()
+            # Lower first, so the site limit holds while writes land.
+            for phase in (
+                {k: v for k, v in writes.items() if v[1] < current[k]},
+                {k: v for k, v in writes.items() if v[1] >= current[k]},
+            ):
+                results = await asyncio.gather(
+                    *(
+                        self._async_apply(charger_id, coordinator, limit)
+                        for charger_id, (coordinator, limit) in phase.items()
+                    ),
+                    return_exceptions=True,
+                )
+                for (charger_id, (_, limit)), result in zip(
+                    phase.items(), results, strict=True
+                ):
+                    if isinstance(result, (VoltieChargerError, HomeAssistantError)):
+                        _LOGGER.warning(
+                            "Could not set %s current limit: %s", charger_id, result
+                        )
+                        failures += 1
+                    elif isinstance(result, BaseException):
+                        raise result
+                    else:
+                        applied[charger_id] = limit
+        finally:
+            self._running = False
+
+        self.cycles.append(
+            {
+                "at": time.time(),
+                "latency_ms": round((time.monotonic() - started) * 1000, 1),
+                "writes": applied,
+                "failures": failures,
+            }
+        )
+        return applied
+
+    async def _async_apply(
+        self, charger_id: str, coordinator: VoltieChargerCoordinator, limit: int
+    ) -> None:
+        """Write ``limit``; 0 stops the charger, leaving 0 resumes it."""
+        if limit == 0:
+            await coordinator.client.async_stop()
+            self._paused.add(charger_id)
+            await coordinator.async_request_refresh()
+            return
+        await coordinator.async_push_config({"conf_current_limit": limit})
+        if charger_id in self._paused:
+            await coordinator.client.async_start()
+            self._paused.discard(charger_id)
+            await coordinator.async_request_refresh()
+
+    def _plan(
+        self,
+    ) -> tuple[dict[str, tuple[VoltieChargerCoordinator, int]], dict[str, int]]:
+        """This cycle's writes (only chargers that change) and current limits.
+
+        A limit of 0 means "pause"; current limits of paused chargers are 0.
+        """
+        demands: list[AllocationDemand] = []
+        current: dict[str, int] = {}
+        writes: dict[str, tuple[VoltieChargerCoordinator, int]] = {}
+        # Differing per-entry settings resolve to the safest (lowest) limit.
+        site_limit = min(
+            (limit for _, limit, _ in self._participants.values()), default=0
+        )
+        budget = site_limit
+        for charger_id, (coordinator, _, priority) in self._participants.items():
+            data = coordinator.data or {}
+            status = data.get(DATA_STATUS) or {}
+            limit = (data.get(DATA_CONFIG) or {}).get("conf_current_limit")
+            if not coordinator.last_update_success or not isinstance(limit, int):
+                # May still be drawing; keep its share out of the budget.
+                budget -= _reserve(status, limit)
+                continue
+            paused = charger_id in self._paused
+            current[charger_id] = 0 if paused else limit
+            if not (status.get("is_charging") or status.get("is_car_connected")):
+                # Idle: a car plugging in may draw the minimum before the
+                # next cycle, so that much stays reserved. A charger paused
+                # earlier is resumed here, or the next car would never charge.
+                budget -= CURRENT_LIMIT_MIN
+                if paused or limit != CURRENT_LIMIT_MIN:
+                    writes[charger_id] = (coordinator, CURRENT_LIMIT_MIN)
+                continue
+            demands.append(
+                AllocationDemand(
+                    charger_id=charger_id,
+                    priority=priority,
+                    demand=_demand(status, limit),
+                )
+            )
+        if budget < CURRENT_LIMIT_MIN * len(demands):
+            _LOGGER.debug(
+                "%s A left for %d active chargers; pausing the lowest priority",
+                budget,
+                len(demands),
+            )
+        for charger_id, grant in allocate(max(budget, 0), demands).items():
+            if grant != current[charger_id]:
+                writes[charger_id] = (self._participants[charger_id][0], grant)
+        return writes, current
+
+    def as_dict(self, charger_id: str) -> dict[str, Any]:
+        """Recent cycles from one charger's point of view (no other ids)."""
+        return {
+            "participants": len(self._participants),
+            "participating": charger_id in self._participants,
+            "cycles": [
+                {
+                    "at": cycle["at"],
+                    "latency_ms": cycle["latency_ms"],
+                    "writes": len(cycle["writes"]),
+                    "failures": cycle["failures"],
+                    "current_limit": cycle["writes"].get(charger_id),
+                }
+                for cycle in self.cycles
+            ],
+            "paused": charger_id in self._paused,
+        }
+
+
+@callback
+def async_get_allocator(hass: HomeAssistant) -> LoadAllocator:
+    if (allocator := hass.data.get(ALLOCATOR_KEY)) is None:
+        allocator = hass.data[ALLOCATOR_KEY] = LoadAllocator(hass)
+    return allocator
@@ -10,18 +10,19 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
-from homeassistant.const import EntityCategory
+from homeassistant.const import EntityCategory, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import VoltieChargerConfigEntry
-from .const import DATA_POWER, DATA_STATUS
-from .entity import VoltieChargerEntity
+from .const import CAP_DLM, CAP_IPM, DATA_POWER, DATA_STATUS
+from .entity import VoltieChargerEntity, async_add_capability_entities
 
 
 @dataclass(frozen=True, kw_only=True)
 class VoltieBinarySensorDescription(BinarySensorEntityDescription):
     value_fn: Callable[[dict[str, Any]], bool | None]
+    required_capabilities: frozenset[str] = frozenset()
 
 
 def _status(data: dict[str, Any]) -> dict[str, Any]:
@@ -51,6 +52,7 @@ BINARY_SENSORS: tuple[VoltieBinarySensorDescription, ...] = (
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
         value_fn=lambda d: _power_stat(d).get("dlm_valid"),
+        required_capabilities=frozenset({CAP_DLM}),
     ),
     VoltieBinarySensorDescription(
         key="ipm_valid",
@@ -58,6 +60,7 @@ BINARY_SENSORS: tuple[VoltieBinarySensorDescription, ...] = (
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
         value_fn=lambda d: _power_stat(d).get("ipm_valid"),
+        required_capabilities=frozenset({CAP_IPM}),
     ),
 )
 
@@ -69,8 +72,13 @@ async def async_setup_entry(
 ) -> None:
     """Set up Voltie Charger binary sensors."""
     coordinator = entry.runtime_data
-    async_add_entities(
-        VoltieChargerBinarySensor(coordinator, desc) for desc in BINARY_SENSORS
+    async_add_capability_entities(
+        entry,
+        coordinator,
+        Platform.BINARY_SENSOR,
+        BINARY_SENSORS,
+        lambda desc: VoltieChargerBinarySensor(coordinator, desc),
+        async_add_entities,
     )
 
 
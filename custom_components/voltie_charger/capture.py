@@ -0,0 +1,281 @@
+"""Record-and-replay of raw charger responses.
+
+The capture file is gzip-compressed JSON lines, one record per HTTP request,
+rotated by size. Records are buffered on the event loop and written in
+batches in the executor; redaction happens at write time so the poll path
+only appends. The replay_capture action feeds a capture back through a
+standalone coordinator (see async_replay_capture).
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .client import (
+    VoltieChargerAuthError,
+    VoltieChargerClient,
+    VoltieChargerConnectionError,
+    VoltieChargerError,
+    VoltieChargerRejectedError,
+    decode_payload,
+)
+from .const import (
+    CAPTURE_BACKUP_COUNT,
+    CAPTURE_BATCH_SIZE,
+    CAPTURE_MAX_BYTES,
+    DOMAIN,
+    ENDPOINT_STATUS,
+    REDACT_DATA,
+    UPDATE_RETRY_COUNT,
+)
+
+if TYPE_CHECKING:
+    from . import VoltieChargerConfigEntry, VoltieChargerCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+_ERROR_TYPES: dict[str, type[VoltieChargerError]] = {
+    cls.__name__: cls
+    for cls in (
+        VoltieChargerAuthError,
+        VoltieChargerConnectionError,
+        VoltieChargerRejectedError,
+    )
+}
+
+
+def _redact_body(raw: bytes | None) -> str | None:
+    if raw is None:
+        return None
+    try:
+        payload = json.loads(raw)
+    except ValueError:
+        return raw.decode("utf-8", "replace")
+    if isinstance(payload, dict):
+        payload = async_redact_data(payload, REDACT_DATA)
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def capture_path(hass: HomeAssistant, entry_id: str) -> str:
+    """Where an entry's capture file lives, under the config directory."""
+    return hass.config.path(DOMAIN, f"capture_{entry_id}.jsonl.gz")
+
+
+class ResponseCapture:
+    """Appends every raw response to a rotating gzip JSON-lines file."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_bytes: int = CAPTURE_MAX_BYTES,
+        backup_count: int = CAPTURE_BACKUP_COUNT,
+        batch_size: int = CAPTURE_BATCH_SIZE,
+    ) -> None:
+        self.path = path
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._batch_size = batch_size
+        self._pending: list[tuple[Any, ...]] = []
+        self._write_lock = threading.Lock()
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        status: int | None,
+        raw: bytes | None,
+        latency: float,
+        error: Exception | None = None,
+    ) -> None:
+        """Queue one request; called from the event loop, never blocks."""
+        self._pending.append(
+            (time.time(), method, endpoint, status, raw, latency, error)
+        )
+
+    @property
+    def ready(self) -> bool:
+        """Whether enough records are queued to be worth a write."""
+        return len(self._pending) >= self._batch_size
+
+    def take(self) -> list[tuple[Any, ...]]:
+        """Hand over the queued records; called from the event loop."""
+        pending, self._pending = self._pending, []
+        return pending
+
+    def flush(self, pending: list[tuple[Any, ...]]) -> None:
+        """Write records from ``take()`` to disk. Runs in the executor.
+
+        Nobody awaits the flush, so a write error is logged here.
+        """
+        if not pending:
+            return
+        try:
+            self._write(pending)
+        except OSError as exc:
+            _LOGGER.warning("Could not write capture to %s: %s", self.path, exc)
+
+    def _write(self, pending: list[tuple[Any, ...]]) -> None:
+        lines = []
+        for stamp, method, endpoint, status, raw, latency, error in pending:
+            record: dict[str, Any] = {
+                "t": round(stamp, 3),
+                "m": method,
+                "ep": endpoint,
+                "st": status,
+                "ms": round(latency * 1000, 1),
+                "b": _redact_body(raw),
+            }
+            if error is not None:
+                record["e"] = type(error).__name__
+                record["em"] = str(error)
+            lines.append(json.dumps(record, separators=(",", ":")))
+        data = ("\n".join(lines) + "\n").encode()
+
+        with self._write_lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._rotate_if_needed()
+            # Each flush appends one gzip member; readers see one stream.
+            with gzip.open(self.path, "ab") as file:
+                file.write(data)
+
+    def _rotate_if_needed(self) -> None:
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size < self._max_bytes:
+            return
+        for index in range(self._backup_count - 1, 0, -1):
+            src = f"{self.path}.{index}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{index + 1}")
+        if self._backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+def load_capture(path: str) -> list[dict[str, Any]]:
+    """Read a capture file and its rotated backups, oldest first."""
+    files = [path]
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        files.insert(0, f"{path}.{index}")
+        index += 1
+
+    records: list[dict[str, Any]] = []
+    for name in files:
+        if not os.path.exists(name):
+            continue
+        with gzip.open(name, "rt") as file:
+            records.extend(json.loads(line) for line in file if line.strip())
+    records.sort(key=lambda r: r["t"])
+    return records
+
+
+class ReplayClient(VoltieChargerClient):
+    """Serves captured responses instead of talking to a charger.
+
+    Each endpoint replays its own records in order; latency is reproduced
+    scaled by ``speed`` (0 disables sleeping).
+    """
+
+    def __init__(
+        self, records: Iterable[dict[str, Any]], *, host: str, speed: float = 1.0
+    ) -> None:
+        super().__init__(None, host)  # type: ignore[arg-type]
+        self._speed = speed
+        self._queues: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        for record in records:
+            self._queues.setdefault((record["m"], record["ep"]), []).append(record)
+        for queue in self._queues.values():
+            queue.reverse()
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: dict[str, str] | None = None,
+        json_body: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        queue = self._queues.get((method, endpoint))
+        if not queue:
+            raise VoltieChargerConnectionError(
+                f"Capture exhausted for {method} {endpoint}"
+            )
+        record = queue.pop()
+        if self._speed > 0:
+            await asyncio.sleep(record["ms"] / 1000 / self._speed)
+        if error := record.get("e"):
+            raise _ERROR_TYPES.get(error, VoltieChargerConnectionError)(
+                record.get("em", error)
+            )
+        raw = record["b"].encode() if record.get("b") else b""
+        # Redacted bodies are a little shorter than the original responses.
+        self.response_bytes[endpoint] = len(raw)
+        return decode_payload(method, endpoint, raw)
+
+
+async def async_replay_capture(
+    hass: HomeAssistant,
+    entry: VoltieChargerConfigEntry,
+    records: list[dict[str, Any]],
+    *,
+    speed: float = 1.0,
+) -> tuple[int, VoltieChargerCoordinator]:
+    """Drive a capture through a standalone coordinator.
+
+    Returns the number of polls replayed and the coordinator.
+
+    The coordinator is built for the replay alone: it has no listeners,
+    session store, fault journal, events, export or capture, and never
+    touches the device registry, so a replay can't disturb the live
+    coordinator or anything it persists. Inspect its ``perf``, ``data`` and
+    ``samples`` afterwards.
+
+    A poll starts at each recorded /status request other than a retry. Gaps
+    between polls are reproduced scaled by ``speed`` (0 replays as fast as
+    possible).
+    """
+    # Imported here: the package imports this module at load time.
+    from . import VoltieChargerCoordinator  # noqa: PLC0415
+
+    poll_starts: list[float] = []
+    retries = 0
+    previous_failed = False
+    for record in records:
+        if record["ep"] != ENDPOINT_STATUS or record["m"] != "GET":
+            continue
+        # A /status right after a failed one is the coordinator's own retry.
+        if previous_failed and retries < UPDATE_RETRY_COUNT:
+            retries += 1
+        else:
+            retries = 0
+            poll_starts.append(record["t"])
+        previous_failed = "e" in record
+    client = ReplayClient(records, host=entry.data.get(CONF_HOST, ""), speed=speed)
+    coordinator = VoltieChargerCoordinator(hass, entry, client)
+    coordinator.charger_id = entry.unique_id or ""
+    _LOGGER.debug("Replaying %d polls at speed %s", len(poll_starts), speed)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for stamp in poll_starts:
+        if speed > 0:
+            delay = (stamp - poll_starts[0]) / speed - (loop.time() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await coordinator.async_refresh()
+    return len(poll_starts), coordinator
@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import asyncio
 import json
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
 
@@ -18,6 +19,9 @@ from .const import (
     REQUEST_TIMEOUT,
 )
 
+if TYPE_CHECKING:
+    from .capture import ResponseCapture
+
 
 class VoltieChargerError(Exception):
     """Base exception for the Voltie Charger client."""
@@ -34,6 +38,11 @@ class VoltieChargerConnectionError(VoltieChargerError):
 class VoltieChargerRejectedError(VoltieChargerError):
     """Raised when the charger rejects a request (bad parameters, unsupported)."""
 
+    def __init__(self, message: str, *, accepted: int | None = None) -> None:
+        super().__init__(message)
+        # For config writes: how many parameters the charger did accept.
+        self.accepted = accepted
+
 
 # API error codes (spec v4.4). 0 = OK.
 _API_ERROR_MESSAGES: dict[int, str] = {
@@ -42,6 +51,41 @@ _API_ERROR_MESSAGES: dict[int, str] = {
 }
 
 
+def decode_payload(method: str, endpoint: str, raw: bytes) -> dict[str, Any]:
+    """Parse a raw response body and map in-band API errors to exceptions."""
+    try:
+        payload = json.loads(raw) if raw else {}
+    except (ValueError, json.JSONDecodeError) as exc:
+        raise VoltieChargerConnectionError(
+            f"Non-JSON response from {endpoint}: {raw[:200]!r}"
+        ) from exc
+
+    if not isinstance(payload, dict):
+        raise VoltieChargerConnectionError(
+            f"Unexpected response shape from {endpoint}: {type(payload).__name__}"
+        )
+
+    # Some failure responses carry a textual "status" field instead of
+    # error_code — surface those as transient connection issues so the
+    # coordinator retries instead of treating them as auth failures.
+    if (internal := payload.get("status")) and isinstance(internal, str):
+        raise VoltieChargerConnectionError(
+            f"Charger reported internal condition ({endpoint}): {internal}"
+        )
+
+    if (code := payload.get("error_code")) not in (None, 0):
+        message = _API_ERROR_MESSAGES.get(int(code), f"error_code={code}")
+        raise VoltieChargerRejectedError(
+            f"Charger rejected {method} {endpoint}: {message}"
+        )
+
+    return payload
+
+
+def _candidates(host: str, address: str | None) -> list[str]:
+    return [host] if not address or address == host else [host, address]
+
+
 class VoltieChargerClient:
     """Thin wrapper around the charger's HTTP API."""
 
@@ -51,19 +95,60 @@ class VoltieChargerClient:
         host: str,
         username: str | None = None,
         password: str | None = None,
+        *,
+        address: str | None = None,
     ) -> None:
         self._session = session
         self._host = host
+        # Hostname and last known IP; raced before the first request and
+        # after a transport failure (see _async_pick_host).
+        self._candidates = _candidates(host, address)
+        self._picked = len(self._candidates) < 2
         self._auth = (
             aiohttp.BasicAuth(username, password)
             if username and password
             else None
         )
+        # Optional raw-response recorder; see capture.py.
+        self.capture: ResponseCapture | None = None
+        # Size of the last response body per endpoint, for diagnostics.
+        self.response_bytes: dict[str, int] = {}
 
     @property
     def host(self) -> str:
         return self._host
 
+    def set_addresses(self, host: str, address: str | None = None) -> None:
+        """Take new addresses (e.g. from zeroconf) without recreating the client."""
+        self._candidates = _candidates(host, address)
+        self._host = host
+        self._picked = len(self._candidates) < 2
+
+    async def _async_pick_host(self) -> None:
+        """Use whichever candidate accepts a TCP connection first."""
+        self._picked = True
+
+        async def _connect(host: str) -> str:
+            _, writer = await asyncio.open_connection(host, API_PORT)
+            writer.close()
+            return host
+
+        tasks = [asyncio.ensure_future(_connect(host)) for host in self._candidates]
+        try:
+            for next_done in asyncio.as_completed(tasks, timeout=REQUEST_TIMEOUT):
+                try:
+                    self._host = await next_done
+                except OSError:
+                    continue
+                return
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for task in tasks:
+                # Retrieve late losers' errors so they aren't logged as unhandled.
+                if not task.cancel() and not task.cancelled():
+                    task.exception()
+
     def _url(self, endpoint: str) -> str:
         return f"http://{self._host}:{API_PORT}/{endpoint}"
 
@@ -75,62 +160,57 @@ class VoltieChargerClient:
         params: dict[str, str] | None = None,
         json_body: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
-        url = self._url(endpoint)
-        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        if not self._picked:
+            await self._async_pick_host()
+        started = time.monotonic()
+        status: int | None = None
+        raw: bytes | None = None
         try:
-            async with self._session.request(
-                method,
-                url,
-                auth=self._auth,
-                params=params,
-                json=json_body,
-                timeout=timeout,
-            ) as response:
-                if response.status == 401:
-                    raise VoltieChargerAuthError(
-                        "Authentication rejected by charger"
-                    )
-                response.raise_for_status()
-                raw = await response.read()
-        except VoltieChargerError:
+            url = self._url(endpoint)
+            timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            try:
+                async with self._session.request(
+                    method,
+                    url,
+                    auth=self._auth,
+                    params=params,
+                    json=json_body,
+                    timeout=timeout,
+                ) as response:
+                    status = response.status
+                    if response.status == 401:
+                        raise VoltieChargerAuthError(
+                            "Authentication rejected by charger"
+                        )
+                    response.raise_for_status()
+                    raw = await response.read()
+                    self.response_bytes[endpoint] = len(raw)
+            except VoltieChargerError:
+                raise
+            except aiohttp.ClientResponseError as exc:
+                if exc.status == 401:
+                    raise VoltieChargerAuthError(str(exc)) from exc
+                raise VoltieChargerConnectionError(
+                    f"HTTP {exc.status} from {endpoint}: {exc.message}"
+                ) from exc
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                # The address may have changed; race the candidates again.
+                self._picked = len(self._candidates) < 2
+                raise VoltieChargerConnectionError(
+                    f"Error talking to charger ({endpoint}): {exc}"
+                ) from exc
+
+            payload = decode_payload(method, endpoint, raw)
+        except VoltieChargerError as exc:
+            if self.capture is not None:
+                self.capture.record(
+                    method, endpoint, status, raw, time.monotonic() - started, exc
+                )
             raise
-        except aiohttp.ClientResponseError as exc:
-            if exc.status == 401:
-                raise VoltieChargerAuthError(str(exc)) from exc
-            raise VoltieChargerConnectionError(
-                f"HTTP {exc.status} from {endpoint}: {exc.message}"
-            ) from exc
-        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
-            raise VoltieChargerConnectionError(
-                f"Error talking to charger ({endpoint}): {exc}"
-            ) from exc
-
-        try:
-            payload = json.loads(raw) if raw else {}
-        except (ValueError, json.JSONDecodeError) as exc:
-            raise VoltieChargerConnectionError(
-                f"Non-JSON response from {endpoint}: {raw[:200]!r}"
-            ) from exc
-
-        if not isinstance(payload, dict):
-            raise VoltieChargerConnectionError(
-                f"Unexpected response shape from {endpoint}: {type(payload).__name__}"
-            )
-
-        # Some failure responses carry a textual "status" field instead of
-        # error_code — surface those as transient connection issues so the
-        # coordinator retries instead of treating them as auth failures.
-        if (internal := payload.get("status")) and isinstance(internal, str):
-            raise VoltieChargerConnectionError(
-                f"Charger reported internal condition ({endpoint}): {internal}"
+        if self.capture is not None:
+            self.capture.record(
+                method, endpoint, status, raw, time.monotonic() - started
             )
-
-        if (code := payload.get("error_code")) not in (None, 0):
-            message = _API_ERROR_MESSAGES.get(int(code), f"error_code={code}")
-            raise VoltieChargerRejectedError(
-                f"Charger rejected {method} {endpoint}: {message}"
-            )
-
         return payload
 
     async def async_get_status(self) -> dict[str, Any]:
@@ -152,7 +232,8 @@ class VoltieChargerClient:
             raise VoltieChargerRejectedError(
                 f"Charger accepted only {accepted}/{len(values)} config "
                 "parameters; the rest were rejected (unsupported on this "
-                "hardware, cable connected, or EVSE in an error state)."
+                "hardware, cable connected, or EVSE in an error state).",
+                accepted=accepted,
             )
         return result
 
@@ -1,22 +1,43 @@
 """Config and options flow for the Voltie Charger integration."""
 from __future__ import annotations
 
+import asyncio
+import ipaddress
 import logging
+import time
 from typing import Any
 
 import voluptuous as vol
 
 from homeassistant.config_entries import (
+    SOURCE_INTEGRATION_DISCOVERY,
     ConfigEntry,
+    ConfigEntryState,
     ConfigFlow,
     ConfigFlowResult,
     OptionsFlow,
 )
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import callback
+from homeassistant.components import webhook
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_WEBHOOK_ID,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.data_entry_flow import section
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.selector import (
+    EntitySelector,
+    EntitySelectorConfig,
+    TextSelector,
+    TextSelectorConfig,
+    TimeSelector,
+)
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
+from homeassistant.util.hass_dict import HassKey
 
 from .client import (
     VoltieChargerAuthError,
@@ -24,15 +45,60 @@ from .client import (
     VoltieChargerConnectionError,
 )
 from .const import (
+    AGGREGATE_MAX,
+    AGGREGATE_MEAN,
+    AGGREGATE_MIN,
+    CONF_ADDRESS,
+    CONF_AGGREGATE,
+    CONF_CAPTURE,
+    CONF_CHARGERS,
+    CONF_COMPACT_ENTITIES,
+    CONF_CONTROL_HYSTERESIS,
+    CONF_CONTROL_INTERVAL,
+    CONF_CONTROLLER,
+    CONF_DEADBAND,
+    CONF_DEADBAND_RELATIVE,
+    CONF_DEPARTURE,
+    CONF_ENERGY_TARGET,
+    CONF_EXPORT,
+    CONF_GRID_POWER_ENTITY,
+    CONF_GRID_TARGET,
+    CONF_LOAD_SHARING,
+    CONF_MDNS_NAME,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_NETWORK,
+    CONF_PRICE_ATTRIBUTES,
+    CONF_PRICE_ENTITY,
+    CONF_PRIORITY,
+    CONF_PUSH,
     CONF_SCAN_INTERVAL,
+    CONF_SCHEDULER,
+    CONF_SITE_LIMIT,
+    CONF_TARIFF,
+    CONF_TOU_TABLE,
+    CONF_WINDOW,
+    DEFAULT_CONTROL_HYSTERESIS,
+    DEFAULT_CONTROL_INTERVAL,
+    DEFAULT_PRICE_ATTRIBUTES,
+    DEFAULT_PRIORITY,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    FILTER_CLASSES,
     MAX_SCAN_INTERVAL,
     MIN_SCAN_INTERVAL,
+    PROBE_CACHE_TTL,
+    SCAN_MAX_HOSTS,
 )
+from .scan import async_scan_network
+from .tariff import parse_tou_table
 
 _LOGGER = logging.getLogger(__name__)
 
+# Discovery probe results by (host, mDNS name): (expiry, probe task).
+_PROBE_CACHE: HassKey[
+    dict[tuple[str, str], tuple[float, asyncio.Task[tuple[str, dict[str, str]]]]]
+] = HassKey(f"{DOMAIN}_probe_cache")
+
 STEP_USER_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_HOST): cv.string,
@@ -42,6 +108,132 @@ STEP_USER_SCHEMA = vol.Schema(
 )
 
 
+def _filter_section(current: dict[str, Any]) -> section:
+    """Options section for one sensor class's write filter (all off by default)."""
+    return section(
+        vol.Schema(
+            {
+                vol.Required(
+                    CONF_DEADBAND, default=current.get(CONF_DEADBAND, 0.0)
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(
+                    CONF_DEADBAND_RELATIVE,
+                    default=current.get(CONF_DEADBAND_RELATIVE, 0.0),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Required(
+                    CONF_MIN_WRITE_INTERVAL,
+                    default=current.get(CONF_MIN_WRITE_INTERVAL, 0),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                vol.Required(
+                    CONF_WINDOW, default=current.get(CONF_WINDOW, 1)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                vol.Required(
+                    CONF_AGGREGATE,
+                    default=current.get(CONF_AGGREGATE, AGGREGATE_MEAN),
+                ): vol.In([AGGREGATE_MEAN, AGGREGATE_MIN, AGGREGATE_MAX]),
+            }
+        ),
+        {"collapsed": True},
+    )
+
+
+def _controller_section(current: dict[str, Any]) -> section:
+    """Options section for the grid-power current-limit controller."""
+    return section(
+        vol.Schema(
+            {
+                vol.Optional(
+                    CONF_GRID_POWER_ENTITY,
+                    description={
+                        "suggested_value": current.get(CONF_GRID_POWER_ENTITY)
+                    },
+                ): EntitySelector(
+                    EntitySelectorConfig(
+                        domain="sensor", device_class=SensorDeviceClass.POWER
+                    )
+                ),
+                vol.Required(
+                    CONF_GRID_TARGET, default=current.get(CONF_GRID_TARGET, 0)
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100_000)),
+                vol.Required(
+                    CONF_CONTROL_HYSTERESIS,
+                    default=current.get(
+                        CONF_CONTROL_HYSTERESIS, DEFAULT_CONTROL_HYSTERESIS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                vol.Required(
+                    CONF_CONTROL_INTERVAL,
+                    default=current.get(
+                        CONF_CONTROL_INTERVAL, DEFAULT_CONTROL_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+            }
+        ),
+        {"collapsed": True},
+    )
+
+
+def _load_sharing_section(current: dict[str, Any]) -> section:
+    """Options section for the shared-fuse load allocator."""
+    return section(
+        vol.Schema(
+            {
+                vol.Required(
+                    CONF_SITE_LIMIT, default=current.get(CONF_SITE_LIMIT, 0)
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                vol.Required(
+                    CONF_PRIORITY,
+                    default=current.get(CONF_PRIORITY, DEFAULT_PRIORITY),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+            }
+        ),
+        {"collapsed": True},
+    )
+
+
+def _tariff_section(current: dict[str, Any]) -> section:
+    """Options section for the price source (entity or time-of-use table)."""
+    return section(
+        vol.Schema(
+            {
+                vol.Optional(
+                    CONF_PRICE_ENTITY,
+                    description={"suggested_value": current.get(CONF_PRICE_ENTITY)},
+                ): EntitySelector(EntitySelectorConfig(domain="sensor")),
+                vol.Required(
+                    CONF_PRICE_ATTRIBUTES,
+                    default=current.get(
+                        CONF_PRICE_ATTRIBUTES, DEFAULT_PRICE_ATTRIBUTES
+                    ),
+                ): cv.string,
+                vol.Optional(
+                    CONF_TOU_TABLE,
+                    description={"suggested_value": current.get(CONF_TOU_TABLE)},
+                ): TextSelector(TextSelectorConfig(multiline=True)),
+            }
+        ),
+        {"collapsed": True},
+    )
+
+
+def _scheduler_section(current: dict[str, Any]) -> section:
+    """Options section for the price-aware charging schedule."""
+    return section(
+        vol.Schema(
+            {
+                vol.Optional(
+                    CONF_DEPARTURE,
+                    description={"suggested_value": current.get(CONF_DEPARTURE)},
+                ): TimeSelector(),
+                vol.Required(
+                    CONF_ENERGY_TARGET, default=current.get(CONF_ENERGY_TARGET, 0)
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=200)),
+            }
+        ),
+        {"collapsed": True},
+    )
+
+
 async def _validate(
     hass, data: dict[str, Any]
 ) -> tuple[str, dict[str, str]]:
@@ -76,6 +268,28 @@ async def _validate(
     return charger_id, {}
 
 
+async def _async_probe_cached(
+    hass: HomeAssistant, host: str, mdns_name: str
+) -> tuple[str, dict[str, str]]:
+    """Unauthenticated probe for discovery, shared for PROBE_CACHE_TTL seconds.
+
+    Concurrent announcements for the same host and name await one request.
+    """
+    cache = hass.data.setdefault(_PROBE_CACHE, {})
+    now = time.monotonic()
+    for key in [key for key, (expires, _) in cache.items() if expires <= now]:
+        del cache[key]
+    if (cached := cache.get((host, mdns_name))) is None:
+        task = hass.async_create_task(
+            _validate(
+                hass, {CONF_HOST: host, CONF_USERNAME: "", CONF_PASSWORD: ""}
+            ),
+            f"{DOMAIN} probe {host}",
+        )
+        cached = cache[(host, mdns_name)] = (now + PROBE_CACHE_TTL, task)
+    return await asyncio.shield(cached[1])
+
+
 class VoltieChargerConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Voltie Charger."""
 
@@ -84,12 +298,22 @@ class VoltieChargerConfigFlow(ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         self._discovered_host: str | None = None
         self._discovered_charger_id: str | None = None
+        self._discovered_address: str | None = None
         self._discovered_mdns_name: str | None = None
+        self._scan_found: dict[str, str] = {}
+        self._scan_credentials: dict[str, str] = {}
+        self._scan_auth_required = 0
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Handle the initial user step."""
+        """Add one charger by address, or scan a subnet for several."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "scan"])
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Add a charger by IP address or hostname."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
@@ -106,11 +330,136 @@ class VoltieChargerConfigFlow(ConfigFlow, domain=DOMAIN):
                 )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=STEP_USER_SCHEMA,
             errors=errors,
         )
 
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Sweep a CIDR range for chargers (for networks that block mDNS)."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            username = (user_input.get(CONF_USERNAME) or "").strip()
+            password = user_input.get(CONF_PASSWORD) or ""
+            try:
+                network = ipaddress.IPv4Network(user_input[CONF_NETWORK], strict=False)
+            except ValueError:
+                errors[CONF_NETWORK] = "invalid_network"
+            else:
+                if network.num_addresses > SCAN_MAX_HOSTS:
+                    errors[CONF_NETWORK] = "network_too_large"
+                elif bool(username) != bool(password):
+                    errors["base"] = "incomplete_credentials"
+            if not errors:
+                result = await async_scan_network(
+                    async_get_clientsession(self.hass),
+                    network,
+                    username or None,
+                    password or None,
+                )
+                configured = self._async_current_ids(include_ignore=False)
+                self._scan_credentials = {
+                    CONF_USERNAME: username,
+                    CONF_PASSWORD: password,
+                }
+                self._scan_found = {
+                    charger_id: host
+                    for charger_id, host in result.chargers.items()
+                    if charger_id not in configured
+                }
+                self._scan_auth_required = len(result.auth_required)
+                if self._scan_found:
+                    return await self.async_step_scan_select()
+                errors["base"] = (
+                    "scan_auth_required"
+                    if result.auth_required
+                    else "no_chargers_found"
+                )
+
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=self.add_suggested_values_to_schema(
+                vol.Schema(
+                    {
+                        vol.Required(CONF_NETWORK): cv.string,
+                        vol.Optional(CONF_USERNAME, default=""): cv.string,
+                        vol.Optional(CONF_PASSWORD, default=""): cv.string,
+                    }
+                ),
+                user_input,
+            ),
+            errors=errors,
+        )
+
+    async def async_step_scan_select(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Pick which of the scanned chargers to add (all by default)."""
+        if user_input is not None:
+            selected = [
+                charger_id
+                for charger_id in user_input[CONF_CHARGERS]
+                if charger_id in self._scan_found
+            ]
+            if not selected:
+                return self.async_abort(reason="no_chargers_selected")
+            first, *rest = selected
+            # A flow creates one entry; the others get their own flows.
+            for charger_id in rest:
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": SOURCE_INTEGRATION_DISCOVERY},
+                        data={
+                            CONF_HOST: self._scan_found[charger_id],
+                            **self._scan_credentials,
+                        },
+                    )
+                )
+            await self.async_set_unique_id(first)
+            self._abort_if_unique_id_configured()
+            host = self._scan_found[first]
+            return self.async_create_entry(
+                title=f"Voltie Charger ({host})",
+                data={CONF_HOST: host, **self._scan_credentials},
+            )
+
+        options = {
+            charger_id: f"Voltie Charger {charger_id[-4:].lower()} ({host})"
+            for charger_id, host in self._scan_found.items()
+        }
+        return self.async_show_form(
+            step_id="scan_select",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_CHARGERS, default=list(options)): (
+                        cv.multi_select(options)
+                    ),
+                }
+            ),
+            description_placeholders={
+                "found": str(len(options)),
+                "auth_required": str(self._scan_auth_required),
+            },
+        )
+
+    async def async_step_integration_discovery(
+        self, discovery_info: dict[str, Any]
+    ) -> ConfigFlowResult:
+        """Add a charger the user already selected in the scan step."""
+        charger_id, errors = await _validate(self.hass, discovery_info)
+        if errors:
+            return self.async_abort(reason="cannot_connect")
+        await self.async_set_unique_id(charger_id)
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=f"Voltie Charger ({discovery_info[CONF_HOST]})",
+            data=discovery_info,
+        )
+
     async def async_step_reauth(
         self, entry_data: dict[str, Any]
     ) -> ConfigFlowResult:
@@ -195,11 +544,16 @@ class VoltieChargerConfigFlow(ConfigFlow, domain=DOMAIN):
 
         mdns_name = (discovery_info.name or "").split(".", 1)[0].lower() or host
         self._discovered_host = host
+        self._discovered_address = (
+            str(discovery_info.ip_address) if discovery_info.ip_address else None
+        )
         self._discovered_mdns_name = mdns_name
 
-        charger_id, errors = await _validate(
-            self.hass, {CONF_HOST: host, CONF_USERNAME: "", CONF_PASSWORD: ""}
-        )
+        if known := self._configured_entry(host, mdns_name):
+            # Repeated announcement of a charger we already have: no HTTP.
+            return self._async_update_configured(known)
+
+        charger_id, errors = await _async_probe_cached(self.hass, host, mdns_name)
 
         if errors.get("base") == "invalid_auth":
             if host_abort := self._host_configured_abort(host):
@@ -222,9 +576,8 @@ class VoltieChargerConfigFlow(ConfigFlow, domain=DOMAIN):
             return await self.async_step_api_disabled()
 
         await self.async_set_unique_id(charger_id)
-        self._abort_if_unique_id_configured(
-            updates={CONF_HOST: host}, reload_on_update=True
-        )
+        if entry := self._entry_for_charger(charger_id):
+            return self._async_update_configured(entry)
 
         self._discovered_charger_id = charger_id
         self.context["title_placeholders"] = {
@@ -233,6 +586,42 @@ class VoltieChargerConfigFlow(ConfigFlow, domain=DOMAIN):
         }
         return await self.async_step_zeroconf_confirm()
 
+    def _configured_entry(self, host: str, mdns_name: str) -> ConfigEntry | None:
+        """Entry for this charger, matched on its mDNS name or current host."""
+        for entry in self._async_current_entries(include_ignore=False):
+            if entry.unique_id and (
+                entry.data.get(CONF_MDNS_NAME) == mdns_name
+                or entry.data.get(CONF_HOST) == host
+            ):
+                return entry
+        return None
+
+    def _entry_for_charger(self, charger_id: str) -> ConfigEntry | None:
+        return self.hass.config_entries.async_entry_for_domain_unique_id(
+            DOMAIN, charger_id
+        )
+
+    @callback
+    def _async_update_configured(self, entry: ConfigEntry) -> ConfigFlowResult:
+        """Store a known charger's announced addresses and apply them live.
+
+        The running client picks them up directly; no reload is needed.
+        """
+        data = {
+            **entry.data,
+            CONF_HOST: self._discovered_host,
+            CONF_MDNS_NAME: self._discovered_mdns_name,
+        }
+        if self._discovered_address:
+            data[CONF_ADDRESS] = self._discovered_address
+        if data != entry.data:
+            self.hass.config_entries.async_update_entry(entry, data=data)
+            if entry.state is ConfigEntryState.LOADED:
+                entry.runtime_data.client.set_addresses(
+                    data[CONF_HOST], data.get(CONF_ADDRESS)
+                )
+        return self.async_abort(reason="already_configured")
+
     def _host_configured_abort(self, host: str) -> ConfigFlowResult | None:
         """Return an abort result if an existing entry is already using this host."""
         for entry in self._async_current_entries(include_ignore=False):
@@ -270,6 +659,10 @@ class VoltieChargerConfigFlow(ConfigFlow, domain=DOMAIN):
                 CONF_PASSWORD: "",
             },
         )
+        # Later announcements must not reuse the cached "API disabled" result.
+        self.hass.data.get(_PROBE_CACHE, {}).pop(
+            (self._discovered_host, self._discovered_mdns_name), None
+        )
 
         if errors.get("base") == "invalid_auth":
             return await self.async_step_discovery_auth()
@@ -277,10 +670,8 @@ class VoltieChargerConfigFlow(ConfigFlow, domain=DOMAIN):
             return await self.async_step_api_disabled()
 
         await self.async_set_unique_id(charger_id, raise_on_progress=False)
-        self._abort_if_unique_id_configured(
-            updates={CONF_HOST: self._discovered_host},
-            reload_on_update=True,
-        )
+        if entry := self._entry_for_charger(charger_id):
+            return self._async_update_configured(entry)
 
         self._discovered_charger_id = charger_id
         self.context["title_placeholders"] = {
@@ -299,6 +690,8 @@ class VoltieChargerConfigFlow(ConfigFlow, domain=DOMAIN):
                 title=f"Voltie Charger ({self._discovered_host})",
                 data={
                     CONF_HOST: self._discovered_host,
+                    CONF_ADDRESS: self._discovered_address,
+                    CONF_MDNS_NAME: self._discovered_mdns_name,
                     CONF_USERNAME: "",
                     CONF_PASSWORD: "",
                 },
@@ -317,14 +710,17 @@ class VoltieChargerConfigFlow(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            data = {CONF_HOST: self._discovered_host, **user_input}
+            data = {
+                CONF_HOST: self._discovered_host,
+                CONF_ADDRESS: self._discovered_address,
+                CONF_MDNS_NAME: self._discovered_mdns_name,
+                **user_input,
+            }
             charger_id, errors = await _validate(self.hass, data)
             if not errors:
                 await self.async_set_unique_id(charger_id, raise_on_progress=False)
-                self._abort_if_unique_id_configured(
-                    updates={CONF_HOST: self._discovered_host},
-                    reload_on_update=True,
-                )
+                if entry := self._entry_for_charger(charger_id):
+                    return self._async_update_configured(entry)
                 return self.async_create_entry(
                     title=f"Voltie Charger ({self._discovered_host})",
                     data=data,
@@ -349,15 +745,23 @@ class VoltieChargerConfigFlow(ConfigFlow, domain=DOMAIN):
 
 
 class VoltieChargerOptionsFlow(OptionsFlow):
-    """Options flow — currently just the poll interval."""
+    """Options flow — polling, capture, write filters and current control."""
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(data=user_input)
+            if table := user_input.get(CONF_TARIFF, {}).get(CONF_TOU_TABLE):
+                try:
+                    parse_tou_table(table)
+                except ValueError:
+                    errors["base"] = "invalid_tou_table"
+            if not errors:
+                return self.async_create_entry(data=user_input)
 
-        current = self.config_entry.options.get(
+        options = {**self.config_entry.options, **(user_input or {})}
+        current = options.get(
             CONF_SCAN_INTERVAL, int(DEFAULT_SCAN_INTERVAL.total_seconds())
         )
         schema = vol.Schema(
@@ -366,6 +770,50 @@ class VoltieChargerOptionsFlow(OptionsFlow):
                     vol.Coerce(int),
                     vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
                 ),
+                vol.Required(
+                    CONF_CAPTURE,
+                    default=options.get(CONF_CAPTURE, False),
+                ): cv.boolean,
+                vol.Required(
+                    CONF_COMPACT_ENTITIES,
+                    default=options.get(CONF_COMPACT_ENTITIES, False),
+                ): cv.boolean,
+                vol.Required(
+                    CONF_EXPORT,
+                    default=options.get(CONF_EXPORT, False),
+                ): cv.boolean,
+                vol.Required(
+                    CONF_PUSH,
+                    default=options.get(CONF_PUSH, False),
+                ): cv.boolean,
+                **{
+                    vol.Required(filter_class): _filter_section(
+                        options.get(filter_class) or {}
+                    )
+                    for filter_class in FILTER_CLASSES
+                },
+                vol.Required(CONF_CONTROLLER): _controller_section(
+                    options.get(CONF_CONTROLLER) or {}
+                ),
+                vol.Required(CONF_LOAD_SHARING): _load_sharing_section(
+                    options.get(CONF_LOAD_SHARING) or {}
+                ),
+                vol.Required(CONF_TARIFF): _tariff_section(
+                    options.get(CONF_TARIFF) or {}
+                ),
+                vol.Required(CONF_SCHEDULER): _scheduler_section(
+                    options.get(CONF_SCHEDULER) or {}
+                ),
             }
         )
-        return self.async_show_form(step_id="init", data_schema=schema)
+        webhook_id = self.config_entry.data.get(CONF_WEBHOOK_ID)
+        return self.async_show_form(
+            step_id="init",
+            data_schema=schema,
+            errors=errors,
+            description_placeholders={
+                "push_path": (
+                    webhook.async_generate_path(webhook_id) if webhook_id else "-"
+                )
+            },
+        )
@@ -32,15 +32,147 @@ ENDPOINT_CONFIG = "config"
 ENDPOINT_START = "start"
 ENDPOINT_STOP = "stop"
 
+# Last known IP of a discovered charger, raced against its hostname.
+CONF_ADDRESS = "address"
+# mDNS instance name stored on entries created from discovery.
+CONF_MDNS_NAME = "mdns_name"
+# Seconds a zeroconf probe result is reused for repeated announcements.
+PROBE_CACHE_TTL = 60
+
+# Subnet scan in the config flow: TCP connect timeout (s) per host, sweeps in
+# flight at once, and the largest range accepted (a /22).
+CONF_NETWORK = "network"
+CONF_CHARGERS = "chargers"
+SCAN_CONNECT_TIMEOUT = 0.5
+SCAN_CONCURRENCY = 64
+SCAN_MAX_HOSTS = 1024
+
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
 MIN_SCAN_INTERVAL = 5
 MAX_SCAN_INTERVAL = 300
 
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_CAPTURE = "capture"
+
+# Per sensor-class write filters (options-flow sections keyed by class).
+FILTER_CLASSES = ("voltage", "current", "power")
+CONF_DEADBAND = "deadband"
+CONF_DEADBAND_RELATIVE = "deadband_relative"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+CONF_WINDOW = "window"
+CONF_AGGREGATE = "aggregate"
+AGGREGATE_MEAN = "mean"
+AGGREGATE_MIN = "min"
+AGGREGATE_MAX = "max"
+
+# Raw-response capture (see capture.py): rotate at 5 MiB compressed, keep 3.
+# Written every CAPTURE_BATCH_SIZE requests (about 10 polls), since each
+# write appends a gzip member with its own header and dictionary.
+CAPTURE_MAX_BYTES = 5 * 1024 * 1024
+CAPTURE_BACKUP_COUNT = 3
+CAPTURE_BATCH_SIZE = 30
+
+# Telemetry export (see export.py): one gzip CSV per charger per UTC day,
+# written every EXPORT_BATCH_SIZE samples; oldest days go past the cap.
+CONF_EXPORT = "export"
+EXPORT_BATCH_SIZE = 60
+EXPORT_MAX_BYTES = 100 * 1024 * 1024
 
 DATA_STATUS = "status"
 DATA_POWER = "power"
 DATA_CONFIG = "config"
+# Integrated kWh totals keyed by ENERGY_KEY_* (computed, not polled).
+DATA_ENERGY = "energy"
+
+# Rolling mean/min/max keyed "<field>_<minutes>m" (computed, not polled).
+DATA_ROLLING = "rolling"
+ROLLING_FIELDS = ("charge_power", "current1", "current2", "current3")
+ROLLING_WINDOWS_MIN = (1, 5, 15)
+
+# Session and lifetime charging cost {"session", "total"} (computed, not polled).
+DATA_COST = "cost"
+
+ENERGY_KEY_CHARGE = "charge"
+ENERGY_KEY_PHASE = "l{phase}"
+# Samples further apart than this many poll intervals are not integrated.
+ENERGY_MAX_GAP_INTERVALS = 3
+
+# Payload keys scrubbed from diagnostics and captures.
+REDACT_DATA = {"charger_id", "idtag", "idtag_name"}
+
+# Hardware capabilities detected from /status and /power. Entities for a
+# capability are only created once the charger has reported it.
+CAP_PHASE_2 = "phase_2"
+CAP_PHASE_3 = "phase_3"
+CAP_DLM = "dlm"
+CAP_IPM = "ipm"
+# Successful /power reads without a capability before its stale registry
+# entries are removed.
+CAPABILITY_ABSENT_POLLS = 3
+
+# Completed charging sessions (SQLite, shared by all entries) under .storage.
+SESSION_DB_FILE = f"{DOMAIN}_sessions.db"
+# Sessions per recorder import when backfilling statistics after downtime.
+STATISTICS_BATCH_SIZE = 50
+
+# Recent samples kept in memory per charger (1 h at the 5 s minimum interval).
+SAMPLE_BUFFER_SIZE = 720
+# Compact entity mode (top-level option): per-phase values as five sensors
+# with an L1..L3 attribute instead of fifteen separate entities.
+CONF_COMPACT_ENTITIES = "compact_entities"
+
+# Webhook push ingestion (top-level option). While pushes keep arriving the
+# charger is only polled this often, and pushes older than this count as stopped.
+CONF_PUSH = "push"
+PUSH_HEARTBEAT_INTERVAL = timedelta(seconds=60)
+
+# Chargers written at once by the fleet services (set_config, start, ...).
+FAN_OUT_CONCURRENCY = 16
+
+# On-demand fast sampling (sample_high_res action): limits in seconds.
+HIGH_RES_MIN_INTERVAL = 0.5
+HIGH_RES_MAX_DURATION = 900
+
+# Poll cycles kept per charger for the diagnostics performance report.
+PERF_HISTORY = 30
+
+# Grid-power controller (options section "controller").
+CONF_CONTROLLER = "controller"
+CONF_GRID_POWER_ENTITY = "grid_power_entity"
+# Grid import to aim for in W; 0 = charge from surplus only.
+CONF_GRID_TARGET = "grid_target"
+CONF_CONTROL_HYSTERESIS = "hysteresis"
+CONF_CONTROL_INTERVAL = "min_interval"
+DEFAULT_CONTROL_HYSTERESIS = 1
+DEFAULT_CONTROL_INTERVAL = 30
+# Used when /status has no mains_voltage yet.
+NOMINAL_VOLTAGE = 230
+
+# Shared-fuse load allocation across chargers (options section "load_sharing").
+CONF_LOAD_SHARING = "load_sharing"
+# Per-phase supply limit in A shared by every participating charger; 0 = off.
+CONF_SITE_LIMIT = "site_limit"
+CONF_PRIORITY = "priority"
+DEFAULT_PRIORITY = 1
+ALLOCATOR_INTERVAL = timedelta(seconds=15)
+# Allocation cycles kept for diagnostics.
+ALLOCATOR_HISTORY = 20
+
+# Electricity prices (options section "tariff"), used for scheduling and cost.
+CONF_TARIFF = "tariff"
+CONF_PRICE_ENTITY = "price_entity"
+# Comma-separated list-valued attributes holding {start, end, value} entries.
+CONF_PRICE_ATTRIBUTES = "price_attributes"
+DEFAULT_PRICE_ATTRIBUTES = "raw_today, raw_tomorrow"
+# "HH:MM price" per line, repeating daily; used when no price entity is set.
+CONF_TOU_TABLE = "tou_table"
+
+# Price-aware charging schedule (options section "scheduler").
+CONF_SCHEDULER = "scheduler"
+CONF_DEPARTURE = "departure"
+CONF_ENERGY_TARGET = "energy_target"
+# Replan when delivered energy drifts this far (kWh) from the plan.
+SCHEDULER_REPLAN_KWH = 0.5
 
 CURRENT_LIMIT_MIN = 6
 CURRENT_LIMIT_MAX = 32
@@ -68,3 +200,16 @@ EVSE_STATES: dict[int, str] = {
     17: "undervoltage",
 }
 EVSE_STATE_ERROR = "error"
+EVSE_FAULT_STATES = frozenset(code for code in EVSE_STATES if code >= 5)
+
+# Bus event for plug/charging/fault transitions; "type" says which.
+EVENT_VOLTIE_CHARGER = f"{DOMAIN}_event"
+# After any transition, poll this fast for a while to catch follow-up states.
+BURST_SCAN_INTERVAL = timedelta(seconds=3)
+BURST_DURATION_S = 30
+
+# Fault journal (see faults.py): entries kept per charger, polling while a
+# fault is active, and the delay that coalesces Store writes.
+FAULT_JOURNAL_SIZE = 50
+FAULT_SCAN_INTERVAL = timedelta(seconds=5)
+FAULT_JOURNAL_SAVE_DELAY = 10
@@ -0,0 +1,172 @@
+"""Closed-loop current-limit controller driven by a grid power sensor."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import UnitOfPower
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .client import VoltieChargerError
+from .const import (
+    CONF_CONTROL_HYSTERESIS,
+    CONF_CONTROL_INTERVAL,
+    CONF_GRID_POWER_ENTITY,
+    CONF_GRID_TARGET,
+    CURRENT_LIMIT_MAX,
+    CURRENT_LIMIT_MIN,
+    CURRENT_LIMIT_STEP,
+    DATA_CONFIG,
+    DATA_STATUS,
+    DEFAULT_CONTROL_HYSTERESIS,
+    DEFAULT_CONTROL_INTERVAL,
+    NOMINAL_VOLTAGE,
+)
+
+if TYPE_CHECKING:
+    from . import VoltieChargerCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def target_current(
+    grid_power_w: float,
+    charge_power_w: float,
+    grid_target_w: float,
+    voltage: float,
+    phases: int,
+) -> int:
+    """Current limit that moves grid power to ``grid_target_w``.
+
+    Grid power is positive when importing. A target of 0 W charges from
+    surplus only; a positive target caps total import at that level.
+    """
+    available_w = charge_power_w + grid_target_w - grid_power_w
+    amps = available_w / (voltage * phases)
+    stepped = int(amps // CURRENT_LIMIT_STEP) * CURRENT_LIMIT_STEP
+    return max(CURRENT_LIMIT_MIN, min(CURRENT_LIMIT_MAX, stepped))
+
+
+class CurrentLimitController:
+    """Writes conf_current_limit from a grid power entity's updates.
+
+    A write only happens when the target moved by at least the hysteresis,
+    differs from the charger's current config, and the minimum interval since
+    the previous write has passed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: VoltieChargerCoordinator,
+        options: dict[str, Any],
+    ) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self.entity_id: str = options[CONF_GRID_POWER_ENTITY]
+        self._grid_target = float(options.get(CONF_GRID_TARGET) or 0)
+        self._hysteresis = int(
+            options.get(CONF_CONTROL_HYSTERESIS, DEFAULT_CONTROL_HYSTERESIS)
+        )
+        self._interval = float(
+            options.get(CONF_CONTROL_INTERVAL, DEFAULT_CONTROL_INTERVAL)
+        )
+        self._written_at: float | None = None
+        self._writing = False
+        self._listeners: list[CALLBACK_TYPE] = []
+        self.writes = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_target: int | None = None
+        self.last_latency_ms: float | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        return async_track_state_change_event(
+            self.hass, [self.entity_id], self._async_grid_changed
+        )
+
+    @callback
+    def async_add_listener(self, update: CALLBACK_TYPE) -> Callable[[], None]:
+        """Notify ``update`` when the metrics change."""
+        self._listeners.append(update)
+        return lambda: self._listeners.remove(update)
+
+    @callback
+    def _async_grid_changed(self, event: Event[EventStateChangedData]) -> None:
+        received_at = time.monotonic()
+        if (state := event.data["new_state"]) is None:
+            return
+        try:
+            grid_w = float(state.state)
+        except ValueError:
+            return
+        if state.attributes.get("unit_of_measurement") == UnitOfPower.KILO_WATT:
+            grid_w *= 1000
+
+        data = self.coordinator.data or {}
+        status = data.get(DATA_STATUS) or {}
+        current_limit = (data.get(DATA_CONFIG) or {}).get("conf_current_limit")
+        if not status.get("is_car_connected") or not isinstance(current_limit, int):
+            return
+
+        phases = 3 if status.get("phases") == 3 else 1
+        voltage = status.get("mains_voltage") or NOMINAL_VOLTAGE
+        charge_w = float(status.get("charge_power") or 0) * 1000
+        target = target_current(grid_w, charge_w, self._grid_target, voltage, phases)
+        self.last_target = target
+
+        if (
+            target == current_limit
+            or abs(target - current_limit) < self._hysteresis
+            or self._writing
+            or (
+                self._written_at is not None
+                and received_at - self._written_at < self._interval
+            )
+        ):
+            self.skipped += 1
+            return
+
+        self._writing = True
+        self._written_at = received_at
+        self.coordinator.entry.async_create_background_task(
+            self.hass,
+            self._async_write(target, received_at),
+            f"voltie_charger current limit {self.coordinator.charger_id}",
+        )
+
+    async def _async_write(self, target: int, received_at: float) -> None:
+        try:
+            await self.coordinator.async_push_config({"conf_current_limit": target})
+        except (VoltieChargerError, HomeAssistantError) as exc:
+            self.failures += 1
+            _LOGGER.warning("Controller could not set current limit: %s", exc)
+        else:
+            self.writes += 1
+            self.last_latency_ms = (time.monotonic() - received_at) * 1000
+        finally:
+            self._writing = False
+        for update in list(self._listeners):
+            update()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "entity_id": self.entity_id,
+            "grid_target_w": self._grid_target,
+            "writes": self.writes,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "last_target": self.last_target,
+            "last_latency_ms": self.last_latency_ms,
+        }
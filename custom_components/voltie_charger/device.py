@@ -0,0 +1,64 @@
+"""Device registry helpers shared by the coordinator and entities."""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DEFAULT_MODEL, DOMAIN, MANUFACTURER
+
+_MDNS_SUFFIX_RE = re.compile(r"voltiecharger-([0-9a-f]+)", re.IGNORECASE)
+
+
+def _format_sw_version(raw: Any) -> str | None:
+    """Decode the decimal-packed software version (e.g. 1001036 -> '1.1.36')."""
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return None
+    major = value // 1_000_000
+    minor = (value // 1_000) % 1_000
+    patch = value % 1_000
+    return f"{major}.{minor}.{patch}"
+
+
+def _format_fw_version(raw: Any) -> str | None:
+    """Decode the decimal-packed firmware version (e.g. 199 -> '1.99')."""
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return None
+    return f"{value // 100}.{value % 100}"
+
+
+def _display_suffix(host: str, charger_id: str) -> str:
+    """Return the 4-char suffix used in the display name.
+
+    Prefers the MAC-derived mDNS hostname suffix since that's what's printed
+    on the charger's physical label; falls back to the last 4 of charger_id
+    for manually-added chargers.
+    """
+    if match := _MDNS_SUFFIX_RE.match(host):
+        return match.group(1).lower()
+    return charger_id[-4:] if charger_id else ""
+
+
+def build_device_info(
+    charger_id: str,
+    entry_host: str,
+    client_host: str,
+    status: dict[str, Any],
+) -> DeviceInfo:
+    """Build the DeviceInfo shared by every entity of one charger."""
+    suffix = _display_suffix(entry_host, charger_id)
+    return DeviceInfo(
+        identifiers={(DOMAIN, charger_id)},
+        manufacturer=MANUFACTURER,
+        model=DEFAULT_MODEL,
+        name=f"Voltie Charger {suffix}".rstrip(),
+        serial_number=charger_id,
+        sw_version=_format_sw_version(status.get("sw_ver")),
+        hw_version=_format_fw_version(status.get("fw_ver")),
+        configuration_url=f"http://{client_host}",
+    )
@@ -4,19 +4,35 @@ from __future__ import annotations
 from typing import Any
 
 from homeassistant.components.diagnostics import async_redact_data
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_WEBHOOK_ID,
+)
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.json import json_bytes
 
 from . import VoltieChargerConfigEntry
+from .allocator import ALLOCATOR_KEY
+from .const import CONF_ADDRESS, CONF_COMPACT_ENTITIES, CONF_MDNS_NAME, REDACT_DATA
 
-REDACT_CONFIG = {CONF_PASSWORD, CONF_USERNAME, CONF_HOST}
-REDACT_DATA = {"charger_id", "idtag", "idtag_name"}
+REDACT_CONFIG = {
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_HOST,
+    CONF_ADDRESS,
+    CONF_MDNS_NAME,
+    CONF_WEBHOOK_ID,
+}
 
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: VoltieChargerConfigEntry
 ) -> dict[str, Any]:
     coordinator = entry.runtime_data
+    allocator = hass.data.get(ALLOCATOR_KEY)
     return {
         "entry": {
             "version": entry.version,
@@ -32,4 +48,47 @@ async def async_get_config_entry_diagnostics(
             ),
             "data": async_redact_data(coordinator.data or {}, REDACT_DATA),
         },
+        "performance": coordinator.performance_report(),
+        "high_res": (
+            coordinator.high_res.as_dict() if coordinator.high_res else None
+        ),
+        "export": coordinator.export.as_dict() if coordinator.export else None,
+        "entities": _entity_footprint(hass, entry),
+        "push": {"pushing": coordinator.pushing, "pushes": coordinator.pushes},
+        "sample_buffer": {
+            "samples": len(coordinator.samples),
+            "capacity": coordinator.samples.capacity,
+            "bytes": coordinator.samples.nbytes,
+        },
+        "controller": (
+            coordinator.controller.as_dict() if coordinator.controller else None
+        ),
+        "events": coordinator.events.as_dict() if coordinator.events else None,
+        "faults": coordinator.faults.as_list() if coordinator.faults else None,
+        "scheduler": (
+            coordinator.scheduler.as_dict() if coordinator.scheduler else None
+        ),
+        "load_sharing": (
+            allocator.as_dict(coordinator.charger_id) if allocator else None
+        ),
+    }
+
+
+def _entity_footprint(
+    hass: HomeAssistant, entry: VoltieChargerConfigEntry
+) -> dict[str, Any]:
+    """Entity count, state size and setup time, to compare entity modes."""
+    entity_ids = [
+        entity.entity_id
+        for entity in er.async_entries_for_config_entry(
+            er.async_get(hass), entry.entry_id
+        )
+    ]
+    states = [state for eid in entity_ids if (state := hass.states.get(eid))]
+    return {
+        "compact": bool(entry.options.get(CONF_COMPACT_ENTITIES)),
+        "registered": len(entity_ids),
+        "with_state": len(states),
+        "state_bytes": sum(len(json_bytes(state.as_dict())) for state in states),
+        "setup_ms": entry.runtime_data.setup_ms,
     }
@@ -0,0 +1,40 @@
+"""Trapezoidal energy integration of polled power samples."""
+from __future__ import annotations
+
+from typing import Any
+
+
+class EnergyIntegrator:
+    """Accumulates kWh per key from kW samples taken at irregular times.
+
+    Samples further apart than ``max_gap`` seconds (failed polls, a stalled
+    charger) are not bridged: the interval is dropped rather than guessed.
+    """
+
+    def __init__(self) -> None:
+        self._totals: dict[str, float] = {}
+        self._last: dict[str, tuple[float, float]] = {}
+        self._restored: set[str] = set()
+
+    def add_sample(self, key: str, now: float, power: Any, max_gap: float) -> None:
+        """Integrate one kW sample taken at monotonic time ``now``."""
+        if not isinstance(power, (int, float)) or isinstance(power, bool):
+            self._last.pop(key, None)
+            return
+        power = max(0.0, float(power))
+        self._totals.setdefault(key, 0.0)
+        if (last := self._last.get(key)) is not None:
+            elapsed = now - last[0]
+            if 0 < elapsed <= max_gap:
+                self._totals[key] += (last[1] + power) / 2 * elapsed / 3600
+        self._last[key] = (now, power)
+
+    def restore(self, key: str, value: float) -> None:
+        """Add a persisted total from before the restart (once per key)."""
+        if key in self._restored:
+            return
+        self._restored.add(key)
+        self._totals[key] = self._totals.get(key, 0.0) + value
+
+    def snapshot(self) -> dict[str, float]:
+        return dict(self._totals)
@@ -1,50 +1,23 @@
 """Shared base entity."""
 from __future__ import annotations
 
-import re
+from collections.abc import Callable, Iterable
 from typing import Any
 
-from homeassistant.const import CONF_HOST
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import VoltieChargerCoordinator
-from .const import DATA_STATUS, DEFAULT_MODEL, DOMAIN, MANUFACTURER
+from .const import CAPABILITY_ABSENT_POLLS, DOMAIN
 
-_MDNS_SUFFIX_RE = re.compile(r"voltiecharger-([0-9a-f]+)", re.IGNORECASE)
 
-
-def _format_sw_version(raw: Any) -> str | None:
-    """Decode the decimal-packed software version (e.g. 1001036 -> '1.1.36')."""
-    try:
-        value = int(raw)
-    except (TypeError, ValueError):
-        return None
-    major = value // 1_000_000
-    minor = (value // 1_000) % 1_000
-    patch = value % 1_000
-    return f"{major}.{minor}.{patch}"
-
-
-def _format_fw_version(raw: Any) -> str | None:
-    """Decode the decimal-packed firmware version (e.g. 199 -> '1.99')."""
-    try:
-        value = int(raw)
-    except (TypeError, ValueError):
-        return None
-    return f"{value // 100}.{value % 100}"
-
-
-def _display_suffix(host: str, charger_id: str) -> str:
-    """Return the 4-char suffix used in the display name.
-
-    Prefers the MAC-derived mDNS hostname suffix since that's what's printed
-    on the charger's physical label; falls back to the last 4 of charger_id
-    for manually-added chargers.
-    """
-    if match := _MDNS_SUFFIX_RE.match(host):
-        return match.group(1).lower()
-    return charger_id[-4:] if charger_id else ""
+def _unique_id(key: str, entry_id: str) -> str:
+    return f"voltie_charger_{key}_{entry_id}"
 
 
 class VoltieChargerEntity(CoordinatorEntity[VoltieChargerCoordinator]):
@@ -54,22 +27,75 @@ class VoltieChargerEntity(CoordinatorEntity[VoltieChargerCoordinator]):
 
     def __init__(self, coordinator: VoltieChargerCoordinator, key: str) -> None:
         super().__init__(coordinator)
-        self._attr_unique_id = f"voltie_charger_{key}_{coordinator.entry.entry_id}"
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        charger_id = self.coordinator.charger_id
-        status = (self.coordinator.data or {}).get(DATA_STATUS, {})
-        host = self.coordinator.entry.data.get(CONF_HOST, "")
-        suffix = _display_suffix(host, charger_id)
-
-        return DeviceInfo(
-            identifiers={(DOMAIN, charger_id)},
-            manufacturer=MANUFACTURER,
-            model=DEFAULT_MODEL,
-            name=f"Voltie Charger {suffix}".rstrip(),
-            serial_number=charger_id,
-            sw_version=_format_sw_version(status.get("sw_ver")),
-            hw_version=_format_fw_version(status.get("fw_ver")),
-            configuration_url=f"http://{self.coordinator.client.host}",
-        )
+        self._attr_unique_id = _unique_id(key, coordinator.entry.entry_id)
+        # Built once per charger by the coordinator; firmware changes are
+        # pushed to the device registry there rather than per entity.
+        self._attr_device_info = coordinator.device_info
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        # Counted for the diagnostics performance report.
+        self.coordinator.perf.state_writes += 1
+        super().async_write_ha_state()
+
+
+@callback
+def async_add_capability_entities(
+    entry: ConfigEntry,
+    coordinator: VoltieChargerCoordinator,
+    platform: Platform,
+    descriptions: Iterable[Any],
+    factory: Callable[[Any], Entity],
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add entities whose required_capabilities the charger has reported.
+
+    Descriptions for hardware that shows up later (e.g. a DLM meter wired in
+    after setup) are added on the first update that reports it. Registry
+    entries for hardware still missing after CAPABILITY_ABSENT_POLLS good
+    /power reads are removed, so they don't linger as unavailable; a failed
+    read at startup alone never removes anything.
+    """
+    pending = list(descriptions)
+    seen: frozenset[str] | None = None
+    pruned = False
+
+    @callback
+    def _add_supported() -> None:
+        nonlocal pending, seen, pruned
+        if not pruned and coordinator.power_responses >= CAPABILITY_ABSENT_POLLS:
+            pruned = True
+            async_remove_entities(
+                coordinator.hass,
+                entry,
+                platform,
+                (
+                    d.key
+                    for d in pending
+                    if not d.required_capabilities <= coordinator.capabilities
+                ),
+            )
+        if coordinator.capabilities is seen or not pending:
+            return
+        seen = coordinator.capabilities
+        ready = [d for d in pending if d.required_capabilities <= seen]
+        if not ready:
+            return
+        pending = [d for d in pending if d not in ready]
+        async_add_entities(factory(d) for d in ready)
+
+    _add_supported()
+    entry.async_on_unload(coordinator.async_add_listener(_add_supported))
+
+
+@callback
+def async_remove_entities(
+    hass: HomeAssistant, entry: ConfigEntry, platform: Platform, keys: Iterable[str]
+) -> None:
+    """Drop registry entries of entities this entry no longer creates."""
+    ent_reg = er.async_get(hass)
+    for key in keys:
+        if entity_id := ent_reg.async_get_entity_id(
+            platform, DOMAIN, _unique_id(key, entry.entry_id)
+        ):
+            ent_reg.async_remove(entity_id)
@@ -0,0 +1,105 @@
+"""Bus events for plug, charging and fault transitions seen in /status."""
+from __future__ import annotations
+
+from collections import Counter
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN, EVENT_VOLTIE_CHARGER, EVSE_FAULT_STATES, EVSE_STATES
+
+EVENT_PLUGGED = "plugged"
+EVENT_UNPLUGGED = "unplugged"
+EVENT_CHARGING_STARTED = "charging_started"
+EVENT_CHARGING_STOPPED = "charging_stopped"
+EVENT_FAULT_RAISED = "fault_raised"
+EVENT_FAULT_CLEARED = "fault_cleared"
+
+
+def _fault(status: dict[str, Any]) -> int | None:
+    state = status.get("evse_state")
+    return state if state in EVSE_FAULT_STATES else None
+
+
+def detect_transitions(
+    previous: dict[str, Any], status: dict[str, Any]
+) -> list[tuple[str, dict[str, Any]]]:
+    """Transitions between two /status payloads as (event type, extra data).
+
+    Nothing is reported on the first payload or for fields missing from
+    either side, so a failed poll never looks like an unplug.
+    """
+    if not previous:
+        return []
+    transitions: list[tuple[str, dict[str, Any]]] = []
+    for field, on, off in (
+        ("is_car_connected", EVENT_PLUGGED, EVENT_UNPLUGGED),
+        ("is_charging", EVENT_CHARGING_STARTED, EVENT_CHARGING_STOPPED),
+    ):
+        before, after = previous.get(field), status.get(field)
+        if before is None or after is None or bool(before) == bool(after):
+            continue
+        transitions.append((on if after else off, {}))
+
+    before_fault, after_fault = _fault(previous), _fault(status)
+    if before_fault != after_fault:
+        if before_fault is not None:
+            transitions.append(
+                (
+                    EVENT_FAULT_CLEARED,
+                    {"evse_state": EVSE_STATES[before_fault], "code": before_fault},
+                )
+            )
+        if after_fault is not None:
+            transitions.append(
+                (
+                    EVENT_FAULT_RAISED,
+                    {"evse_state": EVSE_STATES[after_fault], "code": after_fault},
+                )
+            )
+    return transitions
+
+
+class TransitionEvents:
+    """Fires EVENT_VOLTIE_CHARGER events and keeps emission latency metrics.
+
+    Latency runs from the /status response that revealed the transition to
+    the event being fired, i.e. it includes the rest of that poll.
+    """
+
+    def __init__(self, hass: HomeAssistant, charger_id: str) -> None:
+        self.hass = hass
+        self.charger_id = charger_id
+        self.fired: Counter[str] = Counter()
+        self.last_latency_ms: float | None = None
+        self.max_latency_ms: float | None = None
+
+    @callback
+    def async_fire(
+        self, transitions: list[tuple[str, dict[str, Any]]], detected_at: float
+    ) -> None:
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, self.charger_id)}
+        )
+        for event_type, extra in transitions:
+            self.hass.bus.async_fire(
+                EVENT_VOLTIE_CHARGER,
+                {
+                    "device_id": device.id if device else None,
+                    "type": event_type,
+                    **extra,
+                },
+            )
+            self.fired[event_type] += 1
+        latency = (time.monotonic() - detected_at) * 1000
+        self.last_latency_ms = latency
+        self.max_latency_ms = max(self.max_latency_ms or 0.0, latency)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "fired": dict(self.fired),
+            "last_latency_ms": self.last_latency_ms,
+            "max_latency_ms": self.max_latency_ms,
+        }
@@ -0,0 +1,149 @@
+"""Rolling export of every polled sample for offline analysis.
+
+One gzip-compressed CSV per charger per UTC day, with a fixed column order
+and a header at the top of each file. Samples are batched on the event loop
+and written in the executor; once the directory is over its size cap the
+oldest days are deleted.
+"""
+from __future__ import annotations
+
+import csv
+from datetime import UTC, datetime
+import gzip
+import io
+import logging
+import math
+import os
+import threading
+from typing import Any
+
+from .const import EXPORT_BATCH_SIZE, EXPORT_MAX_BYTES
+from .samples import POWER_STAT_FIELDS
+
+_LOGGER = logging.getLogger(__name__)
+
+STATUS_EXPORT_FIELDS = (
+    "evse_state",
+    "is_car_connected",
+    "is_charging",
+    "charge_enabled",
+    "charge_power",
+    "current_offered",
+    "mains_voltage",
+    "phases",
+)
+EXPORT_COLUMNS = ("t", *STATUS_EXPORT_FIELDS, *POWER_STAT_FIELDS)
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float) and math.isnan(value):
+        return ""
+    return "" if value is None else value
+
+
+class TelemetryExport:
+    """Buffers samples and appends them to ``<directory>/<YYYY-MM-DD>.csv.gz``."""
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        batch_size: int = EXPORT_BATCH_SIZE,
+        max_bytes: int = EXPORT_MAX_BYTES,
+    ) -> None:
+        self.directory = directory
+        self._batch_size = batch_size
+        self._max_bytes = max_bytes
+        self._pending: list[tuple[Any, ...]] = []
+        self._write_lock = threading.Lock()
+        self.rows_written = 0
+        self.files_pruned = 0
+        self.write_errors = 0
+
+    def record(
+        self, stamp: float, status: dict[str, Any], power: dict[str, Any]
+    ) -> bool:
+        """Queue one sample; True once a batch is ready to flush."""
+        stat = power.get("power_stat") or {}
+        self._pending.append(
+            (
+                round(stamp, 3),
+                *(status.get(name) for name in STATUS_EXPORT_FIELDS),
+                *(stat.get(name) for name in POWER_STAT_FIELDS),
+            )
+        )
+        return len(self._pending) >= self._batch_size
+
+    def take(self) -> list[tuple[Any, ...]]:
+        """Hand over the queued samples; called from the event loop."""
+        pending, self._pending = self._pending, []
+        return pending
+
+    def flush(self, pending: list[tuple[Any, ...]]) -> None:
+        """Write samples from ``take()`` to disk. Runs in the executor.
+
+        Nobody awaits the flush, so a write error is logged here; the batch
+        is dropped rather than retried.
+        """
+        if not pending:
+            return
+        try:
+            self._write(pending)
+        except OSError as exc:
+            self.write_errors += 1
+            _LOGGER.warning(
+                "Could not write %d telemetry samples to %s: %s",
+                len(pending),
+                self.directory,
+                exc,
+            )
+
+    def _write(self, pending: list[tuple[Any, ...]]) -> None:
+        by_day: dict[str, list[tuple[Any, ...]]] = {}
+        for row in pending:
+            day = datetime.fromtimestamp(row[0], UTC).date().isoformat()
+            by_day.setdefault(day, []).append(row)
+
+        with self._write_lock:
+            os.makedirs(self.directory, exist_ok=True)
+            for day, rows in by_day.items():
+                path = os.path.join(self.directory, f"{day}.csv.gz")
+                buffer = io.StringIO()
+                writer = csv.writer(buffer, lineterminator="\n")
+                if not os.path.exists(path):
+                    writer.writerow(EXPORT_COLUMNS)
+                writer.writerows([_cell(value) for value in row] for row in rows)
+                # Each flush appends one gzip member; readers see one stream.
+                with gzip.open(path, "ab") as file:
+                    file.write(buffer.getvalue().encode())
+                self.rows_written += len(rows)
+            self._prune()
+
+    def _prune(self) -> None:
+        files = sorted(
+            (
+                entry
+                for entry in os.scandir(self.directory)
+                if entry.is_file() and entry.name.endswith(".csv.gz")
+            ),
+            key=lambda entry: entry.name,
+        )
+        sizes = [entry.stat().st_size for entry in files]
+        total = sum(sizes)
+        # Never delete the newest file, even if it alone exceeds the cap.
+        for entry, size in zip(files[:-1], sizes):
+            if total <= self._max_bytes:
+                break
+            os.remove(entry.path)
+            total -= size
+            self.files_pruned += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "rows_written": self.rows_written,
+            "files_pruned": self.files_pruned,
+            "write_errors": self.write_errors,
+        }
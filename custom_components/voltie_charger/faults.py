@@ -0,0 +1,79 @@
+"""Per-charger journal of EVSE faults, persisted across restarts."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from .const import (
+    DOMAIN,
+    EVSE_FAULT_STATES,
+    EVSE_STATES,
+    FAULT_JOURNAL_SAVE_DELAY,
+    FAULT_JOURNAL_SIZE,
+)
+
+STORAGE_VERSION = 1
+
+
+class FaultJournal:
+    """Bounded ring of faults: code, name, start, end, duration, power_stat.
+
+    The newest entry stays open (end None) while the fault is active. Saves
+    are delayed so a burst of changes is written once.
+    """
+
+    def __init__(self, hass: HomeAssistant, charger_id: str) -> None:
+        self._store: Store[list[dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.faults_{slugify(charger_id)}"
+        )
+        self.entries: deque[dict[str, Any]] = deque(maxlen=FAULT_JOURNAL_SIZE)
+
+    async def async_load(self) -> None:
+        if stored := await self._store.async_load():
+            self.entries.extend(stored)
+
+    @property
+    def active(self) -> dict[str, Any] | None:
+        """The open fault entry, if a fault is in progress."""
+        if self.entries and self.entries[-1]["end"] is None:
+            return self.entries[-1]
+        return None
+
+    @callback
+    def async_update(
+        self, status: dict[str, Any], power: dict[str, Any], now: float
+    ) -> None:
+        """Open or close entries from one /status (and /power at onset)."""
+        state = status.get("evse_state")
+        if state is None:
+            return
+        code = state if state in EVSE_FAULT_STATES else None
+        active = self.active
+        if active is not None and active["code"] == code:
+            return
+        if active is None and code is None:
+            return
+        if active is not None:
+            active["end"] = now
+            active["duration"] = round(now - active["start"], 1)
+        if code is not None:
+            self.entries.append(
+                {
+                    "code": code,
+                    "evse_state": EVSE_STATES[code],
+                    "start": now,
+                    "end": None,
+                    "duration": None,
+                    "power_stat": dict(power.get("power_stat") or {}),
+                }
+            )
+        self._store.async_delay_save(
+            lambda: list(self.entries), FAULT_JOURNAL_SAVE_DELAY
+        )
+
+    def as_list(self) -> list[dict[str, Any]]:
+        return [dict(entry) for entry in self.entries]
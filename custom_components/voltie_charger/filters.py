@@ -0,0 +1,110 @@
+"""State-write filters for high-frequency numeric sensors."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    AGGREGATE_MAX,
+    AGGREGATE_MEAN,
+    AGGREGATE_MIN,
+    CONF_AGGREGATE,
+    CONF_DEADBAND,
+    CONF_DEADBAND_RELATIVE,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_WINDOW,
+)
+
+_AGGREGATES = {
+    AGGREGATE_MEAN: lambda values: sum(values) / len(values),
+    AGGREGATE_MIN: min,
+    AGGREGATE_MAX: max,
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class WriteFilter:
+    """How aggressively a sensor may skip state writes.
+
+    ``deadband`` is absolute, ``deadband_relative`` a fraction of the last
+    written value; the larger of the two applies. ``window`` > 1 aggregates
+    that many samples into one candidate value before the deadband check.
+    """
+
+    deadband: float = 0.0
+    deadband_relative: float = 0.0
+    min_interval: float = 0.0
+    window: int = 1
+    aggregate: str = AGGREGATE_MEAN
+
+    @classmethod
+    def from_options(cls, options: dict[str, Any]) -> WriteFilter | None:
+        """Build from an options-flow section; None when everything is off."""
+        write_filter = cls(
+            deadband=float(options.get(CONF_DEADBAND) or 0.0),
+            deadband_relative=float(options.get(CONF_DEADBAND_RELATIVE) or 0.0) / 100,
+            min_interval=float(options.get(CONF_MIN_WRITE_INTERVAL) or 0.0),
+            window=max(1, int(options.get(CONF_WINDOW) or 1)),
+            aggregate=options.get(CONF_AGGREGATE) or AGGREGATE_MEAN,
+        )
+        return write_filter if write_filter.active else None
+
+    @property
+    def active(self) -> bool:
+        return bool(
+            self.deadband
+            or self.deadband_relative
+            or self.min_interval
+            or self.window > 1
+        )
+
+
+class SampleFilter:
+    """Per-entity runtime state for a WriteFilter."""
+
+    def __init__(self, write_filter: WriteFilter) -> None:
+        self._filter = write_filter
+        self._window: list[float] = []
+        self._written_at: float | None = None
+        self.value: float | None = None
+
+    def update(self, raw: Any, now: float) -> bool:
+        """Feed one sample; return True if the entity should write state."""
+        if not isinstance(raw, (int, float)) or isinstance(raw, bool):
+            self._window.clear()
+            if self.value is None and self._written_at is not None:
+                return False
+            return self._write(None, now)
+
+        if self.value is None:
+            # Never hold back the first real value behind a window.
+            self._window.clear()
+            return self._write(float(raw), now)
+
+        candidate = float(raw)
+        if self._filter.window > 1:
+            self._window.append(candidate)
+            if len(self._window) < self._filter.window:
+                return False
+            candidate = _AGGREGATES.get(
+                self._filter.aggregate, _AGGREGATES[AGGREGATE_MEAN]
+            )(self._window)
+            self._window.clear()
+
+        threshold = max(
+            self._filter.deadband,
+            self._filter.deadband_relative * abs(self.value),
+        )
+        if abs(candidate - self.value) <= threshold:
+            return False
+        if (
+            self._written_at is not None
+            and now - self._written_at < self._filter.min_interval
+        ):
+            return False
+        return self._write(candidate, now)
+
+    def _write(self, value: float | None, now: float) -> bool:
+        self.value = value
+        self._written_at = now
+        return True
@@ -0,0 +1,96 @@
+"""Short bursts of fast /power (and /status) sampling, outside the coordinator."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any
+
+from .client import VoltieChargerClient, VoltieChargerError
+from .samples import POWER_STAT_FIELDS, STATUS_FIELDS, SampleRing
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HighResSampler:
+    """Polls /power every ``interval`` seconds for ``duration`` seconds.
+
+    Samples go into a ring sized for the whole run; entities are never
+    updated, and the coordinator keeps polling at its normal cadence.
+    Ticks that a slow response overran are skipped rather than bunched up.
+    """
+
+    def __init__(
+        self,
+        client: VoltieChargerClient,
+        interval: float,
+        duration: float,
+        *,
+        include_status: bool = False,
+    ) -> None:
+        self._client = client
+        self.interval = interval
+        self.duration = duration
+        self.include_status = include_status
+        self.samples = SampleRing(math.ceil(duration / interval) + 1)
+        self.requests = 0
+        self.failures = 0
+        self.skipped = 0
+        self.started: float | None = None
+        self.running = False
+
+    async def async_run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.running = True
+        self.started = time.time()
+        start = loop.time()
+        ticks = int(self.duration / self.interval) + 1
+        try:
+            tick = 0
+            while tick < ticks:
+                await self._async_sample()
+                elapsed = loop.time() - start
+                following = min(math.floor(elapsed / self.interval) + 1, ticks)
+                self.skipped += max(0, following - tick - 1)
+                tick = following
+                if tick < ticks:
+                    await asyncio.sleep(tick * self.interval - elapsed)
+        finally:
+            self.running = False
+
+    async def _async_sample(self) -> None:
+        requests = [self._client.async_get_power()]
+        if self.include_status:
+            requests.append(self._client.async_get_status())
+        stamp = time.time()
+        results = await asyncio.gather(*requests, return_exceptions=True)
+        self.requests += len(requests)
+        values: dict[str, Any] = {}
+        for result in results:
+            if isinstance(result, VoltieChargerError):
+                self.failures += 1
+                _LOGGER.debug("High-resolution sample failed: %s", result)
+            elif isinstance(result, BaseException):
+                raise result
+        power, status = (results + [None])[:2]
+        if isinstance(power, dict):
+            stat = power.get("power_stat") or {}
+            values.update((name, stat.get(name)) for name in POWER_STAT_FIELDS)
+        if isinstance(status, dict):
+            values.update((name, status.get(name)) for name in STATUS_FIELDS)
+        if values:
+            self.samples.append(stamp, values)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "started": self.started,
+            "running": self.running,
+            "interval": self.interval,
+            "duration": self.duration,
+            "include_status": self.include_status,
+            "samples": len(self.samples),
+            "requests": self.requests,
+            "failures": self.failures,
+            "skipped_ticks": self.skipped,
+        }
@@ -0,0 +1,86 @@
+"""Cheap per-poll performance records for the diagnostics download."""
+from __future__ import annotations
+
+from collections import Counter, deque
+import time
+from typing import Any
+
+from .const import PERF_HISTORY
+
+
+class PollStats:
+    """The last PERF_HISTORY poll cycles plus running counters.
+
+    A cycle holds per-endpoint latency, retries and payload size, the fields
+    carried forward, and (once listeners have run) the fan-out time and how
+    many state writes it caused. Recording is O(1) and memory is bounded.
+    """
+
+    def __init__(self, size: int = PERF_HISTORY) -> None:
+        self.cycles: deque[dict[str, Any]] = deque(maxlen=size)
+        self.carried_forward: Counter[str] = Counter()
+        self.config_reprobes = 0
+        self.state_writes = 0
+        self._cycle: dict[str, Any] | None = None
+        # Last finished cycle, until its listener fan-out is recorded.
+        self._unfanned: dict[str, Any] | None = None
+        self._started = 0.0
+
+    def begin(self) -> None:
+        self._started = time.perf_counter()
+        self._cycle = {
+            "at": time.time(),
+            "requests": {},
+            "carried_forward": [],
+            "duration_ms": None,
+            "ok": False,
+            "fan_out_ms": None,
+            "state_writes": None,
+        }
+
+    def record_request(
+        self,
+        label: str,
+        latency_ms: float,
+        retries: int,
+        size: int | None,
+        ok: bool,
+    ) -> None:
+        if self._cycle is not None:
+            self._cycle["requests"][label] = {
+                "latency_ms": round(latency_ms, 1),
+                "retries": retries,
+                "bytes": size,
+                "ok": ok,
+            }
+
+    def record_carry_forward(self, fields: list[str]) -> None:
+        self.carried_forward.update(fields)
+        if self._cycle is not None:
+            self._cycle["carried_forward"] = fields
+
+    def end(self, ok: bool) -> None:
+        if (cycle := self._cycle) is None:
+            return
+        cycle["duration_ms"] = round((time.perf_counter() - self._started) * 1000, 1)
+        cycle["ok"] = ok
+        self.cycles.append(cycle)
+        self._cycle = None
+        self._unfanned = cycle if ok else None
+
+    def record_fan_out(self, duration_ms: float, writes: int) -> None:
+        if (cycle := self._unfanned) is not None:
+            cycle["fan_out_ms"] = round(duration_ms, 2)
+            cycle["state_writes"] = writes
+            self._unfanned = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "cycles": [
+                {**cycle, "requests": dict(cycle["requests"])}
+                for cycle in self.cycles
+            ],
+            "carried_forward": dict(self.carried_forward),
+            "config_reprobes": self.config_reprobes,
+            "state_writes": self.state_writes,
+        }
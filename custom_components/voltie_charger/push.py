@@ -0,0 +1,78 @@
+"""Webhook that takes /status- and /power-shaped JSON pushed to Home Assistant."""
+from __future__ import annotations
+
+from functools import partial
+from http import HTTPStatus
+import logging
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+from aiohttp.hdrs import METH_POST
+
+from homeassistant.components import webhook
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .client import VoltieChargerError, decode_payload
+from .const import DATA_POWER, DATA_STATUS, DOMAIN
+
+if TYPE_CHECKING:
+    from . import VoltieChargerCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+type Payload = dict[str, Any] | None
+
+
+def split_payload(body: dict[str, Any]) -> tuple[Payload, Payload]:
+    """The (status, power) parts of a pushed body.
+
+    Accepts {"status": {...}, "power": {...}} with either part optional, a
+    bare /power response (recognised by "power_stat") or a bare /status one.
+    """
+    if isinstance(body.get(DATA_STATUS), dict) or isinstance(
+        body.get(DATA_POWER), dict
+    ):
+        status, power = body.get(DATA_STATUS), body.get(DATA_POWER)
+        if not isinstance(status, dict | None) or not isinstance(power, dict | None):
+            raise ValueError("status and power must be JSON objects")
+        return status, power
+    if "power_stat" in body:
+        return None, body
+    if not body:
+        raise ValueError("empty payload")
+    return body, None
+
+
+@callback
+def async_register_push(
+    hass: HomeAssistant, coordinator: VoltieChargerCoordinator, webhook_id: str
+) -> CALLBACK_TYPE:
+    """Feed payloads posted to the webhook into ``coordinator``."""
+
+    async def _async_handle(
+        hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response:
+        try:
+            body = decode_payload(METH_POST, "webhook", await request.read())
+            status, power = split_payload(body)
+        except (VoltieChargerError, ValueError) as exc:
+            _LOGGER.debug("Rejected push for %s: %s", coordinator.charger_id, exc)
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text=str(exc))
+        charger_id = (status or {}).get("charger_id")
+        if charger_id is not None and charger_id != coordinator.charger_id:
+            return web.Response(
+                status=HTTPStatus.BAD_REQUEST, text="charger_id does not match"
+            )
+        coordinator.async_ingest_push(status, power)
+        return web.Response(status=HTTPStatus.NO_CONTENT)
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        f"Voltie Charger {coordinator.charger_id}",
+        webhook_id,
+        _async_handle,
+        local_only=True,
+        allowed_methods=[METH_POST],
+    )
+    return partial(webhook.async_unregister, hass, webhook_id)
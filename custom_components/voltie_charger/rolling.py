@@ -0,0 +1,75 @@
+"""Incremental rolling-window mean/min/max over polled samples."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+
+class RollingWindow:
+    """Mean, min and max over the last ``duration`` seconds.
+
+    Amortised O(1) per sample: a running sum for the mean and monotonic
+    deques for min and max.
+    """
+
+    def __init__(self, duration: float) -> None:
+        self.duration = duration
+        self._samples: deque[tuple[float, float]] = deque()
+        self._sum = 0.0
+        self._min: deque[tuple[float, float]] = deque()
+        self._max: deque[tuple[float, float]] = deque()
+
+    def add(self, now: float, value: Any) -> None:
+        """Add a sample (None only ages the window) and evict old ones."""
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = float(value)
+            self._samples.append((now, value))
+            self._sum += value
+            while self._min and self._min[-1][1] >= value:
+                self._min.pop()
+            self._min.append((now, value))
+            while self._max and self._max[-1][1] <= value:
+                self._max.pop()
+            self._max.append((now, value))
+
+        cutoff = now - self.duration
+        while self._samples and self._samples[0][0] <= cutoff:
+            self._sum -= self._samples.popleft()[1]
+        while self._min and self._min[0][0] <= cutoff:
+            self._min.popleft()
+        while self._max and self._max[0][0] <= cutoff:
+            self._max.popleft()
+        if not self._samples:
+            # Drop accumulated float error whenever the window empties.
+            self._sum = 0.0
+
+    def snapshot(self) -> dict[str, float | None]:
+        if not self._samples:
+            return {"mean": None, "min": None, "max": None}
+        return {
+            "mean": self._sum / len(self._samples),
+            "min": self._min[0][1],
+            "max": self._max[0][1],
+        }
+
+
+class RollingStats:
+    """RollingWindows for several fields and window lengths."""
+
+    def __init__(self, fields: tuple[str, ...], minutes: tuple[int, ...]) -> None:
+        self._windows = {
+            (field, window): RollingWindow(window * 60)
+            for field in fields
+            for window in minutes
+        }
+
+    def add(self, now: float, values: dict[str, Any]) -> None:
+        for (field, _), window in self._windows.items():
+            window.add(now, values.get(field))
+
+    def snapshot(self) -> dict[str, dict[str, float | None]]:
+        """Stats keyed "<field>_<minutes>m"."""
+        return {
+            f"{field}_{minutes}m": window.snapshot()
+            for (field, minutes), window in self._windows.items()
+        }
@@ -0,0 +1,84 @@
+"""Fixed-size in-memory history of recent power samples."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+import math
+from typing import Any
+
+# power_stat fields kept alongside the /status ones below.
+POWER_STAT_FIELDS = tuple(
+    f"{name}{phase}"
+    for name in ("voltage", "current", "power", "dlm_current", "ipm_current")
+    for phase in (1, 2, 3)
+)
+STATUS_FIELDS = ("charge_power", "current_offered")
+SAMPLE_FIELDS = STATUS_FIELDS + POWER_STAT_FIELDS
+
+
+class SampleRing:
+    """Ring buffer of timestamped samples backed by one float array per field.
+
+    Memory is fixed at construction; missing values are stored as NaN and
+    returned as None.
+    """
+
+    def __init__(
+        self, capacity: int, fields: Iterable[str] = SAMPLE_FIELDS
+    ) -> None:
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self._times = array("d", [math.nan]) * capacity
+        self._columns = {
+            name: array("d", [math.nan]) * capacity for name in self.fields
+        }
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the backing arrays."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self._times, *self._columns.values())
+        )
+
+    def append(self, timestamp: float, values: dict[str, Any]) -> None:
+        index = self._next
+        self._times[index] = timestamp
+        for name, column in self._columns.items():
+            value = values.get(name)
+            column[index] = (
+                float(value)
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+                else math.nan
+            )
+        self._next = (index + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _order(self) -> list[int]:
+        """Physical indices from oldest to newest."""
+        start = (self._next - self._count) % self.capacity
+        return [(start + offset) % self.capacity for offset in range(self._count)]
+
+    def since(
+        self, timestamp: float, fields: Iterable[str] | None = None
+    ) -> dict[str, list[Any]]:
+        """Samples newer than ``timestamp`` as parallel lists, oldest first."""
+        order = self._order()
+        first = bisect_left([self._times[i] for i in order], timestamp)
+        order = order[first:]
+        names = [name for name in (fields or self.fields) if name in self._columns]
+        result: dict[str, list[Any]] = {
+            "timestamps": [self._times[i] for i in order]
+        }
+        for name in names:
+            column = self._columns[name]
+            result[name] = [
+                None if math.isnan(value := column[i]) else value for i in order
+            ]
+        return result
@@ -0,0 +1,76 @@
+"""Subnet sweep for chargers when mDNS discovery isn't available."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import ipaddress
+import logging
+
+import aiohttp
+
+from .client import VoltieChargerAuthError, VoltieChargerClient, VoltieChargerError
+from .const import API_PORT, SCAN_CONCURRENCY, SCAN_CONNECT_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class ScanResult:
+    """Chargers found by charger_id, plus hosts that refused the credentials."""
+
+    chargers: dict[str, str]
+    auth_required: list[str]
+
+
+async def _port_open(host: str, semaphore: asyncio.Semaphore) -> bool:
+    async with semaphore:
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, API_PORT), SCAN_CONNECT_TIMEOUT
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        return True
+
+
+async def async_scan_network(
+    session: aiohttp.ClientSession,
+    network: ipaddress.IPv4Network,
+    username: str | None,
+    password: str | None,
+) -> ScanResult:
+    """Find chargers in ``network``.
+
+    A short TCP connect to API_PORT filters dead hosts first, so only hosts
+    with the port open get the (slower) /status request.
+    """
+    semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+    hosts = [str(address) for address in network.hosts()]
+    open_ports = await asyncio.gather(
+        *(_port_open(host, semaphore) for host in hosts)
+    )
+    candidates = [host for host, is_open in zip(hosts, open_ports) if is_open]
+
+    async def _probe(host: str) -> tuple[str, str | None, bool]:
+        client = VoltieChargerClient(session, host, username, password)
+        try:
+            status = await client.async_get_status()
+        except VoltieChargerAuthError:
+            return host, None, True
+        except VoltieChargerError as exc:
+            _LOGGER.debug("Scan: /status failed on %s: %s", host, exc)
+            return host, None, False
+        return host, status.get("charger_id"), False
+
+    chargers: dict[str, str] = {}
+    auth_required: list[str] = []
+    for host, charger_id, needs_auth in await asyncio.gather(
+        *(_probe(host) for host in candidates)
+    ):
+        if needs_auth:
+            auth_required.append(host)
+        elif charger_id:
+            # A charger with two addresses in range is only offered once.
+            chargers.setdefault(charger_id, host)
+    return ScanResult(chargers=chargers, auth_required=auth_required)
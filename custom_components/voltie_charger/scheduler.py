@@ -0,0 +1,284 @@
+"""Price-aware charging scheduler driven by exact start/stop timers."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .client import VoltieChargerError
+from .const import (
+    CONF_DEPARTURE,
+    CONF_ENERGY_TARGET,
+    CURRENT_LIMIT_MIN,
+    DATA_CONFIG,
+    DATA_STATUS,
+    NOMINAL_VOLTAGE,
+    SCHEDULER_REPLAN_KWH,
+)
+from .tariff import PriceSlot, Tariff
+
+if TYPE_CHECKING:
+    from . import VoltieChargerCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+type Window = tuple[datetime, datetime]
+
+
+def cheapest_windows(
+    slots: list[PriceSlot],
+    now: datetime,
+    departure: datetime,
+    energy_kwh: float,
+    rate_kw: float,
+) -> list[Window]:
+    """Cheapest merged windows between now and departure that fit ``energy_kwh``.
+
+    The last slot used is trimmed to what is still needed. If the prices
+    don't cover enough time, every known slot before departure is used.
+    """
+    remaining = timedelta(hours=energy_kwh / rate_kw)
+    chosen: list[Window] = []
+    for slot in sorted(slots, key=lambda s: (s.price, s.start)):
+        if remaining <= timedelta(0):
+            break
+        start, end = max(slot.start, now), min(slot.end, departure)
+        if end <= start:
+            continue
+        end = min(end, start + remaining)
+        remaining -= end - start
+        chosen.append((start, end))
+
+    merged: list[Window] = []
+    for start, end in sorted(chosen):
+        if merged and merged[-1][1] >= start:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _overlap(windows: list[Window], start: datetime, end: datetime) -> timedelta:
+    return sum(
+        (
+            min(w_end, end) - max(w_start, start)
+            for w_start, w_end in windows
+            if w_end > start and w_start < end
+        ),
+        timedelta(0),
+    )
+
+
+class ChargeScheduler:
+    """Starts and stops charging in the cheapest windows before departure.
+
+    The plan is computed once and turned into point-in-time timers. It is
+    only recomputed when the price series changes, the car is plugged in or
+    out, the departure passes, or delivered energy drifts from the plan by
+    more than SCHEDULER_REPLAN_KWH.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: VoltieChargerCoordinator,
+        tariff: Tariff,
+        options: dict[str, Any],
+    ) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self.tariff = tariff
+        departure = dt_util.parse_time(options[CONF_DEPARTURE])
+        assert departure is not None
+        self._departure = departure
+        self._target_kwh = float(options[CONF_ENERGY_TARGET])
+        self._timers: dict[tuple[datetime, bool], CALLBACK_TYPE] = {}
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._connected = False
+        self.windows: list[Window] = []
+        # What the current plan assumed, for drift detection.
+        self._planned_at: datetime | None = None
+        self._planned_until: datetime | None = None
+        self._planned_energy = 0.0
+        self._planned_rate = 0.0
+        self.plans = 0
+        self.last_plan_ms: float | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        unsubs = [
+            self.coordinator.async_add_listener(self._async_coordinator_updated),
+            self.tariff.async_add_listener(self._async_replan),
+        ]
+        self._connected = bool(self._status().get("is_car_connected"))
+        self._async_replan()
+
+        @callback
+        def _stop() -> None:
+            for unsub in unsubs:
+                unsub()
+            self._async_arm([])
+
+        return _stop
+
+    @callback
+    def async_add_listener(self, update: CALLBACK_TYPE) -> Callable[[], None]:
+        """Notify ``update`` after every plan."""
+        self._listeners.append(update)
+        return lambda: self._listeners.remove(update)
+
+    def _status(self) -> dict[str, Any]:
+        return (self.coordinator.data or {}).get(DATA_STATUS) or {}
+
+    def _session_energy(self) -> float:
+        cdr = self._status().get("cdr")
+        energy = cdr.get("chg_energy") if isinstance(cdr, dict) else None
+        return float(energy) if isinstance(energy, (int, float)) else 0.0
+
+    def _next_departure(self, now: datetime) -> datetime:
+        local = dt_util.as_local(now)
+        departure = local.replace(
+            hour=self._departure.hour,
+            minute=self._departure.minute,
+            second=self._departure.second,
+            microsecond=0,
+        )
+        if departure <= local:
+            departure += timedelta(days=1)
+        return dt_util.as_utc(departure)
+
+    def _rate_kw(self) -> float:
+        """Charging power the current limit allows, in kW."""
+        data = self.coordinator.data or {}
+        status = data.get(DATA_STATUS) or {}
+        limit = (
+            (data.get(DATA_CONFIG) or {}).get("conf_current_limit")
+            or CURRENT_LIMIT_MIN
+        )
+        phases = 3 if status.get("phases") == 3 else 1
+        voltage = status.get("mains_voltage") or NOMINAL_VOLTAGE
+        return limit * voltage * phases / 1000
+
+    @callback
+    def _async_coordinator_updated(self) -> None:
+        connected = bool(self._status().get("is_car_connected"))
+        if connected != self._connected:
+            self._connected = connected
+            self._async_replan()
+            return
+        if not connected or self._planned_at is None:
+            return
+        now = dt_util.utcnow()
+        assert self._planned_until is not None
+        if now >= self._planned_until:
+            self._async_replan()
+            return
+        expected = (
+            _overlap(self.windows, self._planned_at, now).total_seconds()
+            / 3600
+            * self._planned_rate
+        )
+        delivered = self._session_energy() - self._planned_energy
+        if abs(delivered - expected) > SCHEDULER_REPLAN_KWH:
+            self._async_replan()
+
+    @callback
+    def _async_replan(self) -> None:
+        started = time.perf_counter()
+        now = dt_util.utcnow()
+        departure = self._next_departure(now)
+        energy = self._session_energy()
+        needed = self._target_kwh - energy
+        rate = self._rate_kw()
+        slots = self.tariff.slots(now, departure) if self._connected else []
+
+        windows = (
+            cheapest_windows(slots, now, departure, needed, rate)
+            if slots and needed > 0
+            else []
+        )
+        self._planned_at = now
+        self._planned_until = departure
+        self._planned_energy = energy
+        self._planned_rate = rate
+        self.windows = windows
+        self._async_arm(windows)
+        self.plans += 1
+        self.last_plan_ms = (time.perf_counter() - started) * 1000
+
+        # Bring the charger in line with the plan right away; without price
+        # data there is no plan to enforce.
+        if self._connected and (slots or needed <= 0):
+            charging = any(start <= now < end for start, end in windows)
+            if charging != bool(self._status().get("charge_enabled")):
+                self._async_switch(charging)
+        for update in list(self._listeners):
+            update()
+
+    @callback
+    def _async_arm(self, windows: list[Window]) -> None:
+        """Keep timers for unchanged boundaries; cancel and add the rest."""
+        now = dt_util.utcnow()
+        wanted = {
+            (point, start)
+            for window in windows
+            for point, start in zip(window, (True, False))
+            if point > now
+        }
+        for key in set(self._timers) - wanted:
+            self._timers.pop(key)()
+        for point, start in wanted - set(self._timers):
+            self._timers[(point, start)] = async_track_point_in_time(
+                self.hass, self._async_timer(point, start), point
+            )
+
+    def _async_timer(
+        self, point: datetime, start: bool
+    ) -> Callable[[datetime], None]:
+        @callback
+        def _fire(_now: datetime) -> None:
+            self._timers.pop((point, start), None)
+            if self._connected:
+                self._async_switch(start)
+
+        return _fire
+
+    @callback
+    def _async_switch(self, start: bool) -> None:
+        self.coordinator.entry.async_create_background_task(
+            self.hass,
+            self._async_send(start),
+            f"voltie_charger scheduled {'start' if start else 'stop'}",
+        )
+
+    async def _async_send(self, start: bool) -> None:
+        client = self.coordinator.client
+        try:
+            await (client.async_start() if start else client.async_stop())
+        except (VoltieChargerError, HomeAssistantError) as exc:
+            _LOGGER.warning("Scheduled %s failed: %s", "start" if start else "stop", exc)
+            return
+        await self.coordinator.async_request_refresh()
+
+    @property
+    def next_start(self) -> datetime | None:
+        now = dt_util.utcnow()
+        return next((start for start, end in self.windows if end > now), None)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "departure": self._planned_until,
+            "energy_target_kwh": self._target_kwh,
+            "windows": [(start, end) for start, end in self.windows],
+            "next_start": self.next_start,
+            "timers": len(self._timers),
+            "plans": self.plans,
+            "last_plan_ms": self.last_plan_ms,
+        }
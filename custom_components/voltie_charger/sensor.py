@@ -3,9 +3,12 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from decimal import Decimal
+import time
 from typing import Any
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
@@ -13,18 +16,42 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.const import (
     EntityCategory,
+    Platform,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfPower,
     UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import VoltieChargerConfigEntry
-from .const import DATA_POWER, DATA_STATUS, EVSE_STATE_ERROR, EVSE_STATES
-from .entity import VoltieChargerEntity
+from .const import (
+    CAP_DLM,
+    CAP_IPM,
+    CAP_PHASE_2,
+    CAP_PHASE_3,
+    CONF_COMPACT_ENTITIES,
+    DATA_COST,
+    DATA_ENERGY,
+    DATA_POWER,
+    DATA_ROLLING,
+    DATA_STATUS,
+    ENERGY_KEY_CHARGE,
+    ENERGY_KEY_PHASE,
+    EVSE_STATE_ERROR,
+    EVSE_STATES,
+    ROLLING_WINDOWS_MIN,
+)
+from .controller import CurrentLimitController
+from .entity import (
+    VoltieChargerEntity,
+    async_add_capability_entities,
+    async_remove_entities,
+)
+from .filters import SampleFilter, WriteFilter
+from .scheduler import ChargeScheduler
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -33,6 +60,14 @@ class VoltieSensorDescription(SensorEntityDescription):
 
     value_fn: Callable[[dict[str, Any]], Any]
     attributes_fn: Callable[[dict[str, Any]], dict[str, Any] | None] | None = None
+    # Only created once the charger reports all of these (see const CAP_*).
+    required_capabilities: frozenset[str] = frozenset()
+    # Default write filter; the options flow can override it per sensor class.
+    write_filter: WriteFilter | None = None
+    # Coordinator energy total this sensor persists across restarts.
+    energy_key: str | None = None
+    # Lifetime cost total this sensor persists across restarts.
+    restores_cost: bool = False
 
 
 def _status(data: dict[str, Any]) -> dict[str, Any]:
@@ -48,6 +83,14 @@ def _power_stat(data: dict[str, Any]) -> dict[str, Any]:
     return (data.get(DATA_POWER, {}) or {}).get("power_stat", {}) or {}
 
 
+def _energy(data: dict[str, Any]) -> dict[str, float]:
+    return data.get(DATA_ENERGY, {}) or {}
+
+
+def _rolling(data: dict[str, Any], key: str, statistic: str) -> float | None:
+    return ((data.get(DATA_ROLLING) or {}).get(key) or {}).get(statistic)
+
+
 def _phases_value(data: dict[str, Any]) -> str | None:
     value = _status(data).get("phases")
     return str(value) if value in (1, 3) else None
@@ -156,9 +199,17 @@ SENSORS: tuple[VoltieSensorDescription, ...] = (
 )
 
 
+_PHASE_CAPABILITIES: dict[int, frozenset[str]] = {
+    1: frozenset(),
+    2: frozenset({CAP_PHASE_2}),
+    3: frozenset({CAP_PHASE_3}),
+}
+
+
 def _per_phase_sensors() -> tuple[VoltieSensorDescription, ...]:
     descriptions: list[VoltieSensorDescription] = []
     for phase in (1, 2, 3):
+        phase_caps = _PHASE_CAPABILITIES[phase]
         descriptions.extend(
             (
                 VoltieSensorDescription(
@@ -170,6 +221,7 @@ def _per_phase_sensors() -> tuple[VoltieSensorDescription, ...]:
                     state_class=SensorStateClass.MEASUREMENT,
                     suggested_display_precision=1,
                     value_fn=lambda d, p=phase: _power_stat(d).get(f"voltage{p}"),
+                    required_capabilities=phase_caps,
                 ),
                 VoltieSensorDescription(
                     key=f"current_l{phase}",
@@ -180,6 +232,7 @@ def _per_phase_sensors() -> tuple[VoltieSensorDescription, ...]:
                     state_class=SensorStateClass.MEASUREMENT,
                     suggested_display_precision=2,
                     value_fn=lambda d, p=phase: _power_stat(d).get(f"current{p}"),
+                    required_capabilities=phase_caps,
                 ),
                 VoltieSensorDescription(
                     key=f"power_l{phase}",
@@ -190,6 +243,7 @@ def _per_phase_sensors() -> tuple[VoltieSensorDescription, ...]:
                     state_class=SensorStateClass.MEASUREMENT,
                     suggested_display_precision=2,
                     value_fn=lambda d, p=phase: _power_stat(d).get(f"power{p}"),
+                    required_capabilities=phase_caps,
                 ),
                 VoltieSensorDescription(
                     key=f"dlm_current_l{phase}",
@@ -202,6 +256,7 @@ def _per_phase_sensors() -> tuple[VoltieSensorDescription, ...]:
                     entity_registry_enabled_default=False,
                     suggested_display_precision=2,
                     value_fn=lambda d, p=phase: _power_stat(d).get(f"dlm_current{p}"),
+                    required_capabilities=frozenset({CAP_DLM}),
                 ),
                 VoltieSensorDescription(
                     key=f"ipm_current_l{phase}",
@@ -214,6 +269,7 @@ def _per_phase_sensors() -> tuple[VoltieSensorDescription, ...]:
                     entity_registry_enabled_default=False,
                     suggested_display_precision=2,
                     value_fn=lambda d, p=phase: _power_stat(d).get(f"ipm_current{p}"),
+                    required_capabilities=frozenset({CAP_IPM}),
                 ),
             )
         )
@@ -222,6 +278,214 @@ def _per_phase_sensors() -> tuple[VoltieSensorDescription, ...]:
 
 PER_PHASE_SENSORS = _per_phase_sensors()
 
+ATTR_PER_PHASE = "per_phase"
+
+
+def _phase_values(data: dict[str, Any], name: str) -> list[Any]:
+    stat = _power_stat(data)
+    return [stat.get(f"{name}{phase}") for phase in (1, 2, 3)]
+
+
+def _reduce(
+    values: list[Any], reducer: Callable[[list[float]], float]
+) -> float | None:
+    numbers = [v for v in values if isinstance(v, (int, float))]
+    return reducer(numbers) if numbers else None
+
+
+def _mean_live(values: list[float]) -> float | None:
+    # Unused phases read 0 V on single-phase installs; leave them out.
+    live = [value for value in values if value]
+    return sum(live) / len(live) if live else None
+
+
+def _compact_phase_sensors() -> tuple[VoltieSensorDescription, ...]:
+    """One sensor per quantity with L1..L3 in a ``per_phase`` attribute."""
+    descriptions: list[VoltieSensorDescription] = []
+    for key, name, reducer, base in (
+        ("phase_voltage", "voltage", _mean_live, PER_PHASE_SENSORS[0]),
+        ("phase_current", "current", max, PER_PHASE_SENSORS[1]),
+        ("phase_power", "power", sum, PER_PHASE_SENSORS[2]),
+        ("dlm_phase_current", "dlm_current", max, PER_PHASE_SENSORS[3]),
+        ("ipm_phase_current", "ipm_current", max, PER_PHASE_SENSORS[4]),
+    ):
+        descriptions.append(
+            VoltieSensorDescription(
+                key=key,
+                translation_key=key,
+                device_class=base.device_class,
+                native_unit_of_measurement=base.native_unit_of_measurement,
+                state_class=base.state_class,
+                entity_category=base.entity_category,
+                entity_registry_enabled_default=base.entity_registry_enabled_default,
+                suggested_display_precision=base.suggested_display_precision,
+                value_fn=lambda d, n=name, r=reducer: _reduce(_phase_values(d, n), r),
+                attributes_fn=lambda d, n=name: {ATTR_PER_PHASE: _phase_values(d, n)},
+                required_capabilities=base.required_capabilities,
+            )
+        )
+    return tuple(descriptions)
+
+
+# Compact entity mode: replaces PER_PHASE_SENSORS (15 entities) with five.
+COMPACT_PHASE_SENSORS = _compact_phase_sensors()
+
+
+def _energy_sensors() -> tuple[VoltieSensorDescription, ...]:
+    descriptions = [
+        VoltieSensorDescription(
+            key="charge_energy",
+            translation_key="charge_energy",
+            device_class=SensorDeviceClass.ENERGY,
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            suggested_display_precision=3,
+            energy_key=ENERGY_KEY_CHARGE,
+            value_fn=lambda d: _energy(d).get(ENERGY_KEY_CHARGE),
+        )
+    ]
+    for phase in (1, 2, 3):
+        energy_key = ENERGY_KEY_PHASE.format(phase=phase)
+        descriptions.append(
+            VoltieSensorDescription(
+                key=f"energy_l{phase}",
+                translation_key="energy_phase",
+                translation_placeholders={"phase": str(phase)},
+                device_class=SensorDeviceClass.ENERGY,
+                native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+                state_class=SensorStateClass.TOTAL_INCREASING,
+                suggested_display_precision=3,
+                energy_key=energy_key,
+                value_fn=lambda d, k=energy_key: _energy(d).get(k),
+                required_capabilities=_PHASE_CAPABILITIES[phase],
+            )
+        )
+    return tuple(descriptions)
+
+
+# Lifetime kWh integrated by the coordinator from charge_power and power1..3.
+ENERGY_SENSORS = _energy_sensors()
+
+
+_FILTER_CLASS_BY_DEVICE_CLASS: dict[SensorDeviceClass | None, str] = {
+    SensorDeviceClass.VOLTAGE: "voltage",
+    SensorDeviceClass.CURRENT: "current",
+    SensorDeviceClass.POWER: "power",
+}
+
+
+def _write_filter_for(
+    description: VoltieSensorDescription, options: dict[str, Any]
+) -> WriteFilter | None:
+    """Options-flow filter for the sensor's class, else the description's."""
+    if description.state_class is not SensorStateClass.MEASUREMENT:
+        return description.write_filter
+    filter_class = _FILTER_CLASS_BY_DEVICE_CLASS.get(description.device_class)
+    if filter_class and (section := options.get(filter_class)):
+        return WriteFilter.from_options(section)
+    return description.write_filter
+
+
+_ROLLING_STATISTICS = ("mean", "min", "max")
+
+
+def _rolling_sensors() -> tuple[VoltieSensorDescription, ...]:
+    descriptions: list[VoltieSensorDescription] = []
+    for minutes in ROLLING_WINDOWS_MIN:
+        for statistic in _ROLLING_STATISTICS:
+            key = f"charge_power_{minutes}m"
+            descriptions.append(
+                VoltieSensorDescription(
+                    key=f"charge_power_{statistic}_{minutes}m",
+                    translation_key=f"charge_power_{statistic}",
+                    translation_placeholders={"window": str(minutes)},
+                    device_class=SensorDeviceClass.POWER,
+                    native_unit_of_measurement=UnitOfPower.KILO_WATT,
+                    state_class=SensorStateClass.MEASUREMENT,
+                    entity_registry_enabled_default=False,
+                    suggested_display_precision=2,
+                    value_fn=lambda d, k=key, s=statistic: _rolling(d, k, s),
+                )
+            )
+            for phase in (1, 2, 3):
+                key = f"current{phase}_{minutes}m"
+                descriptions.append(
+                    VoltieSensorDescription(
+                        key=f"current_l{phase}_{statistic}_{minutes}m",
+                        translation_key=f"current_phase_{statistic}",
+                        translation_placeholders={
+                            "phase": str(phase),
+                            "window": str(minutes),
+                        },
+                        device_class=SensorDeviceClass.CURRENT,
+                        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+                        state_class=SensorStateClass.MEASUREMENT,
+                        entity_registry_enabled_default=False,
+                        suggested_display_precision=2,
+                        value_fn=lambda d, k=key, s=statistic: _rolling(d, k, s),
+                        required_capabilities=_PHASE_CAPABILITIES[phase],
+                    )
+                )
+    return tuple(descriptions)
+
+
+# Optional 1/5/15-minute mean/min/max, computed incrementally by the coordinator.
+ROLLING_SENSORS = _rolling_sensors()
+
+
+# Metrics of the grid-power controller; value_fn gets controller.as_dict().
+CONTROLLER_SENSORS: tuple[VoltieSensorDescription, ...] = (
+    VoltieSensorDescription(
+        key="controller_writes",
+        translation_key="controller_writes",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda m: m.get("writes"),
+    ),
+    VoltieSensorDescription(
+        key="controller_latency",
+        translation_key="controller_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda m: m.get("last_latency_ms"),
+    ),
+)
+
+
+# Priced from the configured tariff; unit is the HA currency.
+COST_SENSORS: tuple[VoltieSensorDescription, ...] = (
+    VoltieSensorDescription(
+        key="session_cost",
+        translation_key="session_cost",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=2,
+        value_fn=lambda d: (d.get(DATA_COST) or {}).get("session"),
+    ),
+    VoltieSensorDescription(
+        key="total_cost",
+        translation_key="total_cost",
+        device_class=SensorDeviceClass.MONETARY,
+        state_class=SensorStateClass.TOTAL,
+        suggested_display_precision=2,
+        value_fn=lambda d: (d.get(DATA_COST) or {}).get("total"),
+        restores_cost=True,
+    ),
+)
+
+
+# Scheduler plan; value_fn gets scheduler.as_dict().
+SCHEDULER_SENSORS: tuple[VoltieSensorDescription, ...] = (
+    VoltieSensorDescription(
+        key="next_charge_start",
+        translation_key="next_charge_start",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda m: m.get("next_start"),
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -230,10 +494,46 @@ async def async_setup_entry(
 ) -> None:
     """Set up Voltie Charger sensors."""
     coordinator = entry.runtime_data
-    async_add_entities(
-        VoltieChargerSensor(coordinator, description)
-        for description in (*SENSORS, *PER_PHASE_SENSORS)
+    if entry.options.get(CONF_COMPACT_ENTITIES):
+        phase_sensors, replaced = COMPACT_PHASE_SENSORS, PER_PHASE_SENSORS
+    else:
+        phase_sensors, replaced = PER_PHASE_SENSORS, COMPACT_PHASE_SENSORS
+    async_remove_entities(
+        hass, entry, Platform.SENSOR, (d.key for d in replaced)
+    )
+    async_add_capability_entities(
+        entry,
+        coordinator,
+        Platform.SENSOR,
+        (*SENSORS, *phase_sensors, *ENERGY_SENSORS, *ROLLING_SENSORS),
+        lambda description: (
+            VoltieChargerEnergySensor(coordinator, description)
+            if description.energy_key
+            else VoltieChargerPhaseSensor(coordinator, description)
+            if description in COMPACT_PHASE_SENSORS
+            else VoltieChargerSensor(coordinator, description)
+        ),
+        async_add_entities,
     )
+    if coordinator.tariff is not None:
+        async_add_entities(
+            VoltieChargerCostSensor(coordinator, description)
+            for description in COST_SENSORS
+        )
+    if coordinator.controller is not None:
+        async_add_entities(
+            VoltieChargerMetricsSensor(
+                coordinator, description, coordinator.controller
+            )
+            for description in CONTROLLER_SENSORS
+        )
+    if coordinator.scheduler is not None:
+        async_add_entities(
+            VoltieChargerMetricsSensor(
+                coordinator, description, coordinator.scheduler
+            )
+            for description in SCHEDULER_SENSORS
+        )
 
 
 class VoltieChargerSensor(VoltieChargerEntity, SensorEntity):
@@ -248,9 +548,34 @@ class VoltieChargerSensor(VoltieChargerEntity, SensorEntity):
     ) -> None:
         super().__init__(coordinator, description.key)
         self.entity_description = description
+        write_filter = _write_filter_for(description, coordinator.entry.options)
+        self._sample_filter: SampleFilter | None = None
+        self._written_available: bool | None = None
+        if write_filter is not None:
+            self._sample_filter = SampleFilter(write_filter)
+            # Prime with the current data so the entity isn't unknown on add.
+            self._sample_filter.update(
+                description.value_fn(coordinator.data or {}), time.monotonic()
+            )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._sample_filter is None:
+            super()._handle_coordinator_update()
+            return
+        available = self.available
+        changed = self._sample_filter.update(
+            self.entity_description.value_fn(self.coordinator.data or {}),
+            time.monotonic(),
+        )
+        if changed or available != self._written_available:
+            self._written_available = available
+            self.async_write_ha_state()
 
     @property
     def native_value(self) -> Any:
+        if self._sample_filter is not None:
+            return self._sample_filter.value
         return self.entity_description.value_fn(self.coordinator.data or {})
 
     @property
@@ -259,3 +584,69 @@ class VoltieChargerSensor(VoltieChargerEntity, SensorEntity):
         if fn is None:
             return None
         return fn(self.coordinator.data or {})
+
+
+class VoltieChargerPhaseSensor(VoltieChargerSensor):
+    """Compact-mode sensor; per-phase values are kept out of the recorder."""
+
+    _unrecorded_attributes = frozenset({ATTR_PER_PHASE})
+
+
+class VoltieChargerEnergySensor(VoltieChargerSensor, RestoreSensor):
+    """Integrated energy total that survives restarts."""
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        energy_key = self.entity_description.energy_key
+        assert energy_key is not None
+        last = await self.async_get_last_sensor_data()
+        if last is None or not isinstance(last.native_value, (int, float)):
+            return
+        self.coordinator.energy.restore(energy_key, float(last.native_value))
+        if self.coordinator.data is not None:
+            self.coordinator.data[DATA_ENERGY] = self.coordinator.energy.snapshot()
+        self.async_write_ha_state()
+
+
+class VoltieChargerCostSensor(VoltieChargerSensor, RestoreSensor):
+    """Charging cost in the Home Assistant currency."""
+
+    def __init__(self, coordinator, description: VoltieSensorDescription) -> None:
+        super().__init__(coordinator, description)
+        self._attr_native_unit_of_measurement = coordinator.hass.config.currency
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if not self.entity_description.restores_cost:
+            return
+        last = await self.async_get_last_sensor_data()
+        if last is None or not isinstance(last.native_value, (int, float, Decimal)):
+            return
+        if self.coordinator.cost_restored is None:
+            self.coordinator.cost_restored = float(last.native_value)
+        if self.coordinator.data is not None:
+            self.coordinator.data[DATA_COST] = self.coordinator.cost_snapshot()
+        self.async_write_ha_state()
+
+
+class VoltieChargerMetricsSensor(VoltieChargerSensor):
+    """Value from a controller or scheduler, updated when that reports a change."""
+
+    def __init__(
+        self,
+        coordinator,
+        description: VoltieSensorDescription,
+        source: CurrentLimitController | ChargeScheduler,
+    ) -> None:
+        super().__init__(coordinator, description)
+        self._source = source
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._source.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> Any:
+        return self.entity_description.value_fn(self._source.as_dict())
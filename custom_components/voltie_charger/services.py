@@ -0,0 +1,486 @@
+"""Domain services for the Voltie Charger integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import partial
+import time
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .capture import async_replay_capture, capture_path, load_capture
+from .client import VoltieChargerError, VoltieChargerRejectedError
+from .const import (
+    CURRENT_LIMIT_MAX,
+    CURRENT_LIMIT_MIN,
+    DOMAIN,
+    FAN_OUT_CONCURRENCY,
+    HIGH_RES_MAX_DURATION,
+    HIGH_RES_MIN_INTERVAL,
+)
+from .highres import HighResSampler
+from .samples import SAMPLE_FIELDS
+from .sessions import async_get_session_store
+
+if TYPE_CHECKING:
+    from . import VoltieChargerCoordinator
+
+ATTR_CONFIG = "config"
+ATTR_CURRENT_LIMIT = "current_limit"
+ATTR_DEVICE_ID = "device_id"
+ATTR_DURATION = "duration"
+ATTR_END = "end"
+ATTR_FIELDS = "fields"
+ATTR_HIGH_RES = "high_res"
+ATTR_IDTAG = "idtag"
+ATTR_INCLUDE_STATUS = "include_status"
+ATTR_INTERVAL = "interval"
+ATTR_PATH = "path"
+ATTR_SECONDS = "seconds"
+ATTR_SPEED = "speed"
+ATTR_START = "start"
+
+SERVICE_GET_FAULT_JOURNAL = "get_fault_journal"
+SERVICE_GET_RECENT_SAMPLES = "get_recent_samples"
+SERVICE_GET_SESSION_SUMMARY = "get_session_summary"
+SERVICE_REPLAY_CAPTURE = "replay_capture"
+SERVICE_SAMPLE_HIGH_RES = "sample_high_res"
+SERVICE_SET_CONFIG = "set_config"
+SERVICE_SET_CURRENT_LIMIT = "set_current_limit"
+SERVICE_START = "start"
+SERVICE_STOP = "stop"
+
+# device_id value that targets every loaded charger in the fleet services.
+ALL_DEVICES = "all"
+
+_FAN_OUT_SEMAPHORE: HassKey[asyncio.Semaphore] = HassKey(f"{DOMAIN}_fan_out")
+
+SESSION_SUMMARY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_IDTAG): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+    }
+)
+
+
+RECENT_SAMPLES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_SECONDS, default=300): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=86400)
+        ),
+        vol.Optional(ATTR_FIELDS): vol.All(cv.ensure_list, [vol.In(SAMPLE_FIELDS)]),
+        vol.Optional(ATTR_HIGH_RES, default=False): cv.boolean,
+    }
+)
+
+FAULT_JOURNAL_SCHEMA = vol.Schema(
+    {vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string])}
+)
+
+# Fleet services must name their targets; "all" has to be asked for.
+FLEET_TARGETS = vol.Any(ALL_DEVICES, vol.All(cv.ensure_list, [cv.string]))
+CURRENT_LIMIT = vol.All(
+    vol.Coerce(int), vol.Range(min=CURRENT_LIMIT_MIN, max=CURRENT_LIMIT_MAX)
+)
+
+FLEET_SCHEMA = vol.Schema({vol.Required(ATTR_DEVICE_ID): FLEET_TARGETS})
+
+SET_CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): FLEET_TARGETS,
+        vol.Required(ATTR_CONFIG): vol.All(
+            {
+                vol.Optional("conf_autostart_enabled"): cv.boolean,
+                vol.Optional("conf_disp_enabled"): cv.boolean,
+                vol.Optional("conf_front_led_enabled"): cv.boolean,
+                vol.Optional("conf_rear_led_enabled"): cv.boolean,
+                vol.Optional("conf_buzzer_enabled"): cv.boolean,
+                vol.Optional("conf_current_limit"): CURRENT_LIMIT,
+            },
+            vol.Length(min=1),
+        ),
+    }
+)
+
+SAMPLE_HIGH_RES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): FLEET_TARGETS,
+        vol.Optional(ATTR_INTERVAL, default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=HIGH_RES_MIN_INTERVAL, max=60)
+        ),
+        vol.Optional(ATTR_DURATION, default=120): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=HIGH_RES_MAX_DURATION)
+        ),
+        vol.Optional(ATTR_INCLUDE_STATUS, default=False): cv.boolean,
+    }
+)
+
+REPLAY_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_PATH): cv.string,
+        vol.Optional(ATTR_SPEED, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1000)
+        ),
+    }
+)
+
+SET_CURRENT_LIMIT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): FLEET_TARGETS,
+        vol.Required(ATTR_CURRENT_LIMIT): CURRENT_LIMIT,
+    }
+)
+
+
+@callback
+def async_get_coordinators(
+    hass: HomeAssistant, device_ids: list[str] | None = None
+) -> dict[str, VoltieChargerCoordinator]:
+    """Loaded coordinators by device id; all of them when device_ids is None."""
+    dev_reg = dr.async_get(hass)
+    coordinators: dict[str, VoltieChargerCoordinator] = {}
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.state is not ConfigEntryState.LOADED:
+            continue
+        coordinator: VoltieChargerCoordinator = entry.runtime_data
+        device = dev_reg.async_get_device(
+            identifiers={(DOMAIN, coordinator.charger_id)}
+        )
+        if device is not None:
+            coordinators[device.id] = coordinator
+    if device_ids is None:
+        return coordinators
+    if missing := [d for d in device_ids if d not in coordinators]:
+        raise ServiceValidationError(
+            f"Not a loaded Voltie charger: {', '.join(missing)}"
+        )
+    return {device_id: coordinators[device_id] for device_id in device_ids}
+
+
+def recent_samples(
+    coordinator: VoltieChargerCoordinator,
+    seconds: int,
+    fields: list[str] | None = None,
+    *,
+    high_res: bool = False,
+) -> dict[str, list[Any]]:
+    """Polled samples, or those of the latest high-resolution run."""
+    if not high_res:
+        ring = coordinator.samples
+    elif coordinator.high_res is not None:
+        ring = coordinator.high_res.samples
+    else:
+        return {"timestamps": []}
+    return ring.since(time.time() - seconds, fields)
+
+
+def _charger_ids(hass: HomeAssistant, device_ids: list[str]) -> list[str]:
+    """Map device registry ids to charger_ids, rejecting foreign devices."""
+    dev_reg = dr.async_get(hass)
+    charger_ids: list[str] = []
+    for device_id in device_ids:
+        device = dev_reg.async_get(device_id)
+        ids = [
+            identifier
+            for domain, identifier in (device.identifiers if device else ())
+            if domain == DOMAIN
+        ]
+        if not ids:
+            raise ServiceValidationError(
+                f"Device {device_id} is not a Voltie charger"
+            )
+        charger_ids.extend(ids)
+    return charger_ids
+
+
+def _timestamp(call: ServiceCall, key: str, default: float) -> float:
+    if (value := call.data.get(key)) is None:
+        return default
+    return dt_util.as_utc(value).timestamp()
+
+
+async def _async_get_session_summary(call: ServiceCall) -> ServiceResponse:
+    hass = call.hass
+    charger_ids = _charger_ids(hass, call.data.get(ATTR_DEVICE_ID, []))
+    start = _timestamp(call, ATTR_START, 0.0)
+    end = _timestamp(call, ATTR_END, dt_util.utcnow().timestamp())
+    offset = dt_util.now().utcoffset()
+    store = await async_get_session_store(hass)
+    summary: list[dict[str, Any]] = await hass.async_add_executor_job(
+        partial(
+            store.monthly_summary,
+            start,
+            end,
+            charger_ids=charger_ids,
+            idtag=call.data.get(ATTR_IDTAG),
+            utc_offset=offset.total_seconds() if offset else 0.0,
+        )
+    )
+    return {"summary": summary}
+
+
+async def _async_get_recent_samples(call: ServiceCall) -> ServiceResponse:
+    coordinators = async_get_coordinators(call.hass, call.data.get(ATTR_DEVICE_ID))
+    return {
+        device_id: recent_samples(
+            coordinator,
+            call.data[ATTR_SECONDS],
+            call.data.get(ATTR_FIELDS),
+            high_res=call.data[ATTR_HIGH_RES],
+        )
+        for device_id, coordinator in coordinators.items()
+    }
+
+
+async def _async_sample_high_res(call: ServiceCall) -> ServiceResponse:
+    """Start a high-resolution run per charger; wait for it if asked to."""
+    hass = call.hass
+    targets = call.data[ATTR_DEVICE_ID]
+    coordinators = async_get_coordinators(
+        hass, None if targets == ALL_DEVICES else targets
+    )
+    if busy := [
+        device_id
+        for device_id, coordinator in coordinators.items()
+        if coordinator.high_res is not None and coordinator.high_res.running
+    ]:
+        raise ServiceValidationError(
+            f"High-resolution sampling already running on: {', '.join(busy)}"
+        )
+    tasks: list[asyncio.Task[None]] = []
+    for coordinator in coordinators.values():
+        sampler = coordinator.high_res = HighResSampler(
+            coordinator.client,
+            call.data[ATTR_INTERVAL],
+            call.data[ATTR_DURATION],
+            include_status=call.data[ATTR_INCLUDE_STATUS],
+        )
+        tasks.append(
+            coordinator.entry.async_create_background_task(
+                hass,
+                sampler.async_run(),
+                f"{DOMAIN} high-resolution sampling {coordinator.charger_id}",
+            )
+        )
+    if not call.return_response:
+        return None
+    if not tasks:
+        # asyncio.wait() rejects an empty set (no chargers loaded).
+        return {}
+    # Unloading an entry cancels its run; the others are still returned.
+    await asyncio.wait(tasks)
+    return {
+        device_id: {
+            **coordinator.high_res.as_dict(),
+            **coordinator.high_res.samples.since(0.0),
+        }
+        for device_id, coordinator in coordinators.items()
+        if coordinator.high_res is not None
+    }
+
+
+async def _async_replay_capture(call: ServiceCall) -> ServiceResponse:
+    """Replay a capture through a standalone coordinator; report how it ran.
+
+    Defaults to the charger's own capture file, flushed first. The live
+    coordinator, its entities and its stored data are left untouched.
+    """
+    hass = call.hass
+    device_id = call.data[ATTR_DEVICE_ID]
+    coordinator = async_get_coordinators(hass, [device_id])[device_id]
+    if (path := call.data.get(ATTR_PATH)) is None:
+        path = capture_path(hass, coordinator.entry.entry_id)
+        if (capture := coordinator.client.capture) is not None:
+            await hass.async_add_executor_job(capture.flush, capture.take())
+    else:
+        # Relative paths are taken from the configuration directory.
+        path = hass.config.path(path)
+        if not hass.config.is_allowed_path(path):
+            raise ServiceValidationError(f"Path is not allowed: {path}")
+    try:
+        records = await hass.async_add_executor_job(load_capture, path)
+    except (OSError, ValueError) as exc:
+        raise ServiceValidationError(f"Could not read capture {path}: {exc}") from exc
+    if not records:
+        raise ServiceValidationError(f"No captured requests in {path}")
+    polls, replay = await async_replay_capture(
+        hass, coordinator.entry, records, speed=call.data[ATTR_SPEED]
+    )
+    return {
+        "requests": len(records),
+        "polls": polls,
+        "capabilities": sorted(replay.capabilities),
+        "performance": replay.performance_report(),
+    }
+
+
+def _iso(timestamp: float | None) -> str | None:
+    if timestamp is None:
+        return None
+    return dt_util.utc_from_timestamp(timestamp).isoformat()
+
+
+async def _async_get_fault_journal(call: ServiceCall) -> ServiceResponse:
+    coordinators = async_get_coordinators(call.hass, call.data.get(ATTR_DEVICE_ID))
+    return {
+        device_id: [
+            {**entry, "start": _iso(entry["start"]), "end": _iso(entry["end"])}
+            for entry in coordinator.faults.as_list()
+        ]
+        for device_id, coordinator in coordinators.items()
+        if coordinator.faults is not None
+    }
+
+
+async def _async_fan_out(
+    call: ServiceCall,
+    action: Callable[[VoltieChargerCoordinator], Awaitable[Any]],
+) -> ServiceResponse:
+    """Run ``action`` on every targeted charger at once.
+
+    At most FAN_OUT_CONCURRENCY chargers are in flight across all calls.
+    The response reports success, latency and, for partially rejected
+    config writes, how many values the charger accepted.
+    """
+    hass = call.hass
+    targets = call.data[ATTR_DEVICE_ID]
+    coordinators = async_get_coordinators(
+        hass, None if targets == ALL_DEVICES else targets
+    )
+    if (semaphore := hass.data.get(_FAN_OUT_SEMAPHORE)) is None:
+        semaphore = hass.data[_FAN_OUT_SEMAPHORE] = asyncio.Semaphore(
+            FAN_OUT_CONCURRENCY
+        )
+
+    async def _run(coordinator: VoltieChargerCoordinator) -> dict[str, Any]:
+        result: dict[str, Any] = {"success": True, "accepted": None, "error": None}
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await action(coordinator)
+            except VoltieChargerRejectedError as exc:
+                result.update(success=False, accepted=exc.accepted, error=str(exc))
+            except (VoltieChargerError, HomeAssistantError) as exc:
+                result.update(success=False, error=str(exc))
+            result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    results = dict(
+        zip(
+            coordinators,
+            await asyncio.gather(*(_run(c) for c in coordinators.values())),
+        )
+    )
+    if not call.return_response and (
+        failed := [device_id for device_id, r in results.items() if not r["success"]]
+    ):
+        raise HomeAssistantError(
+            f"{len(failed)} of {len(results)} chargers failed: {', '.join(failed)}"
+        )
+    return results
+
+
+async def _async_send_and_refresh(
+    coordinator: VoltieChargerCoordinator, start: bool
+) -> None:
+    client = coordinator.client
+    await (client.async_start() if start else client.async_stop())
+    await coordinator.async_request_refresh()
+
+
+async def _async_set_config(call: ServiceCall) -> ServiceResponse:
+    values = call.data[ATTR_CONFIG]
+    return await _async_fan_out(
+        call, lambda coordinator: coordinator.async_push_config(values)
+    )
+
+
+async def _async_set_current_limit(call: ServiceCall) -> ServiceResponse:
+    values = {"conf_current_limit": call.data[ATTR_CURRENT_LIMIT]}
+    return await _async_fan_out(
+        call, lambda coordinator: coordinator.async_push_config(values)
+    )
+
+
+async def _async_start(call: ServiceCall) -> ServiceResponse:
+    return await _async_fan_out(
+        call, partial(_async_send_and_refresh, start=True)
+    )
+
+
+async def _async_stop(call: ServiceCall) -> ServiceResponse:
+    return await _async_fan_out(
+        call, partial(_async_send_and_refresh, start=False)
+    )
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register domain services (once, from async_setup)."""
+    for service, handler, schema in (
+        (SERVICE_SET_CONFIG, _async_set_config, SET_CONFIG_SCHEMA),
+        (SERVICE_SET_CURRENT_LIMIT, _async_set_current_limit, SET_CURRENT_LIMIT_SCHEMA),
+        (SERVICE_START, _async_start, FLEET_SCHEMA),
+        (SERVICE_STOP, _async_stop, FLEET_SCHEMA),
+    ):
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            handler,
+            schema=schema,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FAULT_JOURNAL,
+        _async_get_fault_journal,
+        schema=FAULT_JOURNAL_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_RECENT_SAMPLES,
+        _async_get_recent_samples,
+        schema=RECENT_SAMPLES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SAMPLE_HIGH_RES,
+        _async_sample_high_res,
+        schema=SAMPLE_HIGH_RES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPLAY_CAPTURE,
+        _async_replay_capture,
+        schema=REPLAY_CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SESSION_SUMMARY,
+        _async_get_session_summary,
+        schema=SESSION_SUMMARY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
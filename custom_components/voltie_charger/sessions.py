@@ -0,0 +1,314 @@
+"""Charging-session tracking and the local session store."""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+import json
+import logging
+import sqlite3
+import threading
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, SESSION_DB_FILE
+
+_LOGGER = logging.getLogger(__name__)
+
+SESSION_STORE_KEY: HassKey[SessionStore] = HassKey(f"{DOMAIN}_session_store")
+
+# Anything below this is a firmware-relative counter, not an epoch timestamp.
+_MIN_EPOCH = 1_000_000_000
+
+
+@dataclass(kw_only=True)
+class ChargingSession:
+    """One completed (or in-progress) session as derived from /status cdr."""
+
+    charger_id: str
+    idtag: str | None
+    started: float
+    ended: float | None = None
+    energy: float = 0.0
+    charge_time: int | None = None
+    idle_time: int | None = None
+    avg_power: float | None = None
+    # None when no price was known for any of the session's energy.
+    cost: float | None = None
+    # kWh charged per hour, keyed by the hour's start (epoch seconds).
+    hourly: dict[float, float] = field(default_factory=dict)
+
+
+def hour_start(timestamp: float) -> float:
+    return timestamp - timestamp % 3600
+
+
+def _number(value: Any) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+class SessionTracker:
+    """Detects session boundaries from cdr resets and plug-state changes.
+
+    A session closes when the car is unplugged, when cdr.s_start changes, or
+    when cdr.chg_energy drops (the firmware reset the counters). The stale cdr
+    left behind after an unplug is remembered so it doesn't reopen a session.
+
+    When a price is passed in, each tick's energy delta is costed at it, so
+    session cost (and ``cost_total`` across sessions) grows in O(1) per tick.
+    Energy already charged when a session is first seen is not costed.
+    """
+
+    def __init__(self, charger_id: str) -> None:
+        self._charger_id = charger_id
+        self._open: ChargingSession | None = None
+        self._open_marker: Any = None
+        self._closed_marker: Any = None
+        self.cost_total = 0.0
+
+    @property
+    def current(self) -> ChargingSession | None:
+        return self._open
+
+    def update(
+        self, status: dict[str, Any], now: float, price: float | None = None
+    ) -> ChargingSession | None:
+        """Feed one /status; return the session that just completed, if any."""
+        cdr = status.get("cdr")
+        cdr = cdr if isinstance(cdr, dict) else {}
+        energy = _number(cdr.get("chg_energy"))
+        marker = cdr.get("s_start")
+        connected = status.get("is_car_connected")
+        completed: ChargingSession | None = None
+
+        if self._open is not None:
+            restarted = (
+                marker is not None
+                and self._open_marker is not None
+                and marker != self._open_marker
+            ) or (energy is not None and energy < self._open.energy - 1e-6)
+            if restarted:
+                completed = self._close(now)
+            else:
+                self._apply(cdr, energy, now, price)
+                # Firmware reports 0/1 as well as booleans; None is unknown.
+                if connected is not None and not connected:
+                    completed = self._close(now)
+                    self._closed_marker = (marker, energy)
+
+        if (
+            self._open is None
+            and connected
+            and (marker, energy) != self._closed_marker
+        ):
+            started = _number(marker)
+            self._open = ChargingSession(
+                charger_id=self._charger_id,
+                idtag=cdr.get("idtag"),
+                started=started if started and started > _MIN_EPOCH else now,
+            )
+            self._open_marker = marker
+            self._closed_marker = None
+            # Energy already on the counter when we first see the session
+            # (e.g. after a restart) was costed before, if at all; it sets
+            # the baseline but isn't priced again.
+            self._apply(cdr, energy, now, None)
+        return completed
+
+    def _apply(
+        self,
+        cdr: dict[str, Any],
+        energy: float | None,
+        now: float,
+        price: float | None,
+    ) -> None:
+        assert self._open is not None
+        if energy is not None:
+            # Energy seen on the first tick (e.g. after a restart) lands in
+            # the hour we first saw it; later deltas in the hour they occur.
+            if (delta := energy - self._open.energy) > 0:
+                bucket = hour_start(now)
+                self._open.hourly[bucket] = self._open.hourly.get(bucket, 0.0) + delta
+                if price is not None:
+                    self._open.cost = (self._open.cost or 0.0) + delta * price
+                    self.cost_total += delta * price
+            self._open.energy = energy
+        if cdr.get("idtag"):
+            self._open.idtag = cdr["idtag"]
+        for attr, field_name in (
+            ("charge_time", "chg_time"),
+            ("idle_time", "idle_time"),
+        ):
+            if (value := _number(cdr.get(field_name))) is not None:
+                setattr(self._open, attr, int(value))
+        if (value := _number(cdr.get("avg_power"))) is not None:
+            self._open.avg_power = value
+
+    def _close(self, now: float) -> ChargingSession:
+        assert self._open is not None
+        session, self._open = self._open, None
+        self._open_marker = None
+        session.ended = now
+        return session
+
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        id INTEGER PRIMARY KEY,
+        charger_id TEXT NOT NULL,
+        idtag TEXT,
+        started REAL NOT NULL,
+        ended REAL NOT NULL,
+        energy REAL NOT NULL,
+        charge_time INTEGER,
+        idle_time INTEGER,
+        avg_power REAL,
+        hourly TEXT,
+        imported INTEGER NOT NULL DEFAULT 0,
+        cost REAL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started)",
+    "CREATE INDEX IF NOT EXISTS sessions_idtag ON sessions (idtag, started)",
+    "CREATE INDEX IF NOT EXISTS sessions_charger ON sessions (charger_id, started)",
+)
+# Columns added after the first release of the table.
+_MIGRATIONS = {
+    "hourly": "ALTER TABLE sessions ADD COLUMN hourly TEXT",
+    "imported": (
+        "ALTER TABLE sessions ADD COLUMN imported INTEGER NOT NULL DEFAULT 0"
+    ),
+    "cost": "ALTER TABLE sessions ADD COLUMN cost REAL",
+}
+
+
+class SessionStore:
+    """SQLite-backed store of completed sessions, shared by all entries.
+
+    All methods block and must run in the executor.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            existing = {
+                row[1] for row in self._conn.execute("PRAGMA table_info(sessions)")
+            }
+            for column, statement in _MIGRATIONS.items():
+                if column not in existing:
+                    self._conn.execute(statement)
+
+    def add(self, session: ChargingSession) -> int:
+        row = asdict(session)
+        row["hourly"] = json.dumps(session.hourly)
+        columns = ", ".join(row)
+        placeholders = ", ".join(f":{name}" for name in row)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO sessions ({columns}) VALUES ({placeholders})", row
+            )
+        return int(cursor.lastrowid or 0)
+
+    def monthly_summary(
+        self,
+        start: float,
+        end: float,
+        *,
+        charger_ids: list[str] | None = None,
+        idtag: str | None = None,
+        utc_offset: float = 0.0,
+    ) -> list[dict[str, Any]]:
+        """kWh, cost and session count per idtag per calendar month.
+
+        Months are bucketed at ``utc_offset`` seconds from UTC (HA's zone).
+        """
+        query = [
+            "SELECT idtag, strftime('%Y-%m', started + ?, 'unixepoch')",
+            "AS month, SUM(energy), SUM(cost), COUNT(*) FROM sessions",
+            "WHERE started >= ? AND started < ?",
+        ]
+        args: list[Any] = [utc_offset, start, end]
+        if idtag is not None:
+            query.append("AND idtag = ?")
+            args.append(idtag)
+        if charger_ids:
+            query.append(f"AND charger_id IN ({', '.join('?' * len(charger_ids))})")
+            args.extend(charger_ids)
+        query.append("GROUP BY idtag, month ORDER BY month, idtag")
+        with self._lock:
+            rows = self._conn.execute(" ".join(query), args).fetchall()
+        return [
+            {
+                "idtag": tag,
+                "month": month,
+                "energy_kwh": round(energy or 0.0, 3),
+                "cost": round(cost, 2) if cost is not None else None,
+                "sessions": count,
+            }
+            for tag, month, energy, cost, count in rows
+        ]
+
+    def pending_import(self, limit: int) -> list[tuple[int, ChargingSession]]:
+        """Oldest sessions not yet written to long-term statistics."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, charger_id, idtag, started, ended, energy, hourly "
+                "FROM sessions WHERE imported = 0 ORDER BY ended LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            (
+                row_id,
+                ChargingSession(
+                    charger_id=charger_id,
+                    idtag=idtag,
+                    started=started,
+                    ended=ended,
+                    energy=energy,
+                    hourly={
+                        float(hour): kwh
+                        for hour, kwh in json.loads(hourly or "{}").items()
+                    },
+                ),
+            )
+            for row_id, charger_id, idtag, started, ended, energy, hourly in rows
+        ]
+
+    def mark_imported(self, row_ids: list[int]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE sessions SET imported = 1 WHERE id = ?",
+                [(row_id,) for row_id in row_ids],
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+async def async_get_session_store(hass: HomeAssistant) -> SessionStore:
+    """Return the domain-wide session store, opening it on first use."""
+    if (store := hass.data.get(SESSION_STORE_KEY)) is not None:
+        return store
+    store = await hass.async_add_executor_job(
+        SessionStore, hass.config.path(".storage", SESSION_DB_FILE)
+    )
+    # Another entry may have opened it while we were in the executor.
+    if (existing := hass.data.get(SESSION_STORE_KEY)) is not None:
+        await hass.async_add_executor_job(store.close)
+        return existing
+    hass.data[SESSION_STORE_KEY] = store
+
+    @callback
+    def _close(event: Event) -> None:
+        hass.async_add_executor_job(store.close)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _close)
+    return store
@@ -0,0 +1,126 @@
+"""Hourly charged-energy statistics imported straight into the recorder."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, STATISTICS_BATCH_SIZE
+from .sessions import ChargingSession, SessionStore
+
+# Serialises imports: each one reads the previous sum before writing.
+_IMPORT_LOCK: HassKey[asyncio.Lock] = HassKey(f"{DOMAIN}_statistics_lock")
+
+
+def _charger_metadata(charger_id: str) -> StatisticMetaData:
+    return StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=f"Voltie Charger {charger_id[-4:].lower()} charged energy",
+        source=DOMAIN,
+        statistic_id=f"{DOMAIN}:energy_{slugify(charger_id)}",
+        unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+    )
+
+
+def _idtag_metadata(idtag: str) -> StatisticMetaData:
+    return StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=f"Voltie RFID {idtag} charged energy",
+        source=DOMAIN,
+        statistic_id=f"{DOMAIN}:energy_tag_{slugify(idtag)}",
+        unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+    )
+
+
+async def _async_import_series(
+    hass: HomeAssistant, metadata: StatisticMetaData, hourly: dict[float, float]
+) -> None:
+    """Append hourly kWh to one statistic, continuing its running sum."""
+    statistic_id = metadata["statistic_id"]
+    last = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, statistic_id, True, {"sum"}
+    )
+    last_start = 0.0
+    total = 0.0
+    if rows := last.get(statistic_id):
+        last_start = float(rows[0]["start"])
+        total = float(rows[0].get("sum") or 0.0)
+
+    # Data for hours at or before the last stored row is folded into that row
+    # (re-written with a higher sum) instead of rewriting every later row.
+    points: dict[float, float] = {}
+    for hour, kwh in hourly.items():
+        bucket = max(hour, last_start)
+        points[bucket] = points.get(bucket, 0.0) + kwh
+
+    statistics: list[StatisticData] = []
+    for hour in sorted(points):
+        total += points[hour]
+        statistics.append(
+            StatisticData(
+                start=dt_util.utc_from_timestamp(hour),
+                sum=total,
+                state=total,
+            )
+        )
+    if statistics:
+        async_add_external_statistics(hass, metadata, statistics)
+
+
+async def _async_import_sessions(
+    hass: HomeAssistant, sessions: Iterable[ChargingSession]
+) -> None:
+    """Write the hourly buckets of completed sessions as external statistics.
+
+    One series per charger and one per RFID tag.
+    """
+    series: dict[str, tuple[StatisticMetaData, dict[float, float]]] = {}
+    for session in sessions:
+        targets = [_charger_metadata(session.charger_id)]
+        if session.idtag:
+            targets.append(_idtag_metadata(session.idtag))
+        for metadata in targets:
+            _, hourly = series.setdefault(metadata["statistic_id"], (metadata, {}))
+            for hour, kwh in session.hourly.items():
+                hourly[hour] = hourly.get(hour, 0.0) + kwh
+
+    for metadata, hourly in series.values():
+        await _async_import_series(hass, metadata, hourly)
+    # The next import reads these sums back; wait until they're committed.
+    await get_instance(hass).async_block_till_done()
+
+
+async def async_import_pending_sessions(
+    hass: HomeAssistant, store: SessionStore
+) -> int:
+    """Import every stored session not yet in statistics, in batches.
+
+    Used both right after a session completes and at startup to backfill
+    sessions whose import failed or was interrupted.
+    """
+    imported = 0
+    async with hass.data.setdefault(_IMPORT_LOCK, asyncio.Lock()):
+        while batch := await hass.async_add_executor_job(
+            store.pending_import, STATISTICS_BATCH_SIZE
+        ):
+            await _async_import_sessions(hass, (session for _, session in batch))
+            await hass.async_add_executor_job(
+                store.mark_imported, [row_id for row_id, _ in batch]
+            )
+            imported += len(batch)
+    return imported
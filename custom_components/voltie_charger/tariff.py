@@ -0,0 +1,209 @@
+"""Electricity prices from a price entity or a static time-of-use table."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Any
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_PRICE_ATTRIBUTES,
+    CONF_PRICE_ENTITY,
+    CONF_TOU_TABLE,
+    DEFAULT_PRICE_ATTRIBUTES,
+)
+
+# Keys price integrations use for a slot's price inside a series entry.
+_PRICE_KEYS = ("value", "price", "total")
+_DEFAULT_SLOT = timedelta(hours=1)
+
+
+@dataclass(frozen=True, slots=True)
+class PriceSlot:
+    """One price interval, [start, end)."""
+
+    start: datetime
+    end: datetime
+    price: float
+
+
+def parse_tou_table(text: str) -> list[tuple[time, float]]:
+    """Parse "HH:MM price" lines; each price holds until the next line's time.
+
+    Raises ValueError on malformed lines.
+    """
+    table: list[tuple[time, float]] = []
+    for line in text.splitlines():
+        if not (line := line.strip()):
+            continue
+        clock, price = line.split()
+        if (start := dt_util.parse_time(clock)) is None:
+            raise ValueError(f"Invalid time {clock!r}")
+        table.append((start, float(price)))
+    if not table:
+        raise ValueError("Empty time-of-use table")
+    return sorted(table)
+
+
+def _tou_slots(
+    table: list[tuple[time, float]], start: datetime, end: datetime
+) -> list[PriceSlot]:
+    """Expand the daily table into local-time slots covering [start, end)."""
+    slots: list[PriceSlot] = []
+    day = dt_util.as_local(start).date() - timedelta(days=1)
+    while True:
+        for index, (clock, price) in enumerate(table):
+            slot_start = dt_util.as_utc(
+                datetime.combine(day, clock, dt_util.get_default_time_zone())
+            )
+            if index + 1 < len(table):
+                next_clock, next_day = table[index + 1][0], day
+            else:
+                next_clock, next_day = table[0][0], day + timedelta(days=1)
+            slot_end = dt_util.as_utc(
+                datetime.combine(next_day, next_clock, dt_util.get_default_time_zone())
+            )
+            if slot_start >= end:
+                return slots
+            if slot_end > start:
+                slots.append(PriceSlot(slot_start, slot_end, price))
+        day += timedelta(days=1)
+
+
+def _parse_entry(entry: Any) -> tuple[datetime, datetime | None, float] | None:
+    if not isinstance(entry, dict):
+        return None
+    start = entry.get("start") or entry.get("startsAt")
+    if isinstance(start, str):
+        start = dt_util.parse_datetime(start)
+    if not isinstance(start, datetime):
+        return None
+    end = entry.get("end")
+    if isinstance(end, str):
+        end = dt_util.parse_datetime(end)
+    for key in _PRICE_KEYS:
+        if isinstance(price := entry.get(key), (int, float)):
+            return (
+                dt_util.as_utc(start),
+                dt_util.as_utc(end) if isinstance(end, datetime) else None,
+                float(price),
+            )
+    return None
+
+
+def _attribute_slots(state: State, attributes: Iterable[str]) -> list[PriceSlot]:
+    """Price series from list-valued attributes (Nord Pool, Tibber style)."""
+    entries = sorted(
+        parsed
+        for name in attributes
+        if isinstance(series := state.attributes.get(name), list)
+        for parsed in map(_parse_entry, series)
+        if parsed is not None
+    )
+    slots: list[PriceSlot] = []
+    for index, (start, end, price) in enumerate(entries):
+        if end is None:
+            end = (
+                entries[index + 1][0]
+                if index + 1 < len(entries)
+                else start + _DEFAULT_SLOT
+            )
+        slots.append(PriceSlot(start, end, price))
+    return slots
+
+
+class Tariff:
+    """Current and upcoming prices for the scheduler and cost tracking.
+
+    A configured price entity wins over the time-of-use table. When the
+    entity has no usable series attribute its numeric state is used as the
+    current price.
+    """
+
+    def __init__(self, hass: HomeAssistant, options: dict[str, Any]) -> None:
+        self.hass = hass
+        self.entity_id: str | None = options.get(CONF_PRICE_ENTITY) or None
+        self._attributes = [
+            name.strip()
+            for name in (
+                options.get(CONF_PRICE_ATTRIBUTES) or DEFAULT_PRICE_ATTRIBUTES
+            ).split(",")
+            if name.strip()
+        ]
+        self._tou = (
+            parse_tou_table(table)
+            if not self.entity_id and (table := options.get(CONF_TOU_TABLE))
+            else None
+        )
+        self._slots: list[PriceSlot] = []
+        self._starts: list[datetime] = []
+        self._state_price: float | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @property
+    def configured(self) -> bool:
+        return self.entity_id is not None or self._tou is not None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        if self.entity_id is None:
+            return lambda: None
+        if state := self.hass.states.get(self.entity_id):
+            self._async_load(state)
+        return async_track_state_change_event(
+            self.hass, [self.entity_id], self._async_entity_changed
+        )
+
+    @callback
+    def async_add_listener(self, update: CALLBACK_TYPE) -> Callable[[], None]:
+        """Notify ``update`` when the upcoming price series changes."""
+        self._listeners.append(update)
+        return lambda: self._listeners.remove(update)
+
+    @callback
+    def _async_entity_changed(self, event: Event[EventStateChangedData]) -> None:
+        if (state := event.data["new_state"]) is None:
+            return
+        if self._async_load(state):
+            for update in list(self._listeners):
+                update()
+
+    @callback
+    def _async_load(self, state: State) -> bool:
+        """Take a new entity state; return whether the series changed."""
+        try:
+            self._state_price = float(state.state)
+        except ValueError:
+            self._state_price = None
+        slots = _attribute_slots(state, self._attributes)
+        if slots == self._slots:
+            return False
+        self._slots = slots
+        self._starts = [slot.start for slot in slots]
+        return True
+
+    def slots(self, start: datetime, end: datetime) -> list[PriceSlot]:
+        """Known price slots overlapping [start, end), in time order."""
+        if self._tou is not None:
+            return _tou_slots(self._tou, start, end)
+        return [slot for slot in self._slots if slot.end > start and slot.start < end]
+
+    def price_at(self, when: datetime) -> float | None:
+        if self._tou is not None:
+            return _tou_slots(self._tou, when, when + timedelta(seconds=1))[0].price
+        index = bisect_right(self._starts, when) - 1
+        if index >= 0 and when < (slot := self._slots[index]).end:
+            return slot.price
+        return self._state_price
@@ -0,0 +1,184 @@
+"""Websocket commands for the Voltie Charger integration."""
+from __future__ import annotations
+
+from functools import partial
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DATA_CONFIG, DATA_POWER, DATA_STATUS, DOMAIN
+from .samples import SAMPLE_FIELDS
+from .services import async_get_coordinators, recent_samples
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/recent_samples",
+        vol.Required("device_id"): str,
+        vol.Optional("seconds", default=300): vol.All(
+            int, vol.Range(min=1, max=86400)
+        ),
+        vol.Optional("fields"): [vol.In(SAMPLE_FIELDS)],
+        vol.Optional("high_res", default=False): bool,
+    }
+)
+@callback
+def ws_recent_samples(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the in-memory sample buffer for one charger."""
+    try:
+        coordinators = async_get_coordinators(hass, [msg["device_id"]])
+    except ServiceValidationError as exc:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(exc))
+        return
+    connection.send_result(
+        msg["id"],
+        recent_samples(
+            coordinators[msg["device_id"]],
+            msg["seconds"],
+            msg.get("fields"),
+            high_res=msg["high_res"],
+        ),
+    )
+
+
+SNAPSHOT_SECTIONS = (DATA_STATUS, DATA_POWER, DATA_CONFIG)
+
+# Open snapshot subscriptions per entry, closed when the entry unloads.
+_SNAPSHOT_CLOSERS: HassKey[dict[str, set[CALLBACK_TYPE]]] = HassKey(
+    f"{DOMAIN}_snapshot_closers"
+)
+
+
+def snapshot_delta(
+    previous: dict[str, Any], current: dict[str, Any], prefix: str = ""
+) -> tuple[dict[str, Any], list[str]]:
+    """Fields of ``current`` that differ from ``previous``, and removed fields.
+
+    Nested objects (power_stat, cdr) are diffed the same way, so one changed
+    phase value doesn't resend the whole object. Removed fields are listed
+    as dotted paths (e.g. "power_stat.voltage3").
+    """
+    delta: dict[str, Any] = {}
+    removed = [f"{prefix}{key}" for key in sorted(previous.keys() - current.keys())]
+    for key, value in current.items():
+        old = previous.get(key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            nested, gone = snapshot_delta(old, value, f"{prefix}{key}.")
+            if nested:
+                delta[key] = nested
+            removed.extend(gone)
+        elif key not in previous or old != value:
+            delta[key] = value
+    return delta, removed
+
+
+@callback
+def _async_close_on_unload(
+    hass: HomeAssistant, entry: ConfigEntry, close: CALLBACK_TYPE
+) -> CALLBACK_TYPE:
+    """Call ``close`` when ``entry`` unloads; returns a callback to forget it.
+
+    One unload hook per entry, so subscriptions that come and go don't pile
+    up callbacks on the entry.
+    """
+    closers = hass.data.setdefault(_SNAPSHOT_CLOSERS, {})
+    if (entry_closers := closers.get(entry.entry_id)) is None:
+        entry_closers = closers[entry.entry_id] = set()
+
+        @callback
+        def _close_all() -> None:
+            for subscription in closers.pop(entry.entry_id, set()):
+                subscription()
+
+        entry.async_on_unload(_close_all)
+    entry_closers.add(close)
+    return partial(entry_closers.discard, close)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_snapshot",
+        vol.Required("device_id"): str,
+    }
+)
+@callback
+def ws_subscribe_snapshot(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream one charger's status, power and config as deltas.
+
+    The first event is {"full": {...}}; every update after that sends
+    {"delta": {...}} with only the changed fields (plus "removed" when fields
+    disappeared), or nothing at all. When the charger's entry unloads (or
+    reloads) a final {"closed": true} event ends the subscription.
+    """
+    try:
+        coordinators = async_get_coordinators(hass, [msg["device_id"]])
+    except ServiceValidationError as exc:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(exc))
+        return
+    coordinator = coordinators[msg["device_id"]]
+    last: dict[str, dict[str, Any]] | None = None
+
+    @callback
+    def _async_send() -> None:
+        nonlocal last
+        data = coordinator.data or {}
+        current = {section: data.get(section) or {} for section in SNAPSHOT_SECTIONS}
+        if last is None:
+            message: dict[str, Any] = {"full": current}
+        else:
+            delta: dict[str, Any] = {}
+            removed: dict[str, list[str]] = {}
+            for section in SNAPSHOT_SECTIONS:
+                changed, gone = snapshot_delta(last[section], current[section])
+                if changed:
+                    delta[section] = changed
+                if gone:
+                    removed[section] = gone
+            if not delta and not removed:
+                return
+            message = {"delta": delta}
+            if removed:
+                message["removed"] = removed
+        last = current
+        connection.send_message(websocket_api.event_message(msg["id"], message))
+
+    remove_listener = coordinator.async_add_listener(_async_send)
+
+    @callback
+    def _async_closed() -> None:
+        remove_listener()
+        connection.subscriptions.pop(msg["id"], None)
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"closed": True})
+        )
+
+    forget = _async_close_on_unload(hass, coordinator.entry, _async_closed)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        remove_listener()
+        forget()
+
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+    _async_send()
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, ws_recent_samples)
+    websocket_api.async_register_command(hass, ws_subscribe_snapshot)
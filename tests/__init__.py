@@ -0,0 +1 @@
+"""Tests for the Voltie Charger integration."""
@@ -0,0 +1,11 @@
+"""Shared fixtures for the Voltie Charger tests."""
+from __future__ import annotations
+
+import pytest
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Let the tests load custom_components/voltie_charger."""
@@ -0,0 +1,121 @@
+"""Tests for site-limit load sharing."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.voltie_charger.allocator import (
+    AllocationDemand,
+    LoadAllocator,
+    allocate,
+)
+from custom_components.voltie_charger.const import DATA_CONFIG, DATA_STATUS
+
+
+def _demand(charger_id: str, priority: int = 1, demand: int = 32):
+    return AllocationDemand(charger_id=charger_id, priority=priority, demand=demand)
+
+
+def test_allocate_never_exceeds_site_limit() -> None:
+    demands = [_demand("a"), _demand("b", priority=2), _demand("c")]
+    for site_limit in range(0, 120):
+        grants = allocate(site_limit, demands)
+        assert sum(grants.values()) <= site_limit
+        assert all(g == 0 or 6 <= g <= 32 for g in grants.values())
+
+
+def test_allocate_pauses_lowest_priority_when_floor_does_not_fit() -> None:
+    demands = [_demand("a"), _demand("b", priority=2), _demand("c")]
+    assert allocate(10, demands) == {"a": 0, "b": 10, "c": 0}
+    assert allocate(12, demands) == {"a": 6, "b": 6, "c": 0}
+
+
+def test_allocate_weights_by_priority_and_redistributes() -> None:
+    demands = [_demand("a"), _demand("b", priority=2), _demand("c", demand=8)]
+    grants = allocate(40, demands)
+    assert grants["c"] == 8
+    assert grants["b"] > grants["a"]
+    assert sum(grants.values()) == 40
+
+
+def _coordinator(
+    charger_id: str,
+    *,
+    limit: int | None = 16,
+    connected: bool = True,
+    drawn: float | None = None,
+    ok: bool = True,
+) -> MagicMock:
+    coordinator = MagicMock(charger_id=charger_id, last_update_success=ok)
+    coordinator.data = {
+        DATA_STATUS: {
+            "is_car_connected": connected,
+            "is_charging": connected,
+            "charge_current": drawn,
+        },
+        DATA_CONFIG: {"conf_current_limit": limit},
+    }
+    coordinator.async_push_config = AsyncMock()
+    coordinator.async_request_refresh = AsyncMock()
+    coordinator.client.async_start = AsyncMock()
+    coordinator.client.async_stop = AsyncMock()
+    return coordinator
+
+
+def _limits(allocator: LoadAllocator) -> dict[str, int]:
+    writes, _ = allocator._plan()
+    return {charger_id: limit for charger_id, (_, limit) in writes.items()}
+
+
+async def test_plan_reserves_unreachable_and_idle(hass: HomeAssistant) -> None:
+    allocator = LoadAllocator(hass)
+    chargers = {
+        "active": _coordinator("active", limit=6),
+        "offline": _coordinator("offline", limit=16, ok=False),
+        "idle": _coordinator("idle", limit=32, connected=False),
+    }
+    unregister = [allocator.async_register(c, 40, 1) for c in chargers.values()]
+
+    # 40 A - 16 A (offline) - 6 A (idle) leaves 18 A for the active one.
+    assert _limits(allocator) == {"active": 18, "idle": 6}
+
+    # Unknown limit and draw: 32 A is held back, leaving no room for 6 A.
+    chargers["offline"].data = None
+    assert _limits(allocator) == {"active": 0, "idle": 6}
+    for remove in unregister:
+        remove()
+
+
+async def test_cycle_pauses_and_resumes(hass: HomeAssistant) -> None:
+    allocator = LoadAllocator(hass)
+    high = _coordinator("high", limit=16)
+    low = _coordinator("low", limit=16)
+    unregister = [
+        allocator.async_register(high, 10, 2),
+        allocator.async_register(low, 10, 1),
+    ]
+
+    assert await allocator.async_run_cycle() == {"high": 10, "low": 0}
+    low.client.async_stop.assert_awaited_once()
+    low.async_push_config.assert_not_awaited()
+    assert allocator.as_dict("low")["paused"] is True
+
+    # The high-priority car leaves and the fuse is upgraded: the reduction
+    # is written first, then the paused charger is resumed.
+    high.data[DATA_STATUS].update(is_car_connected=False, is_charging=False)
+    high.data[DATA_CONFIG]["conf_current_limit"] = 10
+    unregister += [
+        allocator.async_register(high, 16, 2),
+        allocator.async_register(low, 16, 1),
+    ]
+    order: list[str] = []
+    high.async_push_config.side_effect = lambda _: order.append("high")
+    low.async_push_config.side_effect = lambda _: order.append("low")
+    assert await allocator.async_run_cycle() == {"high": 6, "low": 10}
+    assert order == ["high", "low"]
+    low.async_push_config.assert_awaited_once_with({"conf_current_limit": 10})
+    low.client.async_start.assert_awaited_once()
+    assert allocator.as_dict("low")["paused"] is False
+    for remove in unregister:
+        remove()
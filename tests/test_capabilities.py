@@ -0,0 +1,121 @@
+"""Tests for capability detection and capability-gated entities."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_HOST, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.voltie_charger import (
+    VoltieChargerCoordinator,
+    _detect_capabilities,
+)
+from custom_components.voltie_charger.const import (
+    CAP_DLM,
+    CAP_IPM,
+    CAP_PHASE_2,
+    CAP_PHASE_3,
+    CAPABILITY_ABSENT_POLLS,
+    DOMAIN,
+)
+from custom_components.voltie_charger.entity import (
+    _unique_id,
+    async_add_capability_entities,
+)
+
+
+def test_detect_single_phase_charger() -> None:
+    power = {"power_stat": {"voltage1": 230.0, "voltage2": 0, "voltage3": 0}}
+    assert _detect_capabilities({"phases": 1}, power) == frozenset()
+
+
+def test_detect_three_phase_and_meters() -> None:
+    power = {
+        "power_stat": {
+            "voltage2": 231.0,
+            "voltage3": 229.0,
+            "dlm_current1": 0.0,
+            "ipm_valid": 1,
+        }
+    }
+    assert _detect_capabilities({"phases": 1}, power) == {
+        CAP_PHASE_2,
+        CAP_PHASE_3,
+        CAP_DLM,
+        CAP_IPM,
+    }
+    # A three-phase session counts even before voltages are reported.
+    assert _detect_capabilities({"phases": 3}, {}) == {CAP_PHASE_2, CAP_PHASE_3}
+
+
+async def _setup(hass: HomeAssistant):
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "192.0.2.10"})
+    entry.add_to_hass(hass)
+    coordinator = VoltieChargerCoordinator(hass, entry, MagicMock(host="h"))
+    ent_reg = er.async_get(hass)
+    for key in ("voltage1", "dlm_current1"):
+        ent_reg.async_get_or_create(
+            Platform.SENSOR,
+            DOMAIN,
+            _unique_id(key, entry.entry_id),
+            config_entry=entry,
+        )
+    descriptions = [
+        SimpleNamespace(key="voltage1", required_capabilities=frozenset()),
+        SimpleNamespace(key="dlm_current1", required_capabilities={CAP_DLM}),
+    ]
+    added: list[str] = []
+    async_add_capability_entities(
+        entry,
+        coordinator,
+        Platform.SENSOR,
+        descriptions,
+        lambda description: description.key,
+        lambda entities: added.extend(entities),
+    )
+    # Adding a listener schedules polling; only the listeners matter here.
+    await coordinator.async_shutdown()
+    return entry, coordinator, ent_reg, added
+
+
+def _registered(ent_reg: er.EntityRegistry, entry: MockConfigEntry) -> set[str]:
+    return {
+        key
+        for key in ("voltage1", "dlm_current1")
+        if ent_reg.async_get_entity_id(
+            Platform.SENSOR, DOMAIN, _unique_id(key, entry.entry_id)
+        )
+    }
+
+
+async def test_entities_added_when_capability_appears(hass: HomeAssistant) -> None:
+    _, coordinator, _, added = await _setup(hass)
+    assert added == ["voltage1"]
+
+    coordinator.capabilities = frozenset({CAP_DLM})
+    coordinator.async_update_listeners()
+    assert added == ["voltage1", "dlm_current1"]
+
+
+async def test_failed_power_read_keeps_registry_entries(hass: HomeAssistant) -> None:
+    entry, coordinator, ent_reg, _ = await _setup(hass)
+    # /power failed at startup: no capability, no good /power response.
+    coordinator.power_responses = 0
+    for _ in range(5):
+        coordinator.async_update_listeners()
+    assert _registered(ent_reg, entry) == {"voltage1", "dlm_current1"}
+
+
+async def test_absent_capability_pruned_after_good_reads(hass: HomeAssistant) -> None:
+    entry, coordinator, ent_reg, _ = await _setup(hass)
+    coordinator.power_responses = CAPABILITY_ABSENT_POLLS - 1
+    coordinator.async_update_listeners()
+    assert _registered(ent_reg, entry) == {"voltage1", "dlm_current1"}
+
+    coordinator.power_responses = CAPABILITY_ABSENT_POLLS
+    coordinator.async_update_listeners()
+    assert _registered(ent_reg, entry) == {"voltage1"}
@@ -0,0 +1,134 @@
+"""Tests for raw-response capture and replay."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from custom_components.voltie_charger.capture import (
+    ReplayClient,
+    ResponseCapture,
+    async_replay_capture,
+    load_capture,
+)
+from custom_components.voltie_charger.client import VoltieChargerAuthError
+from custom_components.voltie_charger.const import DATA_STATUS, DOMAIN
+
+STATUS = {"charger_id": "VC123", "evse_state": 3, "is_car_connected": True}
+POWER = {"power_stat": {"voltage1": 230.0, "voltage2": 231.0, "current1": 6.0}}
+CONFIG = {"conf_current_limit": 16}
+
+
+def _record(capture: ResponseCapture, endpoint: str, payload: dict) -> None:
+    capture.record("GET", endpoint, 200, json.dumps(payload).encode(), 0.01)
+
+
+def test_capture_round_trip_redacts(tmp_path: Path) -> None:
+    capture = ResponseCapture(str(tmp_path / "capture.jsonl.gz"))
+    _record(capture, "status", STATUS)
+    capture.record("GET", "power", None, None, 0.5, TimeoutError("timed out"))
+    capture.flush(capture.take())
+
+    records = load_capture(capture.path)
+    assert [r["ep"] for r in records] == ["status", "power"]
+    assert json.loads(records[0]["b"])["charger_id"] == "**REDACTED**"
+    assert records[1]["e"] == "TimeoutError"
+    assert records[1]["ms"] == 500.0
+
+
+def test_capture_batches_and_rotates(tmp_path: Path) -> None:
+    path = tmp_path / "capture.jsonl.gz"
+    capture = ResponseCapture(str(path), max_bytes=1, backup_count=2, batch_size=2)
+    _record(capture, "status", STATUS)
+    assert not capture.ready
+    _record(capture, "power", POWER)
+    assert capture.ready
+
+    for _ in range(4):
+        capture.flush(capture.take())
+        _record(capture, "status", STATUS)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "capture.jsonl.gz",
+        "capture.jsonl.gz.1",
+        "capture.jsonl.gz.2",
+    ]
+    # Rotated backups are read back oldest first.
+    records = load_capture(str(path))
+    assert [r["t"] for r in records] == sorted(r["t"] for r in records)
+
+
+def test_capture_flush_without_records_writes_nothing(tmp_path: Path) -> None:
+    capture = ResponseCapture(str(tmp_path / "capture.jsonl.gz"))
+    capture.flush(capture.take())
+    assert not any(tmp_path.iterdir())
+
+
+async def test_replay_client_serves_records_in_order() -> None:
+    records = [
+        {"t": 1, "m": "GET", "ep": "status", "st": 200, "ms": 1, "b": '{"a":1}'},
+        {"t": 2, "m": "GET", "ep": "status", "st": 401, "ms": 1, "b": None,
+         "e": "VoltieChargerAuthError", "em": "denied"},
+    ]
+    client = ReplayClient(records, host="charger.local", speed=0)
+    assert await client.async_get_status() == {"a": 1}
+    assert client.response_bytes["status"] == len('{"a":1}')
+    with pytest.raises(VoltieChargerAuthError, match="denied"):
+        await client.async_get_status()
+
+
+def _poll_records(start: float, count: int) -> list[dict]:
+    records = []
+    for index in range(count):
+        stamp = start + index * 10
+        for offset, (endpoint, body) in enumerate(
+            (("status", STATUS), ("power", POWER), ("config", CONFIG))
+        ):
+            records.append(
+                {
+                    "t": stamp + offset * 0.1,
+                    "m": "GET",
+                    "ep": endpoint,
+                    "st": 200,
+                    "ms": 5.0,
+                    "b": json.dumps(body),
+                }
+            )
+    return records
+
+
+async def test_replay_uses_a_standalone_coordinator(hass: HomeAssistant) -> None:
+    entry = MockConfigEntry(
+        domain=DOMAIN, unique_id="VC123", data={CONF_HOST: "charger.local"}
+    )
+    entry.add_to_hass(hass)
+
+    polls, coordinator = await async_replay_capture(
+        hass, entry, _poll_records(1_700_000_000, 3), speed=0
+    )
+
+    assert polls == 3
+    assert coordinator.data[DATA_STATUS]["evse_state"] == 3
+    assert coordinator.capabilities == {"phase_2"}
+    assert len(coordinator.perf.cycles) == 3
+    # Nothing that persists is attached to the replay.
+    assert coordinator.sessions is None
+    assert coordinator.faults is None
+    assert coordinator.export is None
+    assert coordinator.client.capture is None
+
+
+async def test_replay_skips_retries_when_counting_polls(hass: HomeAssistant) -> None:
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "charger.local"})
+    entry.add_to_hass(hass)
+    records = _poll_records(1_700_000_000, 2)
+    failed = {**records[0], "st": None, "b": None, "e": "TimeoutError", "em": "x"}
+    records.insert(0, {**failed, "t": records[0]["t"] - 0.05})
+
+    polls, _ = await async_replay_capture(hass, entry, records, speed=0)
+
+    assert polls == 2
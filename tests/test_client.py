@@ -0,0 +1,111 @@
+"""Tests for the charger HTTP client's address handling."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from aiohttp import ClientError
+import pytest
+
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from custom_components.voltie_charger import client as client_module
+from custom_components.voltie_charger.client import (
+    VoltieChargerClient,
+    VoltieChargerConnectionError,
+)
+from custom_components.voltie_charger.const import API_PORT
+
+HOST = "voltie-ab12.local"
+ADDRESS = "192.0.2.7"
+NEW_ADDRESS = "192.0.2.8"
+
+
+def _connect(reachable: dict[str, float]):
+    """open_connection stand-in: listed hosts connect after a delay."""
+    attempts: list[str] = []
+
+    async def _open_connection(host: str, port: int):
+        attempts.append(host)
+        if host not in reachable:
+            raise OSError("unreachable")
+        await asyncio.sleep(reachable[host])
+        return MagicMock(), MagicMock()
+
+    return _open_connection, attempts
+
+
+async def test_fastest_address_wins(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    aioclient_mock.get(f"http://{ADDRESS}:{API_PORT}/status", json={"x": 1})
+    client = VoltieChargerClient(
+        async_get_clientsession(hass), HOST, address=ADDRESS
+    )
+    open_connection, attempts = _connect({HOST: 1, ADDRESS: 0})
+    with patch.object(client_module.asyncio, "open_connection", open_connection):
+        assert await client.async_get_status() == {"x": 1}
+        # The winner is kept; later requests don't race again.
+        await client.async_get_status()
+    assert client.host == ADDRESS
+    assert sorted(attempts) == sorted([HOST, ADDRESS])
+
+
+async def test_single_address_is_not_raced(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    aioclient_mock.get(f"http://{HOST}:{API_PORT}/status", json={})
+    client = VoltieChargerClient(async_get_clientsession(hass), HOST, address=HOST)
+    open_connection, attempts = _connect({})
+    with patch.object(client_module.asyncio, "open_connection", open_connection):
+        await client.async_get_status()
+    assert attempts == []
+
+
+async def test_new_addresses_apply_without_a_new_client(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    aioclient_mock.get(f"http://{ADDRESS}:{API_PORT}/status", json={})
+    aioclient_mock.get(f"http://{NEW_ADDRESS}:{API_PORT}/status", json={"new": 1})
+    client = VoltieChargerClient(
+        async_get_clientsession(hass), HOST, address=ADDRESS
+    )
+    open_connection, _ = _connect({ADDRESS: 0})
+    with patch.object(client_module.asyncio, "open_connection", open_connection):
+        await client.async_get_status()
+
+    # The charger moved (e.g. a new DHCP lease announced over zeroconf).
+    client.set_addresses(HOST, NEW_ADDRESS)
+    open_connection, attempts = _connect({NEW_ADDRESS: 0})
+    with patch.object(client_module.asyncio, "open_connection", open_connection):
+        assert await client.async_get_status() == {"new": 1}
+    assert client.host == NEW_ADDRESS
+    assert NEW_ADDRESS in attempts
+
+
+async def test_transport_failure_races_again(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    aioclient_mock.get(f"http://{ADDRESS}:{API_PORT}/status", exc=ClientError())
+    client = VoltieChargerClient(
+        async_get_clientsession(hass), HOST, address=ADDRESS
+    )
+    open_connection, _ = _connect({ADDRESS: 0})
+    with (
+        patch.object(client_module.asyncio, "open_connection", open_connection),
+        pytest.raises(VoltieChargerConnectionError),
+    ):
+        await client.async_get_status()
+
+    # The IP went away; the hostname answers now.
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(f"http://{HOST}:{API_PORT}/status", json={"ok": 1})
+    open_connection, _ = _connect({HOST: 0})
+    with patch.object(client_module.asyncio, "open_connection", open_connection):
+        assert await client.async_get_status() == {"ok": 1}
+    assert client.host == HOST
@@ -0,0 +1,93 @@
+"""Tests for discovery probe caching in the config flow."""
+from __future__ import annotations
+
+import asyncio
+from ipaddress import ip_address
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import SOURCE_ZEROCONF
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
+
+from custom_components.voltie_charger import config_flow
+from custom_components.voltie_charger.const import (
+    CONF_ADDRESS,
+    CONF_MDNS_NAME,
+    DOMAIN,
+    PROBE_CACHE_TTL,
+)
+
+HOST = "voltie-ab12.local"
+
+
+async def test_probe_shared_and_expires(hass: HomeAssistant) -> None:
+    calls: list[str] = []
+    release = asyncio.Event()
+
+    async def _validate(hass: HomeAssistant, data: dict) -> tuple[str, dict]:
+        calls.append(data[CONF_HOST])
+        await release.wait()
+        return "VC1", {}
+
+    now = 1000.0
+    with (
+        patch.object(config_flow, "_validate", _validate),
+        patch.object(config_flow.time, "monotonic", side_effect=lambda: now),
+    ):
+        # Announcements arriving together wait on one request.
+        pending = [
+            hass.async_create_task(
+                config_flow._async_probe_cached(hass, HOST, "voltie-ab12")
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        assert await asyncio.gather(*pending) == [("VC1", {})] * 3
+        assert calls == [HOST]
+
+        now += PROBE_CACHE_TTL - 1
+        await config_flow._async_probe_cached(hass, HOST, "voltie-ab12")
+        await config_flow._async_probe_cached(hass, "10.0.0.2", "voltie-ab12")
+        assert calls == [HOST, "10.0.0.2"]
+
+        now += 1
+        await config_flow._async_probe_cached(hass, HOST, "voltie-ab12")
+        assert calls == [HOST, "10.0.0.2", HOST]
+
+
+async def test_known_charger_announcement_skips_probe(hass: HomeAssistant) -> None:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="VC1",
+        data={CONF_HOST: "old.local", CONF_MDNS_NAME: "voltie-ab12"},
+    )
+    entry.add_to_hass(hass)
+    flow = config_flow.VoltieChargerConfigFlow()
+    flow.hass = hass
+    flow.context = {"source": SOURCE_ZEROCONF}
+    info = ZeroconfServiceInfo(
+        ip_address=ip_address("192.0.2.7"),
+        ip_addresses=[ip_address("192.0.2.7")],
+        hostname=f"{HOST}.",
+        name="Voltie-AB12._voltie-info._tcp.local.",
+        port=80,
+        type="_voltie-info._tcp.local.",
+        properties={},
+    )
+
+    with patch.object(config_flow, "_validate") as validate:
+        result = await flow.async_step_zeroconf(info)
+
+    validate.assert_not_called()
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    assert entry.data == {
+        CONF_HOST: HOST,
+        CONF_MDNS_NAME: "voltie-ab12",
+        CONF_ADDRESS: "192.0.2.7",
+    }
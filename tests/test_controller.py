@@ -0,0 +1,116 @@
+"""Tests for the grid-power current-limit controller."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from homeassistant.const import UnitOfPower
+from homeassistant.core import HomeAssistant
+
+from custom_components.voltie_charger.client import VoltieChargerConnectionError
+from custom_components.voltie_charger.const import (
+    CONF_CONTROL_HYSTERESIS,
+    CONF_CONTROL_INTERVAL,
+    CONF_GRID_POWER_ENTITY,
+    CONF_GRID_TARGET,
+    DATA_CONFIG,
+    DATA_STATUS,
+)
+from custom_components.voltie_charger.controller import (
+    CurrentLimitController,
+    target_current,
+)
+
+GRID = "sensor.grid_power"
+
+
+@pytest.mark.parametrize(
+    ("grid_w", "charge_w", "target_w", "phases", "expected"),
+    [
+        # 2.3 kW exported while charging at 1.38 kW: 16 A on one phase.
+        (-2300, 1380, 0, 1, 16),
+        # Importing more than the charger draws clamps to the minimum.
+        (5000, 1380, 0, 1, 6),
+        # Plenty of surplus clamps to the maximum.
+        (-30000, 0, 0, 3, 32),
+        # A 4.14 kW import allowance on three phases: 6 A.
+        (0, 0, 4140, 3, 6),
+    ],
+)
+def test_target_current(
+    grid_w: float, charge_w: float, target_w: float, phases: int, expected: int
+) -> None:
+    assert target_current(grid_w, charge_w, target_w, 230, phases) == expected
+
+
+def _controller(hass: HomeAssistant, limit: int = 6, **options: object):
+    coordinator = MagicMock(charger_id="VC1")
+    coordinator.data = {
+        DATA_STATUS: {"is_car_connected": True, "charge_power": 0, "phases": 1},
+        DATA_CONFIG: {"conf_current_limit": limit},
+    }
+    coordinator.async_push_config = AsyncMock()
+    coordinator.entry.async_create_background_task = (
+        lambda hass, target, name: hass.async_create_task(target)
+    )
+    controller = CurrentLimitController(
+        hass,
+        coordinator,
+        {
+            CONF_GRID_POWER_ENTITY: GRID,
+            CONF_GRID_TARGET: 0,
+            CONF_CONTROL_HYSTERESIS: 2,
+            CONF_CONTROL_INTERVAL: 60,
+            **options,
+        },
+    )
+    return controller, coordinator
+
+
+async def test_writes_on_surplus_then_rate_limits(hass: HomeAssistant) -> None:
+    controller, coordinator = _controller(hass)
+    unsub = controller.async_start()
+
+    hass.states.async_set(GRID, "-2.3", {"unit_of_measurement": UnitOfPower.KILO_WATT})
+    await hass.async_block_till_done()
+    coordinator.async_push_config.assert_awaited_once_with({"conf_current_limit": 10})
+    assert controller.writes == 1
+
+    # Inside the minimum interval nothing else is written.
+    hass.states.async_set(GRID, "-4600")
+    await hass.async_block_till_done()
+    assert coordinator.async_push_config.await_count == 1
+    assert controller.skipped == 1
+    assert controller.last_target == 20
+    unsub()
+
+
+async def test_hysteresis_and_unplugged(hass: HomeAssistant) -> None:
+    controller, coordinator = _controller(hass, limit=10)
+    unsub = controller.async_start()
+    # Charging at 10 A with 230 W spare: 11 A is within the 2 A hysteresis.
+    coordinator.data[DATA_STATUS]["charge_power"] = 2.3
+    hass.states.async_set(GRID, "-230")
+    await hass.async_block_till_done()
+    assert controller.last_target == 11
+    coordinator.data[DATA_STATUS]["is_car_connected"] = False
+    hass.states.async_set(GRID, "-4600")
+    hass.states.async_set(GRID, "unavailable")
+    await hass.async_block_till_done()
+    coordinator.async_push_config.assert_not_awaited()
+    assert controller.skipped == 1
+    unsub()
+
+
+async def test_failed_write_counted(hass: HomeAssistant) -> None:
+    controller, coordinator = _controller(hass)
+    coordinator.async_push_config.side_effect = VoltieChargerConnectionError("x")
+    listener = MagicMock()
+    controller.async_add_listener(listener)
+    unsub = controller.async_start()
+    hass.states.async_set(GRID, "-4600")
+    await hass.async_block_till_done()
+    assert (controller.writes, controller.failures) == (0, 1)
+    listener.assert_called_once()
+    unsub()
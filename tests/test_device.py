@@ -0,0 +1,58 @@
+"""Tests for device info and firmware version sync."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.voltie_charger import VoltieChargerCoordinator
+from custom_components.voltie_charger.const import DATA_STATUS, DOMAIN
+from custom_components.voltie_charger.device import build_device_info
+
+
+def test_build_device_info_decodes_versions() -> None:
+    info = build_device_info(
+        "VC0001A2B3",
+        "voltiecharger-c0ffee.local",
+        "192.0.2.10",
+        {"sw_ver": 1001036, "fw_ver": 199},
+    )
+    assert info["sw_version"] == "1.1.36"
+    assert info["hw_version"] == "1.99"
+    assert info["name"] == "Voltie Charger c0ffee"
+    assert info["configuration_url"] == "http://192.0.2.10"
+
+
+def test_build_device_info_without_versions() -> None:
+    info = build_device_info("VC0001A2B3", "192.0.2.10", "192.0.2.10", {})
+    assert info["sw_version"] is None
+    assert info["name"] == "Voltie Charger A2B3"
+
+
+async def test_version_sync_keeps_missing_values(hass: HomeAssistant) -> None:
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "192.0.2.10"})
+    entry.add_to_hass(hass)
+    client = MagicMock(host="192.0.2.10")
+    coordinator = VoltieChargerCoordinator(hass, entry, client)
+    coordinator.data = {DATA_STATUS: {"sw_ver": 1001036, "fw_ver": 199}}
+    coordinator.async_init_device_info("VC1")
+    dev_reg = dr.async_get(hass)
+    device = dev_reg.async_get_or_create(
+        config_entry_id=entry.entry_id, **coordinator.device_info
+    )
+
+    # A status without versions (e.g. a partial push) changes nothing.
+    coordinator._async_sync_device_versions({})
+    coordinator._async_sync_device_versions({"sw_ver": None, "fw_ver": 199})
+    device = dev_reg.async_get(device.id)
+    assert (device.sw_version, device.hw_version) == ("1.1.36", "1.99")
+
+    # Only the field that is present and changed is written.
+    coordinator._async_sync_device_versions({"sw_ver": 1002000})
+    device = dev_reg.async_get(device.id)
+    assert (device.sw_version, device.hw_version) == ("1.2.0", "1.99")
+    assert coordinator.device_info["sw_version"] == "1.2.0"
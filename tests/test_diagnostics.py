@@ -0,0 +1,61 @@
+"""Tests for config-entry diagnostics."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from custom_components.voltie_charger import VoltieChargerCoordinator
+from custom_components.voltie_charger.const import (
+    CONF_ADDRESS,
+    CONF_MDNS_NAME,
+    DATA_STATUS,
+    DOMAIN,
+)
+from custom_components.voltie_charger.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+
+async def _diagnostics(hass: HomeAssistant, data: dict) -> dict:
+    entry = MockConfigEntry(domain=DOMAIN, unique_id="VC1", data=data)
+    entry.add_to_hass(hass)
+    coordinator = VoltieChargerCoordinator(hass, entry, MagicMock(capture=None))
+    coordinator.charger_id = "VC1"
+    coordinator.data = {DATA_STATUS: {"charger_id": "VC1", "evse_state": 2}}
+    entry.runtime_data = coordinator
+    return await async_get_config_entry_diagnostics(hass, entry)
+
+
+async def test_addresses_and_ids_are_redacted(hass: HomeAssistant) -> None:
+    diagnostics = await _diagnostics(
+        hass,
+        {
+            CONF_HOST: "voltie-ab12.local",
+            CONF_ADDRESS: "192.0.2.7",
+            CONF_MDNS_NAME: "voltie-ab12",
+            CONF_USERNAME: "admin",
+            CONF_PASSWORD: "secret",
+        },
+    )
+    assert set(diagnostics["entry"]["data"].values()) == {REDACTED}
+    assert diagnostics["coordinator"]["data"][DATA_STATUS] == {
+        "charger_id": REDACTED,
+        "evse_state": 2,
+    }
+
+
+async def test_performance_section(hass: HomeAssistant) -> None:
+    diagnostics = await _diagnostics(hass, {CONF_HOST: "192.0.2.10"})
+    assert diagnostics["performance"] == {
+        "cycles": [],
+        "carried_forward": {},
+        "config_reprobes": 0,
+        "state_writes": 0,
+        "config_latch": {"available": True, "polls_since_failure": 0},
+    }
+    assert diagnostics["sample_buffer"]["samples"] == 0
@@ -0,0 +1,37 @@
+"""Tests for lifetime energy integration."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.voltie_charger.energy import EnergyIntegrator
+
+
+def test_trapezoid() -> None:
+    energy = EnergyIntegrator()
+    energy.add_sample("total", 0, 0.0, max_gap=60)
+    energy.add_sample("total", 30, 7.2, max_gap=60)
+    energy.add_sample("total", 60, 7.2, max_gap=60)
+    # 30 s ramping 0 -> 7.2 kW, then 30 s at 7.2 kW.
+    assert energy.snapshot()["total"] == pytest.approx(0.03 + 0.06)
+
+
+def test_gaps_and_bad_samples_are_not_bridged() -> None:
+    energy = EnergyIntegrator()
+    energy.add_sample("total", 0, 7.2, max_gap=60)
+    energy.add_sample("total", 600, 7.2, max_gap=60)
+    assert energy.snapshot()["total"] == 0.0
+    energy.add_sample("total", 610, None, max_gap=60)
+    energy.add_sample("total", 620, 7.2, max_gap=60)
+    assert energy.snapshot()["total"] == 0.0
+    # Negative readings count as zero.
+    energy.add_sample("total", 650, -1.0, max_gap=60)
+    assert energy.snapshot()["total"] == pytest.approx(3.6 * 30 / 3600)
+
+
+def test_restore_adds_once() -> None:
+    energy = EnergyIntegrator()
+    energy.add_sample("total", 0, 3.6, max_gap=60)
+    energy.add_sample("total", 10, 3.6, max_gap=60)
+    energy.restore("total", 100.0)
+    energy.restore("total", 100.0)
+    assert energy.snapshot()["total"] == pytest.approx(100.01)
@@ -0,0 +1,95 @@
+"""Tests for transition events and burst sampling."""
+from __future__ import annotations
+
+import time
+from unittest.mock import MagicMock
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.voltie_charger import VoltieChargerCoordinator
+from custom_components.voltie_charger.const import (
+    BURST_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    EVENT_VOLTIE_CHARGER,
+)
+from custom_components.voltie_charger.events import (
+    EVENT_CHARGING_STARTED,
+    EVENT_FAULT_CLEARED,
+    EVENT_FAULT_RAISED,
+    EVENT_PLUGGED,
+    EVENT_UNPLUGGED,
+    TransitionEvents,
+    detect_transitions,
+)
+
+IDLE = {"is_car_connected": False, "is_charging": False, "evse_state": 1}
+
+
+def test_no_transitions_without_history_or_fields() -> None:
+    assert detect_transitions({}, IDLE) == []
+    # A poll missing a field isn't an unplug.
+    assert detect_transitions(IDLE | {"is_car_connected": True}, {}) == []
+    # 0/1 and booleans compare by truth value.
+    assert detect_transitions(IDLE, IDLE | {"is_car_connected": 0}) == []
+
+
+def test_plug_charge_and_fault_transitions() -> None:
+    charging = {"is_car_connected": 1, "is_charging": True, "evse_state": 3}
+    assert detect_transitions(IDLE, charging) == [
+        (EVENT_PLUGGED, {}),
+        (EVENT_CHARGING_STARTED, {}),
+    ]
+    # Switching from one fault to another clears the first, then raises.
+    assert detect_transitions(
+        IDLE | {"evse_state": 10}, IDLE | {"evse_state": 11}
+    ) == [
+        (EVENT_FAULT_CLEARED, {"evse_state": "over_temperature", "code": 10}),
+        (EVENT_FAULT_RAISED, {"evse_state": "over_current", "code": 11}),
+    ]
+
+
+async def test_events_fired_with_device_id(hass: HomeAssistant) -> None:
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, "VC1")}
+    )
+    fired = async_capture_events(hass, EVENT_VOLTIE_CHARGER)
+    events = TransitionEvents(hass, "VC1")
+
+    events.async_fire([(EVENT_UNPLUGGED, {})], time.monotonic())
+    await hass.async_block_till_done()
+    assert [event.data for event in fired] == [
+        {"device_id": device.id, "type": EVENT_UNPLUGGED}
+    ]
+    assert events.as_dict()["fired"] == {EVENT_UNPLUGGED: 1}
+    assert events.as_dict()["last_latency_ms"] is not None
+
+
+async def test_transition_starts_a_burst(hass: HomeAssistant) -> None:
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "192.0.2.10"})
+    entry.add_to_hass(hass)
+    coordinator = VoltieChargerCoordinator(hass, entry, MagicMock(capture=None))
+    coordinator.events = TransitionEvents(hass, "VC1")
+    fired = async_capture_events(hass, EVENT_VOLTIE_CHARGER)
+
+    now = time.monotonic()
+    coordinator.async_set_updated_data(coordinator._process(IDLE, now, {}, None, {}))
+    assert coordinator.update_interval == DEFAULT_SCAN_INTERVAL
+
+    plugged = IDLE | {"is_car_connected": True}
+    coordinator.async_set_updated_data(
+        coordinator._process(plugged, now, {}, None, {})
+    )
+    await hass.async_block_till_done()
+    assert coordinator.update_interval == BURST_SCAN_INTERVAL
+    assert [event.data["type"] for event in fired] == [EVENT_PLUGGED]
+    await coordinator.async_shutdown()
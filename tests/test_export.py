@@ -0,0 +1,81 @@
+"""Tests for the rolling telemetry export."""
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+from pathlib import Path
+
+import pytest
+
+from custom_components.voltie_charger.export import EXPORT_COLUMNS, TelemetryExport
+
+# 2026-01-05 23:59:59 and 2026-01-06 00:00:01 UTC.
+LATE = 1_767_657_599.0
+EARLY = LATE + 2
+STATUS = {"is_car_connected": True, "charge_power": 1380, "phases": float("nan")}
+POWER = {"power_stat": {"current1": 6.0}}
+
+
+def _rows(path: Path) -> list[dict[str, str]]:
+    with gzip.open(path, "rt") as file:
+        return list(csv.DictReader(io.StringIO(file.read())))
+
+
+def test_batches_split_by_day(tmp_path: Path) -> None:
+    export = TelemetryExport(str(tmp_path), batch_size=2)
+    assert not export.record(LATE, STATUS, POWER)
+    assert export.record(EARLY, STATUS, {})
+    export.flush(export.take())
+    # A second batch appends to the same file without another header.
+    export.record(EARLY + 1, {}, POWER)
+    export.flush(export.take())
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "2026-01-05.csv.gz",
+        "2026-01-06.csv.gz",
+    ]
+    (late,) = _rows(tmp_path / "2026-01-05.csv.gz")
+    assert list(late) == list(EXPORT_COLUMNS)
+    assert (late["is_car_connected"], late["phases"], late["current1"]) == (
+        "1",
+        "",
+        "6.0",
+    )
+    assert len(_rows(tmp_path / "2026-01-06.csv.gz")) == 2
+    assert export.as_dict()["rows_written"] == 3
+
+
+def test_oldest_days_pruned_past_cap(tmp_path: Path) -> None:
+    for day in ("2026-01-01", "2026-01-02"):
+        (tmp_path / f"{day}.csv.gz").write_bytes(b"x" * 1000)
+    (tmp_path / "notes.txt").write_bytes(b"x" * 5000)
+    export = TelemetryExport(str(tmp_path), max_bytes=1500)
+    export.record(LATE, STATUS, POWER)
+    export.flush(export.take())
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "2026-01-02.csv.gz",
+        "2026-01-05.csv.gz",
+        "notes.txt",
+    ]
+    assert export.files_pruned == 1
+
+
+def test_newest_file_kept_over_cap(tmp_path: Path) -> None:
+    export = TelemetryExport(str(tmp_path), max_bytes=1)
+    export.record(LATE, STATUS, POWER)
+    export.flush(export.take())
+    assert [p.name for p in tmp_path.iterdir()] == ["2026-01-05.csv.gz"]
+
+
+def test_write_error_counted_and_logged(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    export = TelemetryExport(str(blocker / "export"))
+    export.record(LATE, STATUS, POWER)
+    export.flush(export.take())
+    assert export.as_dict()["write_errors"] == 1
+    assert "Could not write 1 telemetry samples" in caplog.text
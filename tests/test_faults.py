@@ -0,0 +1,103 @@
+"""Tests for the EVSE fault journal."""
+from __future__ import annotations
+
+from datetime import timedelta
+import time
+from typing import Any
+from unittest.mock import MagicMock
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from custom_components.voltie_charger import VoltieChargerCoordinator
+from custom_components.voltie_charger.const import (
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    FAULT_JOURNAL_SAVE_DELAY,
+    FAULT_JOURNAL_SIZE,
+    FAULT_SCAN_INTERVAL,
+)
+from custom_components.voltie_charger.faults import FaultJournal
+
+STORAGE_KEY = f"{DOMAIN}.faults_vc_1"
+POWER = {"power_stat": {"current1": 31.5}}
+
+
+async def test_fault_lifecycle(hass: HomeAssistant) -> None:
+    journal = FaultJournal(hass, "VC-1")
+    journal.async_update({"evse_state": 3}, POWER, 100.0)
+    assert journal.active is None
+
+    journal.async_update({"evse_state": 11}, POWER, 100.0)
+    journal.async_update({"evse_state": 11}, {}, 105.0)
+    # A poll without evse_state neither opens nor closes anything.
+    journal.async_update({}, {}, 107.0)
+    assert journal.active is not None
+    assert journal.active["power_stat"] == POWER["power_stat"]
+
+    # Going straight to another fault closes the first one.
+    journal.async_update({"evse_state": 10}, {}, 110.0)
+    journal.async_update({"evse_state": 2}, {}, 130.5)
+    assert journal.active is None
+    assert [
+        (e["evse_state"], e["start"], e["duration"]) for e in journal.as_list()
+    ] == [("over_current", 100.0, 10.0), ("over_temperature", 110.0, 20.5)]
+
+
+async def test_journal_is_bounded_and_persisted(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": [
+            {
+                "code": 6,
+                "evse_state": "gfci_fault",
+                "start": 1.0,
+                "end": 2.0,
+                "duration": 1.0,
+                "power_stat": {},
+            }
+        ],
+    }
+    journal = FaultJournal(hass, "VC-1")
+    await journal.async_load()
+    assert len(journal.entries) == 1
+
+    for tick in range(FAULT_JOURNAL_SIZE):
+        journal.async_update({"evse_state": 7}, {}, 10.0 + 2 * tick)
+        journal.async_update({"evse_state": 1}, {}, 11.0 + 2 * tick)
+    assert len(journal.entries) == FAULT_JOURNAL_SIZE
+    assert journal.entries[0]["evse_state"] == "no_ground"
+
+    # Writes are coalesced into one delayed save.
+    assert hass_storage[STORAGE_KEY]["data"][0]["code"] == 6
+    freezer.tick(timedelta(seconds=FAULT_JOURNAL_SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert len(hass_storage[STORAGE_KEY]["data"]) == FAULT_JOURNAL_SIZE
+
+
+async def test_active_fault_polls_faster(hass: HomeAssistant) -> None:
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "192.0.2.10"})
+    entry.add_to_hass(hass)
+    coordinator = VoltieChargerCoordinator(hass, entry, MagicMock(capture=None))
+    coordinator.faults = FaultJournal(hass, "VC-1")
+
+    now = time.monotonic()
+    coordinator.data = coordinator._process({"evse_state": 8}, now, {}, None, {})
+    assert coordinator.update_interval == FAULT_SCAN_INTERVAL
+    coordinator.data = coordinator._process({"evse_state": 1}, now, {}, None, {})
+    assert coordinator.faults.active is None
+    # Once the burst after the clearing transition is over.
+    coordinator._burst_until = 0.0
+    assert coordinator._poll_interval() == DEFAULT_SCAN_INTERVAL
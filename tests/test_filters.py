@@ -0,0 +1,66 @@
+"""Tests for sensor state-write filters."""
+from __future__ import annotations
+
+from custom_components.voltie_charger.const import (
+    AGGREGATE_MAX,
+    CONF_DEADBAND,
+    CONF_DEADBAND_RELATIVE,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_WINDOW,
+)
+from custom_components.voltie_charger.filters import SampleFilter, WriteFilter
+
+
+def test_from_options_off_by_default() -> None:
+    assert WriteFilter.from_options({}) is None
+    assert WriteFilter.from_options({CONF_WINDOW: 1, CONF_DEADBAND: 0}) is None
+
+
+def test_from_options_converts_percent() -> None:
+    write_filter = WriteFilter.from_options(
+        {CONF_DEADBAND_RELATIVE: 5, CONF_MIN_WRITE_INTERVAL: 30, CONF_WINDOW: 3}
+    )
+    assert write_filter == WriteFilter(
+        deadband_relative=0.05, min_interval=30.0, window=3
+    )
+
+
+def test_absolute_deadband() -> None:
+    sample_filter = SampleFilter(WriteFilter(deadband=1.0))
+    assert sample_filter.update(230.0, 0)
+    assert not sample_filter.update(230.9, 1)
+    assert sample_filter.update(231.5, 2)
+    assert sample_filter.value == 231.5
+
+
+def test_relative_deadband_uses_last_written_value() -> None:
+    sample_filter = SampleFilter(WriteFilter(deadband_relative=0.1))
+    assert sample_filter.update(10.0, 0)
+    assert not sample_filter.update(10.9, 1)
+    assert sample_filter.update(11.5, 2)
+
+
+def test_min_interval() -> None:
+    sample_filter = SampleFilter(WriteFilter(min_interval=10))
+    assert sample_filter.update(1.0, 0)
+    assert not sample_filter.update(2.0, 5)
+    assert sample_filter.update(2.0, 10)
+
+
+def test_window_aggregates() -> None:
+    sample_filter = SampleFilter(WriteFilter(window=3, aggregate=AGGREGATE_MAX))
+    # The first value is written straight away.
+    assert sample_filter.update(1.0, 0)
+    assert not sample_filter.update(5.0, 1)
+    assert not sample_filter.update(2.0, 2)
+    assert sample_filter.update(3.0, 3)
+    assert sample_filter.value == 5.0
+
+
+def test_unavailable_written_once() -> None:
+    sample_filter = SampleFilter(WriteFilter(deadband=1.0))
+    assert sample_filter.update(1.0, 0)
+    assert sample_filter.update(None, 1)
+    assert not sample_filter.update(None, 2)
+    assert not sample_filter.update(True, 3)
+    assert sample_filter.update(1.0, 4)
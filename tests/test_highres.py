@@ -0,0 +1,50 @@
+"""Tests for on-demand high-resolution sampling."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.voltie_charger.client import VoltieChargerConnectionError
+from custom_components.voltie_charger.highres import HighResSampler
+
+POWER = {"power_stat": {"current1": 6.0}}
+
+
+def _client(*power: object) -> MagicMock:
+    client = MagicMock()
+    client.async_get_power = AsyncMock(side_effect=list(power))
+    client.async_get_status = AsyncMock(return_value={"charge_power": 1380})
+    return client
+
+
+async def test_samples_every_tick() -> None:
+    client = _client(POWER, VoltieChargerConnectionError("reset"), POWER, POWER)
+    sampler = HighResSampler(client, 0.01, 0.03, include_status=True)
+    await sampler.async_run()
+
+    report = sampler.as_dict()
+    assert (report["requests"], report["failures"], report["running"]) == (
+        8,
+        1,
+        False,
+    )
+    # The tick whose /power failed still has its /status sample.
+    assert report["samples"] == 4
+    samples = sampler.samples.since(0, ["current1", "charge_power"])
+    assert samples["current1"] == [6.0, None, 6.0, 6.0]
+    assert samples["charge_power"] == [1380] * 4
+
+
+async def test_overrun_ticks_are_skipped() -> None:
+    async def _slow_power() -> dict:
+        await asyncio.sleep(0.035)
+        return POWER
+
+    client = MagicMock()
+    client.async_get_power = AsyncMock(side_effect=_slow_power)
+    sampler = HighResSampler(client, 0.01, 0.1)
+    await sampler.async_run()
+
+    assert sampler.skipped > 0
+    assert sampler.requests + sampler.skipped == 11
+    assert sampler.samples.capacity == 11
@@ -0,0 +1,80 @@
+"""Tests for the poll performance records shown in diagnostics."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from custom_components.voltie_charger import VoltieChargerCoordinator
+from custom_components.voltie_charger.client import (
+    VoltieChargerConnectionError,
+    VoltieChargerRejectedError,
+)
+from custom_components.voltie_charger.const import DOMAIN
+from custom_components.voltie_charger.perf import PollStats
+
+
+def test_history_is_bounded() -> None:
+    stats = PollStats(size=3)
+    for n in range(5):
+        stats.begin()
+        stats.record_request("/status", n, 0, 100, True)
+        stats.end(ok=True)
+    assert [c["requests"]["/status"]["latency_ms"] for c in stats.cycles] == [
+        2,
+        3,
+        4,
+    ]
+
+
+def test_fan_out_only_recorded_for_successful_cycle() -> None:
+    stats = PollStats()
+    stats.begin()
+    stats.end(ok=False)
+    stats.record_fan_out(1.234, 5)
+    assert stats.cycles[-1]["fan_out_ms"] is None
+
+    stats.begin()
+    stats.record_carry_forward(["mains_voltage"])
+    stats.end(ok=True)
+    stats.record_fan_out(1.234, 5)
+    # A second fan-out (e.g. a push) doesn't overwrite the poll's.
+    stats.record_fan_out(9.0, 50)
+    report = stats.as_dict()
+    cycle = report["cycles"][-1]
+    assert (cycle["fan_out_ms"], cycle["state_writes"]) == (1.23, 5)
+    assert report["carried_forward"] == {"mains_voltage": 1}
+
+
+async def test_coordinator_records_requests(hass: HomeAssistant) -> None:
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "192.0.2.10"})
+    entry.add_to_hass(hass)
+    client = MagicMock(capture=None, response_bytes={"status": 120, "power": 80})
+    client.async_get_status = AsyncMock(return_value={"charger_id": "VC1"})
+    client.async_get_power = AsyncMock(
+        side_effect=[VoltieChargerConnectionError("reset"), {"power_stat": {}}]
+    )
+    client.async_get_config = AsyncMock(
+        side_effect=VoltieChargerRejectedError("unsupported")
+    )
+    coordinator = VoltieChargerCoordinator(hass, entry, client)
+
+    with patch("custom_components.voltie_charger.UPDATE_RETRY_BACKOFF_S", 0):
+        await coordinator.async_refresh()
+
+    report = coordinator.performance_report()
+    (cycle,) = report["cycles"]
+    assert cycle["ok"] is True
+    assert {
+        label: (request["retries"], request["bytes"], request["ok"])
+        for label, request in cycle["requests"].items()
+    } == {
+        "/status": (0, 120, True),
+        "/power": (1, 80, True),
+        "/config": (1, None, False),
+    }
+    assert report["config_latch"] == {"available": False, "polls_since_failure": 0}
+    await coordinator.async_shutdown()
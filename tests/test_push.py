@@ -0,0 +1,97 @@
+"""Tests for webhook push ingestion."""
+from __future__ import annotations
+
+from http import HTTPStatus
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.voltie_charger import VoltieChargerCoordinator
+from custom_components.voltie_charger.const import (
+    DATA_POWER,
+    DATA_STATUS,
+    DOMAIN,
+    PUSH_HEARTBEAT_INTERVAL,
+)
+from custom_components.voltie_charger.push import async_register_push, split_payload
+
+STATUS = {"charger_id": "VC1", "is_car_connected": True, "cdr": {"chg_energy": 1.0}}
+POWER = {"power_stat": {"voltage1": 230.0, "current1": 6.0}}
+
+
+@pytest.mark.parametrize(
+    ("body", "expected"),
+    [
+        ({"status": STATUS, "power": POWER}, (STATUS, POWER)),
+        ({"power": POWER}, (None, POWER)),
+        (POWER, (None, POWER)),
+        (STATUS, (STATUS, None)),
+    ],
+)
+def test_split_payload(body: dict, expected: tuple) -> None:
+    assert split_payload(body) == expected
+
+
+@pytest.mark.parametrize("body", [{}, {"status": STATUS, "power": [1]}])
+def test_split_payload_rejects(body: dict) -> None:
+    with pytest.raises(ValueError):
+        split_payload(body)
+
+
+def _coordinator(hass: HomeAssistant) -> VoltieChargerCoordinator:
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "192.0.2.10"})
+    entry.add_to_hass(hass)
+    coordinator = VoltieChargerCoordinator(hass, entry, MagicMock(capture=None))
+    coordinator.charger_id = "VC1"
+    coordinator.data = {DATA_STATUS: STATUS, DATA_POWER: POWER}
+    return coordinator
+
+
+async def test_push_merges_without_rescheduling(hass: HomeAssistant) -> None:
+    coordinator = _coordinator(hass)
+    updates: list[dict] = []
+    coordinator.async_add_listener(lambda: updates.append(coordinator.data))
+    scheduled = coordinator._unsub_refresh
+
+    coordinator.async_ingest_push(
+        {"is_car_connected": False}, {"power_stat": {"current1": 0.0}}
+    )
+    assert len(updates) == 1
+    # Partial pushes keep what they didn't carry.
+    assert coordinator.data[DATA_STATUS]["cdr"] == STATUS["cdr"]
+    assert coordinator.data[DATA_POWER]["power_stat"] == {
+        "voltage1": 230.0,
+        "current1": 0.0,
+    }
+    # The heartbeat poll stays scheduled rather than being pushed back.
+    assert coordinator._unsub_refresh is scheduled
+    assert coordinator.pushing
+    assert coordinator.update_interval == PUSH_HEARTBEAT_INTERVAL
+    await coordinator.async_shutdown()
+
+
+async def test_webhook(
+    hass: HomeAssistant, hass_client_no_auth: ClientSessionGenerator
+) -> None:
+    assert await async_setup_component(hass, "webhook", {})
+    coordinator = _coordinator(hass)
+    unregister = async_register_push(hass, coordinator, "hook")
+    client = await hass_client_no_auth()
+
+    response = await client.post("/api/webhook/hook", json={"charger_id": "VC2"})
+    assert response.status == HTTPStatus.BAD_REQUEST
+    response = await client.post("/api/webhook/hook", data=b"not json")
+    assert response.status == HTTPStatus.BAD_REQUEST
+    assert coordinator.pushes == 0
+
+    response = await client.post("/api/webhook/hook", json={"power": POWER})
+    assert response.status == HTTPStatus.NO_CONTENT
+    assert coordinator.pushes == 1
+    unregister()
+    await coordinator.async_shutdown()
@@ -0,0 +1,45 @@
+"""Tests for rolling-window statistics."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from custom_components.voltie_charger.rolling import RollingStats, RollingWindow
+
+
+def test_window_evicts_old_samples() -> None:
+    window = RollingWindow(60)
+    window.add(0, 5.0)
+    window.add(30, 1.0)
+    window.add(45, 3.0)
+    assert window.snapshot() == {"mean": 3.0, "min": 1.0, "max": 5.0}
+    window.add(61, None)
+    assert window.snapshot() == {"mean": 2.0, "min": 1.0, "max": 3.0}
+    window.add(200, None)
+    assert window.snapshot() == {"mean": None, "min": None, "max": None}
+
+
+def test_window_matches_brute_force() -> None:
+    rng = random.Random(1)
+    window = RollingWindow(60)
+    samples: list[tuple[float, float]] = []
+    now = 0.0
+    for _ in range(500):
+        now += rng.uniform(1, 10)
+        value = rng.uniform(0, 32)
+        samples.append((now, value))
+        window.add(now, value)
+        live = [v for t, v in samples if t > now - 60]
+        snapshot = window.snapshot()
+        assert snapshot["mean"] == pytest.approx(sum(live) / len(live))
+        assert (snapshot["min"], snapshot["max"]) == (min(live), max(live))
+
+
+def test_stats_keys() -> None:
+    stats = RollingStats(("charge_power",), (1, 5))
+    stats.add(0, {"charge_power": 7.2})
+    assert stats.snapshot() == {
+        "charge_power_1m": {"mean": 7.2, "min": 7.2, "max": 7.2},
+        "charge_power_5m": {"mean": 7.2, "min": 7.2, "max": 7.2},
+    }
@@ -0,0 +1,37 @@
+"""Tests for the in-memory sample ring."""
+from __future__ import annotations
+
+from custom_components.voltie_charger.samples import SAMPLE_FIELDS, SampleRing
+
+
+def test_ring_keeps_the_newest_samples() -> None:
+    ring = SampleRing(3, ("charge_power",))
+    for second in range(5):
+        ring.append(float(second), {"charge_power": second * 1.5})
+    assert len(ring) == 3
+    assert ring.since(0) == {
+        "timestamps": [2.0, 3.0, 4.0],
+        "charge_power": [3.0, 4.5, 6.0],
+    }
+
+
+def test_since_filters_by_time_and_field() -> None:
+    ring = SampleRing(10)
+    ring.append(1.0, {"charge_power": 1.0, "voltage1": 230})
+    ring.append(2.0, {"charge_power": None, "voltage1": True})
+    result = ring.since(1.5, ["charge_power", "voltage1", "unknown"])
+    # Missing and non-numeric values come back as None.
+    assert result == {
+        "timestamps": [2.0],
+        "charge_power": [None],
+        "voltage1": [None],
+    }
+
+
+def test_memory_is_fixed() -> None:
+    ring = SampleRing(100)
+    size = ring.nbytes
+    assert size == 8 * 100 * (len(SAMPLE_FIELDS) + 1)
+    for second in range(1000):
+        ring.append(float(second), {"charge_power": 1.0})
+    assert ring.nbytes == size
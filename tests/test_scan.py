@@ -0,0 +1,78 @@
+"""Tests for the subnet scan used when mDNS is unavailable."""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.voltie_charger import scan
+from custom_components.voltie_charger.client import (
+    VoltieChargerAuthError,
+    VoltieChargerConnectionError,
+)
+
+NETWORK = ipaddress.IPv4Network("192.0.2.0/29")
+STATUS = {
+    "192.0.2.1": {"charger_id": "VC1"},
+    "192.0.2.2": VoltieChargerAuthError("401"),
+    "192.0.2.3": VoltieChargerConnectionError("reset"),
+    # The same charger reachable on a second address.
+    "192.0.2.4": {"charger_id": "VC1"},
+    "192.0.2.5": {"charger_id": "VC2"},
+}
+
+
+def _client(session: object, host: str, username: object, password: object):
+    result = STATUS[host]
+    client = MagicMock()
+    client.async_get_status = AsyncMock(
+        side_effect=result if isinstance(result, Exception) else None,
+        return_value=result,
+    )
+    return client
+
+
+async def test_scan_probes_only_open_ports() -> None:
+    probed: list[str] = []
+
+    async def _port_open(host: str, semaphore: asyncio.Semaphore) -> bool:
+        probed.append(host)
+        return host in STATUS
+
+    with (
+        patch.object(scan, "_port_open", _port_open),
+        patch.object(scan, "VoltieChargerClient", side_effect=_client) as client,
+    ):
+        result = await scan.async_scan_network(MagicMock(), NETWORK, None, None)
+
+    assert len(probed) == NETWORK.num_addresses - 2
+    assert sorted(call.args[1] for call in client.call_args_list) == sorted(STATUS)
+    assert result == scan.ScanResult(
+        chargers={"VC1": "192.0.2.1", "VC2": "192.0.2.5"},
+        auth_required=["192.0.2.2"],
+    )
+
+
+async def test_port_open_bounded_by_semaphore_and_timeout() -> None:
+    in_flight = peak = 0
+
+    async def _connect(host: str, port: int):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        if host.endswith(".1"):
+            raise ConnectionRefusedError
+        if host.endswith(".2"):
+            raise asyncio.TimeoutError
+        return MagicMock(), MagicMock()
+
+    semaphore = asyncio.Semaphore(2)
+    hosts = [f"192.0.2.{n}" for n in range(1, 7)]
+    with patch.object(scan.asyncio, "open_connection", _connect):
+        results = await asyncio.gather(
+            *(scan._port_open(host, semaphore) for host in hosts)
+        )
+    assert results == [False, False, True, True, True, True]
+    assert peak == 2
@@ -0,0 +1,199 @@
+"""Tests for electricity prices and the price-aware charging scheduler."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.voltie_charger.const import (
+    CONF_DEPARTURE,
+    CONF_ENERGY_TARGET,
+    CONF_PRICE_ENTITY,
+    CONF_TOU_TABLE,
+    DATA_CONFIG,
+    DATA_STATUS,
+)
+from custom_components.voltie_charger.scheduler import (
+    ChargeScheduler,
+    cheapest_windows,
+)
+from custom_components.voltie_charger.tariff import (
+    PriceSlot,
+    Tariff,
+    parse_tou_table,
+)
+
+PRICE = "sensor.electricity_price"
+TOU = "00:00 0.30\n01:00 0.10\n03:00 0.30\n"
+START = datetime(2026, 1, 5, tzinfo=dt_util.UTC)
+
+
+def _at(hours: float) -> datetime:
+    return START + timedelta(hours=hours)
+
+
+def test_parse_tou_table() -> None:
+    assert parse_tou_table("  \n22:00 0.1\n07:00 0.3\n") == [
+        (time(7), 0.3),
+        (time(22), 0.1),
+    ]
+    for bad in ("", "7 0.3", "07:00", "07:00 cheap"):
+        with pytest.raises(ValueError):
+            parse_tou_table(bad)
+
+
+async def test_tou_slots_wrap_midnight(hass: HomeAssistant) -> None:
+    await hass.config.async_set_time_zone("UTC")
+    tariff = Tariff(hass, {CONF_TOU_TABLE: "22:00 0.1\n07:00 0.3"})
+    assert tariff.configured
+    assert tariff.slots(_at(6), _at(23)) == [
+        PriceSlot(_at(-2), _at(7), 0.1),
+        PriceSlot(_at(7), _at(22), 0.3),
+        PriceSlot(_at(22), _at(31), 0.1),
+    ]
+    assert tariff.price_at(_at(23.5)) == 0.1
+    assert tariff.price_at(_at(12)) == 0.3
+
+
+async def test_price_entity_series(hass: HomeAssistant) -> None:
+    changes = []
+    tariff = Tariff(hass, {CONF_PRICE_ENTITY: PRICE, CONF_TOU_TABLE: TOU})
+    tariff.async_add_listener(lambda: changes.append(True))
+    unsub = tariff.async_start()
+    assert tariff.price_at(_at(0)) is None
+
+    series = [
+        {"start": _at(0).isoformat(), "value": 0.2},
+        {"start": _at(1).isoformat(), "end": _at(1.5).isoformat(), "price": 0.1},
+        {"startsAt": _at(3).isoformat(), "total": 0.4},
+        {"start": "not a date", "value": 1},
+    ]
+    hass.states.async_set(PRICE, "0.25", {"raw_today": series})
+    await hass.async_block_till_done()
+    assert changes == [True]
+    # Missing ends run to the next start, or one hour for the last slot.
+    assert tariff.slots(_at(0), _at(5)) == [
+        PriceSlot(_at(0), _at(1), 0.2),
+        PriceSlot(_at(1), _at(1.5), 0.1),
+        PriceSlot(_at(3), _at(4), 0.4),
+    ]
+    # Gaps in the series fall back to the entity's state.
+    assert tariff.price_at(_at(2)) == 0.25
+
+    # A new state with the same series doesn't notify.
+    hass.states.async_set(PRICE, "0.3", {"raw_today": series})
+    await hass.async_block_till_done()
+    assert changes == [True]
+    assert tariff.price_at(_at(2)) == 0.3
+    unsub()
+
+
+def test_cheapest_windows_trims_and_merges() -> None:
+    slots = [
+        PriceSlot(_at(0), _at(1), 0.3),
+        PriceSlot(_at(1), _at(2), 0.1),
+        PriceSlot(_at(2), _at(3), 0.2),
+        PriceSlot(_at(3), _at(4), 0.05),
+    ]
+    # 2.5 h at 4 kW: the 0.05 and 0.1 hours, then half of the 0.2 hour.
+    assert cheapest_windows(slots, _at(0), _at(4), 10, 4) == [
+        (_at(1), _at(2.5)),
+        (_at(3), _at(4)),
+    ]
+    # Departure cuts the cheapest slot; "now" cuts the first.
+    assert cheapest_windows(slots, _at(0.5), _at(3.5), 100, 4) == [
+        (_at(0.5), _at(3.5)),
+    ]
+
+
+def _scheduler(hass: HomeAssistant, connected: bool = True):
+    coordinator = MagicMock()
+    coordinator.data = {
+        DATA_STATUS: {
+            "is_car_connected": connected,
+            "charge_enabled": False,
+            "phases": 1,
+            "mains_voltage": 230,
+            "cdr": {"chg_energy": 0.0},
+        },
+        DATA_CONFIG: {"conf_current_limit": 16},
+    }
+    coordinator.async_add_listener.return_value = lambda: None
+    coordinator.async_request_refresh = AsyncMock()
+    coordinator.client.async_start = AsyncMock()
+    coordinator.client.async_stop = AsyncMock()
+    coordinator.entry.async_create_background_task = (
+        lambda hass, target, name: hass.async_create_task(target)
+    )
+    tariff = Tariff(hass, {CONF_TOU_TABLE: TOU})
+    # 16 A at 230 V is 3.68 kW: two hours for 7.36 kWh.
+    options = {CONF_DEPARTURE: "07:00", CONF_ENERGY_TARGET: 7.36}
+    return coordinator, ChargeScheduler(hass, coordinator, tariff, options)
+
+
+async def test_scheduler_plans_and_fires_timers(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    await hass.config.async_set_time_zone("UTC")
+    freezer.move_to(_at(0.5))
+    coordinator, scheduler = _scheduler(hass)
+    stop = scheduler.async_start()
+
+    assert scheduler.windows == [(_at(1), _at(3))]
+    assert scheduler.as_dict()["departure"] == _at(7)
+    assert scheduler.next_start == _at(1)
+    assert scheduler.as_dict()["timers"] == 2
+    coordinator.client.async_start.assert_not_awaited()
+
+    freezer.move_to(_at(1))
+    async_fire_time_changed(hass, _at(1))
+    await hass.async_block_till_done()
+    coordinator.client.async_start.assert_awaited_once()
+    assert scheduler.as_dict()["timers"] == 1
+
+    freezer.move_to(_at(3))
+    async_fire_time_changed(hass, _at(3))
+    await hass.async_block_till_done()
+    coordinator.client.async_stop.assert_awaited_once()
+    assert scheduler.as_dict()["timers"] == 0
+    stop()
+
+
+async def test_scheduler_replans_on_plug_and_drift(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    await hass.config.async_set_time_zone("UTC")
+    freezer.move_to(_at(1.5))
+    coordinator, scheduler = _scheduler(hass, connected=False)
+    stop = scheduler.async_start()
+    assert scheduler.windows == []
+    (update,) = (c.args[0] for c in coordinator.async_add_listener.call_args_list)
+
+    # Plugged in inside the cheap window: charging starts right away.
+    status = coordinator.data[DATA_STATUS]
+    status["is_car_connected"] = True
+    update()
+    await hass.async_block_till_done()
+    # 1.5 h of cheap time left; the rest comes from the earliest 0.30 slot.
+    assert scheduler.windows == [(_at(1.5), _at(3.5))]
+    coordinator.client.async_start.assert_awaited_once()
+    plans = scheduler.plans
+
+    # Within tolerance of the plan: no replan.
+    freezer.move_to(_at(2))
+    status["cdr"]["chg_energy"] = 1.6
+    update()
+    assert scheduler.plans == plans
+
+    # The car took much less than planned: the plan is redone.
+    status["cdr"]["chg_energy"] = 0.5
+    update()
+    assert scheduler.plans == plans + 1
+    stop()
+    assert scheduler.as_dict()["timers"] == 0
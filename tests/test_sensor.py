@@ -0,0 +1,108 @@
+"""Tests for the compact per-phase sensor mode."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_HOST, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from custom_components.voltie_charger import VoltieChargerCoordinator
+from custom_components.voltie_charger.const import (
+    CONF_COMPACT_ENTITIES,
+    DATA_POWER,
+    DOMAIN,
+)
+from custom_components.voltie_charger.entity import _unique_id
+from custom_components.voltie_charger.sensor import (
+    ATTR_PER_PHASE,
+    COMPACT_PHASE_SENSORS,
+    PER_PHASE_SENSORS,
+    VoltieChargerPhaseSensor,
+    async_setup_entry,
+)
+
+COMPACT = {description.key: description for description in COMPACT_PHASE_SENSORS}
+DATA = {
+    DATA_POWER: {
+        "power_stat": {
+            "voltage1": 230.0,
+            "voltage2": 0,
+            "voltage3": 232.0,
+            "current1": 6.0,
+            "current2": 7.5,
+            "current3": None,
+            "power1": 1.38,
+            "power2": 1.5,
+        }
+    }
+}
+
+
+def test_compact_values() -> None:
+    # Dead phases (0 V) are left out of the mean voltage.
+    assert COMPACT["phase_voltage"].value_fn(DATA) == 231.0
+    assert COMPACT["phase_current"].value_fn(DATA) == 7.5
+    assert COMPACT["phase_power"].value_fn(DATA) == 2.88
+    assert COMPACT["dlm_phase_current"].value_fn(DATA) is None
+    assert COMPACT["phase_current"].attributes_fn(DATA) == {
+        ATTR_PER_PHASE: [6.0, 7.5, None]
+    }
+
+
+async def _setup(hass: HomeAssistant, compact: bool) -> tuple[list, set[str]]:
+    """Set up sensors with one stale registry entry of each mode."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "192.0.2.10"},
+        options={CONF_COMPACT_ENTITIES: compact},
+    )
+    entry.add_to_hass(hass)
+    entry.runtime_data = coordinator = VoltieChargerCoordinator(
+        hass, entry, MagicMock(capture=None)
+    )
+    coordinator.charger_id = "VC1"
+    coordinator.device_info = DeviceInfo(identifiers={(DOMAIN, "VC1")})
+    ent_reg = er.async_get(hass)
+    for key in ("voltage_l1", "phase_voltage"):
+        ent_reg.async_get_or_create(
+            Platform.SENSOR,
+            DOMAIN,
+            _unique_id(key, entry.entry_id),
+            config_entry=entry,
+        )
+    added: list = []
+    await async_setup_entry(hass, entry, added.extend)
+    remaining = {
+        key
+        for key in ("voltage_l1", "phase_voltage")
+        if ent_reg.async_get_entity_id(
+            Platform.SENSOR, DOMAIN, _unique_id(key, entry.entry_id)
+        )
+    }
+    await coordinator.async_shutdown()
+    return added, remaining
+
+
+async def test_compact_mode_replaces_per_phase(hass: HomeAssistant) -> None:
+    added, remaining = await _setup(hass, compact=True)
+    keys = {entity.entity_description.key for entity in added}
+    assert "phase_voltage" in keys
+    assert keys.isdisjoint(d.key for d in PER_PHASE_SENSORS)
+    assert all(
+        isinstance(entity, VoltieChargerPhaseSensor)
+        for entity in added
+        if entity.entity_description.key in COMPACT
+    )
+    assert remaining == {"phase_voltage"}
+
+
+async def test_per_phase_mode_removes_compact(hass: HomeAssistant) -> None:
+    added, remaining = await _setup(hass, compact=False)
+    keys = {entity.entity_description.key for entity in added}
+    assert "voltage_l1" in keys
+    assert keys.isdisjoint(COMPACT)
+    assert remaining == {"voltage_l1"}
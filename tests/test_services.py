@@ -0,0 +1,121 @@
+"""Tests for the fleet services that act on many chargers at once."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.voltie_charger import services
+from custom_components.voltie_charger.client import (
+    VoltieChargerConnectionError,
+    VoltieChargerRejectedError,
+)
+from custom_components.voltie_charger.const import DOMAIN
+
+
+def _add_chargers(hass: HomeAssistant, count: int) -> dict[str, MagicMock]:
+    """Loaded entries with mock coordinators, by device id."""
+    dev_reg = dr.async_get(hass)
+    coordinators: dict[str, MagicMock] = {}
+    for n in range(count):
+        entry = MockConfigEntry(
+            domain=DOMAIN, unique_id=f"VC{n}", state=ConfigEntryState.LOADED
+        )
+        entry.add_to_hass(hass)
+        coordinator = MagicMock(charger_id=f"VC{n}")
+        coordinator.async_push_config = AsyncMock()
+        coordinator.async_request_refresh = AsyncMock()
+        coordinator.client.async_start = AsyncMock()
+        entry.runtime_data = coordinator
+        device = dev_reg.async_get_or_create(
+            config_entry_id=entry.entry_id, identifiers={(DOMAIN, f"VC{n}")}
+        )
+        coordinators[device.id] = coordinator
+    services.async_setup_services(hass)
+    return coordinators
+
+
+async def test_set_current_limit_on_all(hass: HomeAssistant) -> None:
+    coordinators = _add_chargers(hass, 3)
+    response = await hass.services.async_call(
+        DOMAIN,
+        services.SERVICE_SET_CURRENT_LIMIT,
+        {ATTR_DEVICE_ID: "all", "current_limit": 10},
+        blocking=True,
+        return_response=True,
+    )
+    assert set(response) == set(coordinators)
+    assert all(result["success"] for result in response.values())
+    for coordinator in coordinators.values():
+        coordinator.async_push_config.assert_awaited_once_with(
+            {"conf_current_limit": 10}
+        )
+
+
+async def test_partial_failures_reported(hass: HomeAssistant) -> None:
+    coordinators = _add_chargers(hass, 3)
+    rejected, offline, ok = coordinators
+    coordinators[rejected].async_push_config.side_effect = (
+        VoltieChargerRejectedError("1 of 2 values rejected", accepted=1)
+    )
+    coordinators[offline].async_push_config.side_effect = (
+        VoltieChargerConnectionError("timeout")
+    )
+    call = {
+        ATTR_DEVICE_ID: [rejected, offline, ok],
+        "config": {"conf_buzzer_enabled": False, "conf_current_limit": 8},
+    }
+    response = await hass.services.async_call(
+        DOMAIN, services.SERVICE_SET_CONFIG, call, blocking=True, return_response=True
+    )
+    assert response[rejected]["accepted"] == 1
+    assert response[offline]["error"] == "timeout"
+    assert [response[d]["success"] for d in (rejected, offline, ok)] == [
+        False,
+        False,
+        True,
+    ]
+
+    # Without a response to report in, any failure fails the call.
+    with pytest.raises(HomeAssistantError, match="2 of 3 chargers failed"):
+        await hass.services.async_call(
+            DOMAIN, services.SERVICE_SET_CONFIG, call, blocking=True
+        )
+
+
+async def test_targets_must_be_loaded_chargers(hass: HomeAssistant) -> None:
+    _add_chargers(hass, 1)
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, services.SERVICE_START, {ATTR_DEVICE_ID: ["nope"]}, blocking=True
+        )
+
+
+async def test_concurrency_is_bounded(hass: HomeAssistant) -> None:
+    coordinators = _add_chargers(hass, 5)
+    in_flight = peak = 0
+
+    async def _start() -> None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+
+    for coordinator in coordinators.values():
+        coordinator.client.async_start = AsyncMock(side_effect=_start)
+    with patch.object(services, "FAN_OUT_CONCURRENCY", 2):
+        await hass.services.async_call(
+            DOMAIN, services.SERVICE_START, {ATTR_DEVICE_ID: "all"}, blocking=True
+        )
+    assert peak == 2
+    for coordinator in coordinators.values():
+        coordinator.async_request_refresh.assert_awaited_once()
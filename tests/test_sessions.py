@@ -0,0 +1,145 @@
+"""Tests for charging-session tracking and the session store."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from custom_components.voltie_charger.sessions import (
+    ChargingSession,
+    SessionStore,
+    SessionTracker,
+)
+
+START = 1_700_000_000
+
+
+def _status(
+    connected: object, energy: float | None, marker: int = START, **cdr: object
+) -> dict:
+    return {
+        "is_car_connected": connected,
+        "cdr": {"s_start": marker, "chg_energy": energy, **cdr},
+    }
+
+
+def test_session_closes_on_unplug() -> None:
+    tracker = SessionTracker("VC1")
+    assert tracker.update(_status(True, 0.0, idtag="TAG"), START) is None
+    assert tracker.update(_status(True, 2.5, chg_time=600), START + 600) is None
+    completed = tracker.update(_status(False, 2.5), START + 900)
+
+    assert completed is not None
+    assert (completed.idtag, completed.energy, completed.charge_time) == (
+        "TAG",
+        2.5,
+        600,
+    )
+    assert (completed.started, completed.ended) == (START, START + 900)
+    assert tracker.current is None
+    # The stale cdr left after the unplug doesn't reopen a session.
+    assert tracker.update(_status(True, 2.5), START + 1000) is None
+    assert tracker.current is None
+
+
+@pytest.mark.parametrize("unplugged", [False, 0])
+def test_session_closes_on_falsy_connected(unplugged: object) -> None:
+    tracker = SessionTracker("VC1")
+    tracker.update(_status(1, 1.0), START)
+    assert tracker.update(_status(unplugged, 1.0), START + 60) is not None
+
+
+def test_unknown_connected_keeps_session_open() -> None:
+    tracker = SessionTracker("VC1")
+    tracker.update(_status(True, 1.0), START)
+    assert tracker.update(_status(None, 1.5), START + 60) is None
+    assert tracker.current is not None
+    assert tracker.current.energy == 1.5
+
+
+def test_counter_reset_starts_a_new_session() -> None:
+    tracker = SessionTracker("VC1")
+    tracker.update(_status(True, 4.0), START)
+    completed = tracker.update(_status(True, 0.2, START + 3600), START + 3600)
+    assert completed is not None
+    assert completed.energy == 4.0
+    assert tracker.current is not None
+    assert tracker.current.started == START + 3600
+
+
+def test_hourly_buckets() -> None:
+    tracker = SessionTracker("VC1")
+    tracker.update(_status(True, 0.0), START - START % 3600 + 3000)
+    tracker.update(_status(True, 1.0), START - START % 3600 + 3500)
+    tracker.update(_status(True, 3.0), START - START % 3600 + 3700)
+    hour = START - START % 3600
+    assert tracker.current is not None
+    assert tracker.current.hourly == {hour: 1.0, hour + 3600: 2.0}
+
+
+def test_cost_is_incremental() -> None:
+    tracker = SessionTracker("VC1")
+    # Energy already on the counter when first seen isn't priced.
+    tracker.update(_status(True, 2.0), START, price=0.5)
+    assert tracker.current is not None
+    assert tracker.current.cost is None
+    # No price known for this tick: the energy counts, the cost doesn't.
+    tracker.update(_status(True, 3.0), START + 60)
+    assert tracker.current.cost is None
+    tracker.update(_status(True, 4.0), START + 120, price=0.5)
+    tracker.update(_status(True, 5.0), START + 180, price=0.2)
+    assert tracker.current.cost == pytest.approx(0.7)
+
+    completed = tracker.update(_status(False, 5.5), START + 240, price=1.0)
+    assert completed is not None
+    assert completed.cost == pytest.approx(1.2)
+    # A second session adds to the lifetime total.
+    tracker.update(_status(True, 0.0, START + 600), START + 600, price=1.0)
+    tracker.update(_status(True, 1.0, START + 600), START + 660, price=1.0)
+    assert tracker.cost_total == pytest.approx(2.2)
+
+
+def _session(charger_id: str, idtag: str, started: float, energy: float):
+    return ChargingSession(
+        charger_id=charger_id,
+        idtag=idtag,
+        started=started,
+        ended=started + 3600,
+        energy=energy,
+        cost=energy * 0.3,
+    )
+
+
+def test_store_monthly_summary(tmp_path: Path) -> None:
+    store = SessionStore(str(tmp_path / "sessions.db"))
+    # 2023-11-14 and 2023-12-14 (UTC).
+    store.add(_session("VC1", "A", 1_699_920_000, 10.0))
+    store.add(_session("VC1", "A", 1_699_930_000, 5.0))
+    store.add(_session("VC2", "B", 1_702_512_000, 7.0))
+
+    summary = store.monthly_summary(0, 2_000_000_000)
+    assert summary == [
+        {"idtag": "A", "month": "2023-11", "energy_kwh": 15.0, "cost": 4.5,
+         "sessions": 2},
+        {"idtag": "B", "month": "2023-12", "energy_kwh": 7.0, "cost": 2.1,
+         "sessions": 1},
+    ]
+    assert store.monthly_summary(0, 2_000_000_000, charger_ids=["VC2"])[0][
+        "idtag"
+    ] == "B"
+    assert store.monthly_summary(0, 2_000_000_000, idtag="A")[0]["sessions"] == 2
+    store.close()
+
+
+def test_store_import_queue(tmp_path: Path) -> None:
+    store = SessionStore(str(tmp_path / "sessions.db"))
+    session = _session("VC1", "A", START, 1.0)
+    session.hourly = {float(START - START % 3600): 1.0}
+    row_id = store.add(session)
+
+    [(pending_id, pending)] = store.pending_import(10)
+    assert pending_id == row_id
+    assert pending.hourly == session.hourly
+    store.mark_imported([row_id])
+    assert store.pending_import(10) == []
+    store.close()
@@ -0,0 +1,70 @@
+"""Tests for importing sessions into long-term statistics."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.voltie_charger.sessions import ChargingSession, SessionStore
+from custom_components.voltie_charger.statistics import (
+    async_import_pending_sessions,
+)
+
+HOUR = 1_700_002_800.0  # 2023-11-14 23:00 UTC
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_mock: Recorder, enable_custom_integrations: None
+) -> None:
+    """Set up the recorder before hass, as recorder_mock requires."""
+
+
+def _session(idtag: str | None, hourly: dict[float, float]) -> ChargingSession:
+    return ChargingSession(
+        charger_id="VC0001A2B3",
+        idtag=idtag,
+        started=min(hourly),
+        ended=max(hourly) + 3600,
+        energy=sum(hourly.values()),
+        hourly=hourly,
+    )
+
+
+async def _sums(hass: HomeAssistant, statistic_id: str) -> list[float]:
+    rows = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        dt_util.utc_from_timestamp(0),
+        None,
+        {statistic_id},
+        "hour",
+        None,
+        {"sum"},
+    )
+    return [row["sum"] for row in rows.get(statistic_id, [])]
+
+
+async def test_import_continues_running_sums(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    store = SessionStore(str(tmp_path / "sessions.db"))
+    store.add(_session("TAG1", {HOUR: 2.0, HOUR + 3600: 1.0}))
+    store.add(_session(None, {HOUR + 7200: 4.0}))
+
+    assert await async_import_pending_sessions(hass, store) == 2
+    assert await async_import_pending_sessions(hass, store) == 0
+
+    assert await _sums(hass, "voltie_charger:energy_vc0001a2b3") == [2.0, 3.0, 7.0]
+    assert await _sums(hass, "voltie_charger:energy_tag_tag1") == [2.0, 3.0]
+
+    # A late session for an already-imported hour folds into the last row.
+    store.add(_session("TAG1", {HOUR: 0.5}))
+    assert await async_import_pending_sessions(hass, store) == 1
+    assert await _sums(hass, "voltie_charger:energy_tag_tag1") == [2.0, 3.5]
+    store.close()
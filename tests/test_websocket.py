@@ -0,0 +1,100 @@
+"""Tests for the delta-encoded snapshot websocket."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.setup import async_setup_component
+
+from custom_components.voltie_charger import VoltieChargerCoordinator
+from custom_components.voltie_charger.const import (
+    DATA_CONFIG,
+    DATA_POWER,
+    DATA_STATUS,
+    DOMAIN,
+)
+from custom_components.voltie_charger.websocket import (
+    async_setup_websocket,
+    snapshot_delta,
+)
+
+STATUS = {"evse_state": 2, "cdr": {"chg_energy": 1.0, "idtag": "A"}}
+POWER = {"power_stat": {"voltage1": 230.0, "voltage3": 229.0}}
+
+
+def test_snapshot_delta_nested() -> None:
+    assert snapshot_delta(STATUS, STATUS) == ({}, [])
+    current = {"evse_state": 3, "cdr": {"chg_energy": 1.5}, "phases": 1}
+    assert snapshot_delta(STATUS, current) == (
+        {"evse_state": 3, "cdr": {"chg_energy": 1.5}, "phases": 1},
+        ["cdr.idtag"],
+    )
+    # A value changing type is sent whole.
+    assert snapshot_delta({"cdr": None}, {"cdr": {"x": 1}}) == ({"cdr": {"x": 1}}, [])
+
+
+async def test_subscribe_snapshot(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    assert await async_setup_component(hass, "websocket_api", {})
+    async_setup_websocket(hass)
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_HOST: "192.0.2.10"}, state=ConfigEntryState.LOADED
+    )
+    entry.add_to_hass(hass)
+    coordinator = VoltieChargerCoordinator(hass, entry, MagicMock(capture=None))
+    coordinator.charger_id = "VC1"
+    coordinator.data = {DATA_STATUS: STATUS, DATA_POWER: POWER}
+    entry.runtime_data = coordinator
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, "VC1")}
+    )
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/subscribe_snapshot", "device_id": device.id}
+    )
+    assert (await client.receive_json())["success"]
+    event = (await client.receive_json())["event"]
+    assert event == {"full": {DATA_STATUS: STATUS, DATA_POWER: POWER, DATA_CONFIG: {}}}
+
+    # Unchanged data sends nothing; the next message is the real change.
+    coordinator.async_set_updated_data(dict(coordinator.data))
+    coordinator.async_set_updated_data(
+        {
+            DATA_STATUS: STATUS | {"evse_state": 3},
+            DATA_POWER: {"power_stat": {"voltage1": 231.0}},
+        }
+    )
+    event = (await client.receive_json())["event"]
+    assert event == {
+        "delta": {
+            DATA_STATUS: {"evse_state": 3},
+            DATA_POWER: {"power_stat": {"voltage1": 231.0}},
+        },
+        "removed": {DATA_POWER: ["power_stat.voltage3"]},
+    }
+
+    # Unloading the entry ends the subscription.
+    await entry._async_process_on_unload(hass)
+    assert (await client.receive_json())["event"] == {"closed": True}
+    await coordinator.async_shutdown()
+
+
+async def test_unknown_device(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    assert await async_setup_component(hass, "websocket_api", {})
+    async_setup_websocket(hass)
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/subscribe_snapshot", "device_id": "nope"}
+    )
+    response = await client.receive_json()
+    assert response["error"]["code"] == "not_found"